@@ -1,6 +1,10 @@
 """CompositeBackend: Route operations to different backends based on path prefix."""
 
+import asyncio
 from collections import defaultdict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypeVar
 
 from deepagents.backends.protocol import (
     BackendProtocol,
@@ -15,6 +19,17 @@ from deepagents.backends.protocol import (
 )
 from deepagents.backends.state import StateBackend
 
+_T = TypeVar("_T")
+
+
+def _fan_out(calls: list[Callable[[], _T]]) -> list[_T]:
+    """Run calls concurrently on threads; results come back in call order."""
+    if len(calls) == 1:
+        return [calls[0]()]
+    with ThreadPoolExecutor(max_workers=len(calls)) as pool:
+        futures = [pool.submit(call) for call in calls]
+        return [future.result() for future in futures]
+
 
 class CompositeBackend:
     def __init__(
@@ -178,21 +193,24 @@ class CompositeBackend:
                     return raw
                 return [{**m, "path": f"{route_prefix[:-1]}{m['path']}"} for m in raw]
 
-        # Otherwise, search default and all routed backends and merge
+        # Otherwise, search default and all routed backends concurrently and merge
+        raws = _fan_out(
+            [lambda: self.default.grep_raw(pattern, path, glob)]  # type: ignore[attr-defined]
+            + [lambda backend=backend: backend.grep_raw(pattern, "/", glob) for backend in self.routes.values()]
+        )
+        return self._merge_grep(raws)
+
+    def _merge_grep(self, raws: list[list[GrepMatch] | str]) -> list[GrepMatch] | str:
+        """Merge default and per-route grep results, in that order, prefixing route paths."""
         all_matches: list[GrepMatch] = []
-        raw_default = self.default.grep_raw(pattern, path, glob)  # type: ignore[attr-defined]
-        if isinstance(raw_default, str):
-            # This happens if error occurs
-            return raw_default
-        all_matches.extend(raw_default)
-
-        for route_prefix, backend in self.routes.items():
-            raw = backend.grep_raw(pattern, "/", glob)
+        for route_prefix, raw in zip([None, *self.routes], raws, strict=True):
             if isinstance(raw, str):
                 # This happens if error occurs
                 return raw
-            all_matches.extend({**m, "path": f"{route_prefix[:-1]}{m['path']}"} for m in raw)
-
+            if route_prefix is None:
+                all_matches.extend(raw)
+            else:
+                all_matches.extend({**m, "path": f"{route_prefix[:-1]}{m['path']}"} for m in raw)
         return all_matches
 
     async def agrep_raw(
@@ -213,22 +231,12 @@ class CompositeBackend:
                     return raw
                 return [{**m, "path": f"{route_prefix[:-1]}{m['path']}"} for m in raw]
 
-        # Otherwise, search default and all routed backends and merge
-        all_matches: list[GrepMatch] = []
-        raw_default = await self.default.agrep_raw(pattern, path, glob)  # type: ignore[attr-defined]
-        if isinstance(raw_default, str):
-            # This happens if error occurs
-            return raw_default
-        all_matches.extend(raw_default)
-
-        for route_prefix, backend in self.routes.items():
-            raw = await backend.agrep_raw(pattern, "/", glob)
-            if isinstance(raw, str):
-                # This happens if error occurs
-                return raw
-            all_matches.extend({**m, "path": f"{route_prefix[:-1]}{m['path']}"} for m in raw)
-
-        return all_matches
+        # Otherwise, search default and all routed backends concurrently and merge
+        raws = await asyncio.gather(
+            self.default.agrep_raw(pattern, path, glob),  # type: ignore[attr-defined]
+            *(backend.agrep_raw(pattern, "/", glob) for backend in self.routes.values()),
+        )
+        return self._merge_grep(list(raws))
 
     def glob_info(self, pattern: str, path: str = "/") -> list[FileInfo]:
         results: list[FileInfo] = []
@@ -241,10 +249,12 @@ class CompositeBackend:
                 return [{**fi, "path": f"{route_prefix[:-1]}{fi['path']}"} for fi in infos]
 
         # Path doesn't match any specific route - search default backend AND all routed backends
-        results.extend(self.default.glob_info(pattern, path))
-
-        for route_prefix, backend in self.routes.items():
-            infos = backend.glob_info(pattern, "/")
+        infos_per_backend = _fan_out(
+            [lambda: self.default.glob_info(pattern, path)]
+            + [lambda backend=backend: backend.glob_info(pattern, "/") for backend in self.routes.values()]
+        )
+        results.extend(infos_per_backend[0])
+        for route_prefix, infos in zip(self.routes, infos_per_backend[1:], strict=True):
             results.extend({**fi, "path": f"{route_prefix[:-1]}{fi['path']}"} for fi in infos)
 
         # Deterministic ordering
@@ -265,10 +275,12 @@ class CompositeBackend:
                 return [{**fi, "path": f"{route_prefix[:-1]}{fi['path']}"} for fi in infos]
 
         # Path doesn't match any specific route - search default backend AND all routed backends
-        results.extend(await self.default.aglob_info(pattern, path))
-
-        for route_prefix, backend in self.routes.items():
-            infos = await backend.aglob_info(pattern, "/")
+        infos_per_backend = await asyncio.gather(
+            self.default.aglob_info(pattern, path),
+            *(backend.aglob_info(pattern, "/") for backend in self.routes.values()),
+        )
+        results.extend(infos_per_backend[0])
+        for route_prefix, infos in zip(self.routes, infos_per_backend[1:], strict=True):
             results.extend({**fi, "path": f"{route_prefix[:-1]}{fi['path']}"} for fi in infos)
 
         # Deterministic ordering
@@ -5,17 +5,35 @@ Security and search upgrades:
 - Prevent symlink-following on file I/O using O_NOFOLLOW when available
 - Ripgrep-powered grep with JSON parsing, plus Python fallback with regex
   and optional glob include filtering, while preserving virtual path behavior
+- Python fallback that skips binaries, streams files line by line on a
+  thread pool, and returns matches in the same (path, line) order as ripgrep
+- Python fallback that picks files like ripgrep: hidden entries, symlinks
+  and .gitignore/.ignore/.rgignore matches are skipped
+- Optional persistent trigram index that lets the Python fallback skip files
+  that cannot match
+- Ranged reads of large files through an mmap and a cached line-offset index
+- ls/glob served from directory listings cached by directory mtime
 """
 
+import codecs
+import fnmatch
 import json
+import mmap
 import os
 import re
 import subprocess
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 
 import wcmatch.glob as wcglob
 
+from deepagents.backends.grep_index import INDEX_AVAILABLE, GrepIndex
 from deepagents.backends.protocol import (
     BackendProtocol,
     EditResult,
@@ -31,6 +49,187 @@ from deepagents.backends.utils import (
     perform_string_replacement,
 )
 
+# Files at least this large are read through the line-offset index
+RANGED_READ_MIN_BYTES = 1024 * 1024
+# Byte offset of every n-th line is kept in the index
+LINE_INDEX_STRIDE = 1000
+# Number of files whose line index is kept in memory
+LINE_INDEX_CACHE_SIZE = 16
+
+# UTF-8 line breaks str.splitlines() honours besides "\n" and "\r\n"; one
+# find() per needle is far faster than a single regex alternation
+_OTHER_LINE_BREAKS = (b"\x0b", b"\x0c", b"\x1c", b"\x1d", b"\x1e", b"\xc2\x85", b"\xe2\x80\xa8", b"\xe2\x80\xa9")
+_LONE_CR = re.compile(rb"\r(?!\n)")
+# Bytes other than the ASCII characters str.strip() removes
+_NON_ASCII_SPACE = re.compile(rb"[^\t\n\x0b\x0c\r\x1c-\x1f ]")
+# Text is decoded in blocks of this size to look for non-ASCII whitespace
+_DECODE_BLOCK_BYTES = 1024 * 1024
+# Matches LINE_INDEX_STRIDE lines; the end of each match is a checkpoint
+_LINE_BLOCK = re.compile(rb"(?:[^\n]*\n){%d}" % LINE_INDEX_STRIDE)
+
+# Threads used by the Python grep fallback
+GREP_WORKERS = 8
+# The Python grep fallback reads files in blocks of this size
+GREP_BLOCK_BYTES = 1024 * 1024
+# Files are sniffed for binary content in their first bytes, like ripgrep
+BINARY_SNIFF_BYTES = 8192
+BINARY_EXTENSIONS = frozenset(
+    ".pdf .png .jpg .jpeg .gif .bmp .webp .ico .zip .gz .tgz .bz2 .xz .7z .rar "
+    ".xls .xlsx .doc .docx .ppt .pptx .sqlite .db .pyc .so .dll .exe .bin".split()
+)
+_BINARY_MAGIC = (b"%PDF-", b"\x89PNG", b"\xff\xd8\xff", b"GIF8", b"PK\x03\x04", b"\x1f\x8b", b"SQLite format 3")
+
+
+def _looks_binary(head: bytes) -> bool:
+    return b"\x00" in head or head.startswith(_BINARY_MAGIC)
+
+
+# Ignore files ripgrep reads in each directory, in increasing precedence;
+# .gitignore only counts inside a git repository
+_IGNORE_FILES = (".gitignore", ".ignore", ".rgignore")
+
+
+@dataclass(frozen=True)
+class _IgnoreRule:
+    """One pattern of a .gitignore-style file."""
+
+    # Directory of the ignore file; the pattern matches paths relative to it
+    base: Path
+    matcher: wcglob.WcMatcher
+    negated: bool
+    dir_only: bool
+
+
+def _read_ignore_file(base: Path, name: str) -> list[_IgnoreRule]:
+    try:
+        text = (base / name).read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return []
+    rules = []
+    for line in text.splitlines():
+        stripped = line.rstrip(" ")
+        if stripped.endswith("\\") and len(stripped) < len(line):
+            stripped += " "
+        if not stripped or stripped.startswith("#"):
+            continue
+        negated = stripped.startswith("!")
+        pattern = stripped[1:] if negated else stripped
+        dir_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+        if not pattern:
+            continue
+        # A pattern without an inner slash matches a name at any depth,
+        # otherwise it is anchored to the ignore file's directory
+        pattern = pattern.lstrip("/") if "/" in pattern else "**/" + pattern
+        matcher = wcglob.compile(pattern, flags=wcglob.GLOBSTAR | wcglob.DOTGLOB)
+        rules.append(_IgnoreRule(base, matcher, negated, dir_only))
+    return rules
+
+
+def _dir_ignore_rules(dir_path: Path, names: set[str] | None, in_git: bool) -> list[_IgnoreRule]:
+    """Rules from the ignore files in one directory; names are its children, if listed."""
+    rules: list[_IgnoreRule] = []
+    for name in _IGNORE_FILES:
+        if name == ".gitignore" and not in_git:
+            continue
+        if names is None or name in names:
+            rules.extend(_read_ignore_file(dir_path, name))
+    return rules
+
+
+def _is_ignored(rules: list[_IgnoreRule], path: Path, is_dir: bool) -> bool:
+    """Whether the last rule matching path, if any, ignores it."""
+    for rule in reversed(rules):
+        if rule.dir_only and not is_dir:
+            continue
+        if rule.matcher.match(str(path.relative_to(rule.base))):
+            return not rule.negated
+    return False
+
+
+@dataclass(frozen=True)
+class _LineIndex:
+    """Line layout of one version of a file."""
+
+    num_lines: int
+    # Byte offset of lines 0, LINE_INDEX_STRIDE, 2 * LINE_INDEX_STRIDE, ...
+    checkpoints: list[int]
+    has_content: bool
+
+
+def _has_content(mm: mmap.mmap) -> bool:
+    """Whether the decoded file has text besides whitespace, as check_empty_content() sees it."""
+    match = _NON_ASCII_SPACE.search(mm)
+    if match is None:
+        return False
+    if mm[match.start()] < 0x80:
+        return True
+    # Non-ASCII characters may be whitespace too, such as U+3000
+    decoder = codecs.getincrementaldecoder("utf-8")("replace")
+    for start in range(match.start(), len(mm), _DECODE_BLOCK_BYTES):
+        end = start + _DECODE_BLOCK_BYTES
+        if decoder.decode(mm[start:end], final=end >= len(mm)).strip():
+            return True
+    return False
+
+
+def _build_line_index(mm: mmap.mmap) -> _LineIndex | None:
+    """Index the lines of a mapped file, or None if it needs str.splitlines()."""
+    if any(mm.find(needle) != -1 for needle in _OTHER_LINE_BREAKS):
+        return None
+    if mm.find(b"\r") != -1 and _LONE_CR.search(mm):
+        return None
+
+    checkpoints = [0]
+    checkpoints.extend(match.end() for match in _LINE_BLOCK.finditer(mm))
+    # Count the lines after the last checkpoint
+    pos = checkpoints[-1]
+    num_lines = (len(checkpoints) - 1) * LINE_INDEX_STRIDE
+    while (newline := mm.find(b"\n", pos)) != -1:
+        num_lines += 1
+        pos = newline + 1
+    if pos < len(mm):
+        num_lines += 1
+    return _LineIndex(num_lines, checkpoints, _has_content(mm))
+
+
+# Number of directory listings kept in memory
+DIR_CACHE_SIZE = 4096
+# Directories modified more recently than this are not cached: a change in
+# the same mtime tick as the listing would go unnoticed
+DIR_CACHE_MIN_AGE_NS = 2_000_000_000
+
+
+@dataclass(frozen=True)
+class _DirEntry:
+    """One child of a listed directory; size and modified_at are None if stat failed."""
+
+    name: str
+    is_file: bool
+    is_dir: bool
+    is_symlink: bool
+    size: int | None
+    modified_at: str | None
+
+
+def _scan_dir(dir_path: Path) -> list[_DirEntry]:
+    entries = []
+    with os.scandir(dir_path) as it:
+        for entry in it:
+            try:
+                is_file = entry.is_file()
+                is_dir = entry.is_dir()
+                is_symlink = entry.is_symlink()
+            except OSError:
+                continue
+            try:
+                st = entry.stat()
+                size, modified_at = int(st.st_size), datetime.fromtimestamp(st.st_mtime).isoformat()
+            except OSError:
+                size, modified_at = None, None
+            entries.append(_DirEntry(entry.name, is_file, is_dir, is_symlink, size, modified_at))
+    return entries
+
 
 class FilesystemBackend(BackendProtocol):
     """Backend that reads and writes files directly from the filesystem.
@@ -45,6 +244,8 @@ class FilesystemBackend(BackendProtocol):
         root_dir: str | Path | None = None,
         virtual_mode: bool = False,
         max_file_size_mb: int = 10,
+        grep_index: bool = False,
+        grep_index_dir: str | Path | None = None,
     ) -> None:
         """Initialize filesystem backend.
 
@@ -52,10 +253,23 @@ class FilesystemBackend(BackendProtocol):
             root_dir: Optional root directory for file operations. If provided,
                      all file paths will be resolved relative to this directory.
                      If not provided, uses the current working directory.
+            grep_index: Keep a trigram index so grep without ripgrep only
+                     reads files that can match. Meant for large, mostly-static
+                     trees such as caches. Ignored where the index is
+                     unavailable on this Python version.
+            grep_index_dir: Directory for the index file, outside root;
+                     defaults to ``~/.deepagents/grep_index``.
         """
         self.cwd = Path(root_dir).resolve() if root_dir else Path.cwd()
         self.virtual_mode = virtual_mode
         self.max_file_size_bytes = max_file_size_mb * 1024 * 1024
+        self._grep_index = GrepIndex(self.cwd, grep_index_dir) if grep_index and INDEX_AVAILABLE else None
+        # directory -> (mtime_ns, entries)
+        self._listings: OrderedDict[str, tuple[int, list[_DirEntry]]] = OrderedDict()
+        self._listing_lock = threading.Lock()
+        # path -> ((inode, mtime_ns, size), line index or None)
+        self._line_indexes: OrderedDict[str, tuple[tuple[int, int, int], _LineIndex | None]] = OrderedDict()
+        self._line_index_lock = threading.Lock()
 
     def _resolve_path(self, key: str) -> Path:
         """Resolve a file path with security checks.
@@ -93,6 +307,65 @@ class FilesystemBackend(BackendProtocol):
             return path
         return (self.cwd / path).resolve()
 
+    def _list_dir(self, dir_path: Path) -> list[_DirEntry]:
+        """Children of a directory, served from memory while its mtime is unchanged.
+
+        A directory's mtime changes when entries are added, removed or
+        renamed, not when a child file is modified in place; our own writes
+        invalidate the parent listing, other processes' in-place edits may
+        show a stale size until the directory changes.
+        """
+        key = str(dir_path)
+        mtime_ns = os.stat(dir_path).st_mtime_ns
+        with self._listing_lock:
+            cached = self._listings.get(key)
+            if cached is not None and cached[0] == mtime_ns:
+                self._listings.move_to_end(key)
+                return cached[1]
+
+        entries = _scan_dir(dir_path)
+        if time.time_ns() - mtime_ns > DIR_CACHE_MIN_AGE_NS:
+            with self._listing_lock:
+                self._listings[key] = (mtime_ns, entries)
+                self._listings.move_to_end(key)
+                while len(self._listings) > DIR_CACHE_SIZE:
+                    self._listings.popitem(last=False)
+        return entries
+
+    def _invalidate_listing(self, dir_path: Path) -> None:
+        """Forget the cached listing of a directory we changed."""
+        with self._listing_lock:
+            self._listings.pop(str(dir_path), None)
+
+    def _display_path(self, abs_path: str) -> str:
+        """Path as reported to callers: absolute, or virtual under cwd in virtual_mode."""
+        if not self.virtual_mode:
+            return abs_path
+        cwd_str = str(self.cwd)
+        if not cwd_str.endswith("/"):
+            cwd_str += "/"
+        if abs_path.startswith(cwd_str):
+            relative_path = abs_path[len(cwd_str) :]
+        elif abs_path.startswith(str(self.cwd)):
+            # Handle case where cwd doesn't end with /
+            relative_path = abs_path[len(str(self.cwd)) :].lstrip("/")
+        else:
+            # Path is outside cwd, return as-is
+            relative_path = abs_path
+        return "/" + relative_path
+
+    @staticmethod
+    def _file_info(path: str, entry: _DirEntry) -> FileInfo:
+        if entry.is_dir:
+            info: FileInfo = {"path": path + "/", "is_dir": True}
+            if entry.modified_at is not None:
+                info.update(size=0, modified_at=entry.modified_at)
+        else:
+            info = {"path": path, "is_dir": False}
+            if entry.modified_at is not None:
+                info.update(size=entry.size, modified_at=entry.modified_at)
+        return info
+
     def ls_info(self, path: str) -> list[FileInfo]:
         """List files and directories in the specified directory (non-recursive).
 
@@ -107,93 +380,16 @@ class FilesystemBackend(BackendProtocol):
         if not dir_path.exists() or not dir_path.is_dir():
             return []
 
-        results: list[FileInfo] = []
-
-        # Convert cwd to string for comparison
-        cwd_str = str(self.cwd)
-        if not cwd_str.endswith("/"):
-            cwd_str += "/"
-
-        # List only direct children (non-recursive)
         try:
-            for child_path in dir_path.iterdir():
-                try:
-                    is_file = child_path.is_file()
-                    is_dir = child_path.is_dir()
-                except OSError:
-                    continue
+            entries = self._list_dir(dir_path)
+        except OSError:
+            return []
 
-                abs_path = str(child_path)
-
-                if not self.virtual_mode:
-                    # Non-virtual mode: use absolute paths
-                    if is_file:
-                        try:
-                            st = child_path.stat()
-                            results.append(
-                                {
-                                    "path": abs_path,
-                                    "is_dir": False,
-                                    "size": int(st.st_size),
-                                    "modified_at": datetime.fromtimestamp(st.st_mtime).isoformat(),
-                                }
-                            )
-                        except OSError:
-                            results.append({"path": abs_path, "is_dir": False})
-                    elif is_dir:
-                        try:
-                            st = child_path.stat()
-                            results.append(
-                                {
-                                    "path": abs_path + "/",
-                                    "is_dir": True,
-                                    "size": 0,
-                                    "modified_at": datetime.fromtimestamp(st.st_mtime).isoformat(),
-                                }
-                            )
-                        except OSError:
-                            results.append({"path": abs_path + "/", "is_dir": True})
-                else:
-                    # Virtual mode: strip cwd prefix
-                    if abs_path.startswith(cwd_str):
-                        relative_path = abs_path[len(cwd_str) :]
-                    elif abs_path.startswith(str(self.cwd)):
-                        # Handle case where cwd doesn't end with /
-                        relative_path = abs_path[len(str(self.cwd)) :].lstrip("/")
-                    else:
-                        # Path is outside cwd, return as-is or skip
-                        relative_path = abs_path
-
-                    virt_path = "/" + relative_path
-
-                    if is_file:
-                        try:
-                            st = child_path.stat()
-                            results.append(
-                                {
-                                    "path": virt_path,
-                                    "is_dir": False,
-                                    "size": int(st.st_size),
-                                    "modified_at": datetime.fromtimestamp(st.st_mtime).isoformat(),
-                                }
-                            )
-                        except OSError:
-                            results.append({"path": virt_path, "is_dir": False})
-                    elif is_dir:
-                        try:
-                            st = child_path.stat()
-                            results.append(
-                                {
-                                    "path": virt_path + "/",
-                                    "is_dir": True,
-                                    "size": 0,
-                                    "modified_at": datetime.fromtimestamp(st.st_mtime).isoformat(),
-                                }
-                            )
-                        except OSError:
-                            results.append({"path": virt_path + "/", "is_dir": True})
-        except (OSError, PermissionError):
-            pass
+        results: list[FileInfo] = [
+            self._file_info(self._display_path(str(dir_path / entry.name)), entry)
+            for entry in entries
+            if entry.is_file or entry.is_dir
+        ]
 
         # Keep deterministic order by path
         results.sort(key=lambda x: x.get("path", ""))
@@ -209,10 +405,16 @@ class FilesystemBackend(BackendProtocol):
     ) -> str:
         """Read file content with line numbers.
 
+        Files of RANGED_READ_MIN_BYTES or more are memory-mapped and only the
+        requested lines are decoded, so paging through a large file costs
+        the same at any offset.
+
         Args:
             file_path: Absolute or relative file path
             offset: Line offset to start reading from (0-indexed)
-            limit: Maximum number of lines to readReturns:
+            limit: Maximum number of lines to read
+
+        Returns:
             Formatted file content with line numbers, or error message.
         """
         resolved_path = self._resolve_path(file_path)
@@ -221,6 +423,12 @@ class FilesystemBackend(BackendProtocol):
             return f"Error: File '{file_path}' not found"
 
         try:
+            size = resolved_path.stat().st_size
+            if size and size >= RANGED_READ_MIN_BYTES and offset >= 0 and limit > 0:
+                ranged = self._read_ranged(resolved_path, offset, limit)
+                if ranged is not None:
+                    return ranged
+
             # Open with O_NOFOLLOW where available to avoid symlink traversal
             try:
                 fd = os.open(resolved_path, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0))
@@ -247,6 +455,60 @@ class FilesystemBackend(BackendProtocol):
         except (OSError, UnicodeDecodeError) as e:
             return f"Error reading file '{file_path}': {e}"
 
+    def _line_index(self, path: Path, fd: int, mm: mmap.mmap) -> _LineIndex | None:
+        """Cached line index of an open file, rebuilt when the file changes."""
+        st = os.fstat(fd)
+        version = (st.st_ino, st.st_mtime_ns, st.st_size)
+        key = str(path)
+        with self._line_index_lock:
+            cached = self._line_indexes.get(key)
+            if cached is not None and cached[0] == version:
+                self._line_indexes.move_to_end(key)
+                return cached[1]
+
+        index = _build_line_index(mm)
+        with self._line_index_lock:
+            self._line_indexes[key] = (version, index)
+            self._line_indexes.move_to_end(key)
+            while len(self._line_indexes) > LINE_INDEX_CACHE_SIZE:
+                self._line_indexes.popitem(last=False)
+        return index
+
+    def _read_ranged(self, path: Path, offset: int, limit: int) -> str | None:
+        """Read lines offset..offset+limit through mmap and the line index.
+
+        Returns:
+            Formatted lines or an error/empty message, or None if the file
+            uses line breaks only str.splitlines() handles (caller reads it
+            whole).
+        """
+        try:
+            fd = os.open(path, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0))
+        except OSError:
+            fd = os.open(path, os.O_RDONLY)
+        try:
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                index = self._line_index(path, fd, mm)
+                if index is None:
+                    return None
+                if not index.has_content:
+                    return check_empty_content("")
+                if offset >= index.num_lines:
+                    return f"Error: Line offset {offset} exceeds file length ({index.num_lines} lines)"
+
+                mm.seek(index.checkpoints[offset // LINE_INDEX_STRIDE])
+                for _ in range(offset % LINE_INDEX_STRIDE):
+                    mm.readline()
+                lines = []
+                for _ in range(min(limit, index.num_lines - offset)):
+                    line = mm.readline().decode("utf-8")
+                    if line.endswith("\n"):
+                        line = line[:-1].removesuffix("\r")
+                    lines.append(line)
+        finally:
+            os.close(fd)
+        return format_content_with_line_numbers(lines, start_line=offset + 1)
+
     def write(
         self,
         file_path: str,
@@ -271,6 +533,7 @@ class FilesystemBackend(BackendProtocol):
             fd = os.open(resolved_path, flags, 0o644)
             with os.fdopen(fd, "w", encoding="utf-8") as f:
                 f.write(content)
+            self._invalidate_listing(resolved_path.parent)
 
             return WriteResult(path=file_path, files_update=None)
         except (OSError, UnicodeEncodeError) as e:
@@ -315,6 +578,7 @@ class FilesystemBackend(BackendProtocol):
             fd = os.open(resolved_path, flags)
             with os.fdopen(fd, "w", encoding="utf-8") as f:
                 f.write(new_content)
+            self._invalidate_listing(resolved_path.parent)
 
             return EditResult(path=file_path, files_update=None, occurrences=int(occurrences))
         except (OSError, UnicodeDecodeError, UnicodeEncodeError) as e:
@@ -352,6 +616,8 @@ class FilesystemBackend(BackendProtocol):
         for fpath, items in results.items():
             for line_num, line_text in items:
                 matches.append({"path": fpath, "line": int(line_num), "text": line_text})
+        # ripgrep reports files in whatever order its threads finish
+        matches.sort(key=lambda m: (m["path"], m["line"]))
         return matches
 
     def _ripgrep_search(self, pattern: str, base_full: Path, include_glob: str | None) -> dict[str, list[tuple[int, str]]] | None:
@@ -392,7 +658,7 @@ class FilesystemBackend(BackendProtocol):
             else:
                 virt = str(p)
             ln = pdata.get("line_number")
-            lt = pdata.get("lines", {}).get("text", "").rstrip("\n")
+            lt = pdata.get("lines", {}).get("text", "").removesuffix("\n").removesuffix("\r")
             if ln is None:
                 continue
             results.setdefault(virt, []).append((int(ln), lt))
@@ -406,34 +672,150 @@ class FilesystemBackend(BackendProtocol):
             return {}
 
         results: dict[str, list[tuple[int, str]]] = {}
-        root = base_full if base_full.is_dir() else base_full.parent
+        if base_full.is_dir():
+            files = self._iter_search_files(base_full, include_glob)
+            if self._grep_index is not None:
+                files = self._grep_index.select(files, pattern, base_full)
+        else:
+            # Like ripgrep, a file named explicitly is searched whatever its
+            # name, and on its own
+            files = iter([base_full])
+
+        with ThreadPoolExecutor(max_workers=GREP_WORKERS) as pool:
+            for fp, hits in pool.map(lambda fp: (fp, self._search_file(regex, fp)), files):
+                if not hits:
+                    continue
+                if self.virtual_mode:
+                    try:
+                        virt_path = "/" + str(fp.resolve().relative_to(self.cwd))
+                    except Exception:
+                        continue
+                else:
+                    virt_path = str(fp)
+                results[virt_path] = hits
 
-        for fp in root.rglob("*"):
-            if not fp.is_file():
+        return results
+
+    @staticmethod
+    def _search_file(regex: re.Pattern, fp: Path) -> list[tuple[int, str]]:
+        """Matching (line number, text) pairs of one file, read line by line.
+
+        Lines are split on "\n" only and decoded leniently, as ripgrep does;
+        binary files yield nothing.
+        """
+        hits: list[tuple[int, str]] = []
+        line_num = 0
+        try:
+            with open(fp, "rb") as f:
+                head = f.read(BINARY_SNIFF_BYTES)
+                if _looks_binary(head):
+                    return hits
+                pending = head
+                while True:
+                    block = f.read(GREP_BLOCK_BYTES)
+                    if b"\x00" in block:
+                        # ripgrep drops a file's matches once it finds a NUL byte
+                        return []
+                    data = pending + block
+                    # Decode whole lines only, so no UTF-8 sequence is split
+                    cut = data.rfind(b"\n") + 1 if block else len(data)
+                    pending = data[cut:]
+                    if cut:
+                        lines = data[:cut].decode("utf-8", "replace").split("\n")
+                        if data[cut - 1] == ord("\n"):
+                            lines.pop()
+                        for line in lines:
+                            line_num += 1
+                            line = line.removesuffix("\r")
+                            if regex.search(line):
+                                hits.append((line_num, line))
+                    if not block:
+                        break
+        except OSError:
+            return []
+        return hits
+
+    def _iter_search_files(self, root: Path, include_glob: str | None) -> Iterator[Path]:
+        """Files below root the Python grep fallback looks at.
+
+        They are chosen the way ripgrep chooses them: hidden entries,
+        symlinks and paths matched by .gitignore (inside a git repository),
+        .ignore or .rgignore are skipped, except that a file matching
+        include_glob is searched even if hidden or ignored, as with
+        ``rg --glob``.
+        """
+        ancestors = [root, *root.parents]
+        rules: list[_IgnoreRule] = []
+        # Ignore files above root apply too, .gitignore files only from the
+        # repository root down
+        in_git = False
+        for directory in ancestors[:0:-1]:
+            in_git = in_git or (directory / ".git").exists()
+            rules.extend(_dir_ignore_rules(directory, None, in_git))
+        yield from self._walk_search_files(root, include_glob, in_git, rules)
+
+    def _walk_search_files(self, dir_path: Path, include_glob: str | None, in_git: bool, rules: list[_IgnoreRule]) -> Iterator[Path]:
+        try:
+            entries = self._list_dir(dir_path)
+        except OSError:
+            return
+        names = {entry.name for entry in entries}
+        in_git = in_git or ".git" in names
+        rules = rules + _dir_ignore_rules(dir_path, names, in_git)
+        for entry in entries:
+            if entry.is_symlink:
+                continue
+            fp = dir_path / entry.name
+            if entry.is_dir:
+                if not entry.name.startswith(".") and not _is_ignored(rules, fp, True):
+                    yield from self._walk_search_files(fp, include_glob, in_git, rules)
+                continue
+            if not entry.is_file:
+                continue
+            if include_glob:
+                if not wcglob.globmatch(entry.name, include_glob, flags=wcglob.BRACE | wcglob.DOTGLOB):
+                    continue
+            elif entry.name.startswith(".") or _is_ignored(rules, fp, False):
+                continue
+            if fp.suffix.lower() in BINARY_EXTENSIONS:
                 continue
-            if include_glob and not wcglob.globmatch(fp.name, include_glob, flags=wcglob.BRACE):
+            if entry.size is None or entry.size > self.max_file_size_bytes:
                 continue
+            yield fp
+
+    def _walk_files(self, top: str, symlinked_dirs: list[str]) -> Iterator[tuple[str, _DirEntry]]:
+        """(directory, entry) for the files below top, from cached listings.
+
+        Like rglob's ``**``, symlinked directories are not entered; they are
+        appended to ``symlinked_dirs`` instead.
+        """
+        try:
+            entries = self._list_dir(Path(top or "/"))
+        except OSError:
+            return
+        for entry in entries:
+            if entry.is_file:
+                yield top, entry
+            elif entry.is_dir:
+                if entry.is_symlink:
+                    symlinked_dirs.append(f"{top}/{entry.name}")
+                else:
+                    yield from self._walk_files(f"{top}/{entry.name}", symlinked_dirs)
+
+    @staticmethod
+    def _rglob_files(search_path: Path, pattern: str) -> Iterator[tuple[Path, _DirEntry]]:
+        for matched_path in search_path.rglob(pattern):
             try:
-                if fp.stat().st_size > self.max_file_size_bytes:
+                if not matched_path.is_file():
                     continue
             except OSError:
                 continue
             try:
-                content = fp.read_text()
-            except (UnicodeDecodeError, PermissionError, OSError):
-                continue
-            for line_num, line in enumerate(content.splitlines(), 1):
-                if regex.search(line):
-                    if self.virtual_mode:
-                        try:
-                            virt_path = "/" + str(fp.resolve().relative_to(self.cwd))
-                        except Exception:
-                            continue
-                    else:
-                        virt_path = str(fp)
-                    results.setdefault(virt_path, []).append((line_num, line))
-
-        return results
+                st = matched_path.stat()
+                size, modified_at = int(st.st_size), datetime.fromtimestamp(st.st_mtime).isoformat()
+            except OSError:
+                size, modified_at = None, None
+            yield matched_path, _DirEntry(matched_path.name, True, False, False, size, modified_at)
 
     def glob_info(self, pattern: str, path: str = "/") -> list[FileInfo]:
         if pattern.startswith("/"):
@@ -442,57 +824,34 @@ class FilesystemBackend(BackendProtocol):
         search_path = self.cwd if path == "/" else self._resolve_path(path)
         if not search_path.exists() or not search_path.is_dir():
             return []
+        if pattern.rsplit("/", 1)[-1] == "**":
+            # rglob yields only directories for a trailing **
+            return []
 
-        results: list[FileInfo] = []
-        try:
-            # Use recursive globbing to match files in subdirectories as tests expect
-            for matched_path in search_path.rglob(pattern):
-                try:
-                    is_file = matched_path.is_file()
-                except OSError:
-                    continue
-                if not is_file:
-                    continue
-                abs_path = str(matched_path)
-                if not self.virtual_mode:
-                    try:
-                        st = matched_path.stat()
-                        results.append(
-                            {
-                                "path": abs_path,
-                                "is_dir": False,
-                                "size": int(st.st_size),
-                                "modified_at": datetime.fromtimestamp(st.st_mtime).isoformat(),
-                            }
-                        )
-                    except OSError:
-                        results.append({"path": abs_path, "is_dir": False})
-                else:
-                    cwd_str = str(self.cwd)
-                    if not cwd_str.endswith("/"):
-                        cwd_str += "/"
-                    if abs_path.startswith(cwd_str):
-                        relative_path = abs_path[len(cwd_str) :]
-                    elif abs_path.startswith(str(self.cwd)):
-                        relative_path = abs_path[len(str(self.cwd)) :].lstrip("/")
-                    else:
-                        relative_path = abs_path
-                    virt = "/" + relative_path
-                    try:
-                        st = matched_path.stat()
-                        results.append(
-                            {
-                                "path": virt,
-                                "is_dir": False,
-                                "size": int(st.st_size),
-                                "modified_at": datetime.fromtimestamp(st.st_mtime).isoformat(),
-                            }
-                        )
-                    except OSError:
-                        results.append({"path": virt, "is_dir": False})
-        except (OSError, ValueError):
-            pass
+        top = str(search_path).rstrip("/")
+        symlinked_dirs: list[str] = []
+        if "/" not in pattern:
+            # rglob matches a single component against names with fnmatch
+            match_name = re.compile(fnmatch.translate(pattern)).match
+            matches = [(f"{parent}/{entry.name}", entry) for parent, entry in self._walk_files(top, symlinked_dirs) if match_name(entry.name)]
+        else:
+            # Match relative paths against **/pattern, which is what rglob(pattern) does
+            matcher = wcglob.compile("**/" + pattern, flags=wcglob.GLOBSTAR | wcglob.DOTGLOB)
+            prefix_len = len(top) + 1
+            matches = [
+                (path, entry)
+                for parent, entry in self._walk_files(top, symlinked_dirs)
+                if matcher.match((path := f"{parent}/{entry.name}")[prefix_len:])
+            ]
+        if symlinked_dirs and "/" in pattern:
+            # An explicit path component may select a symlinked directory
+            # that the walk did not enter; let rglob resolve those
+            try:
+                matches = [(str(fp), entry) for fp, entry in self._rglob_files(search_path, pattern)]
+            except (OSError, ValueError):
+                matches = []
 
+        results: list[FileInfo] = [self._file_info(self._display_path(path), entry) for path, entry in matches]
         results.sort(key=lambda x: x.get("path", ""))
         return results
 
@@ -520,6 +879,7 @@ class FilesystemBackend(BackendProtocol):
                 fd = os.open(resolved_path, flags, 0o644)
                 with os.fdopen(fd, "wb") as f:
                     f.write(content)
+                self._invalidate_listing(resolved_path.parent)
 
                 responses.append(FileUploadResponse(path=path, error=None))
             except FileNotFoundError:
@@ -0,0 +1,283 @@
+"""Persistent trigram index that narrows grep to files that can match.
+
+Each indexed file gets a small Bloom filter over the trigrams of the
+distinct whitespace-separated tokens of its case-folded text, stored with
+the file's mtime and size in an SQLite file kept outside the indexed
+tree, so it never shows up in the backend's listings. A search extracts
+the literal runs a regex requires, and files whose filter lacks one of
+their trigrams are skipped without being read. Files that are new or
+changed since they were indexed are read and re-indexed in the same pass,
+so the index stays current without a separate build step.
+
+Literal runs come from the regex parser in ``re._parser``, which is
+private: where it cannot be imported, ``INDEX_AVAILABLE`` is False and
+callers should search without an index, and a parse tree we cannot walk
+requires no trigrams, so every file stays a candidate.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import zlib
+from collections.abc import Iterable, Iterator
+from contextlib import closing
+from pathlib import Path
+
+try:
+    from re import _constants as sre_constants
+    from re import _parser as sre_parser
+
+    _REPEATS = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT, sre_constants.POSSESSIVE_REPEAT)
+    INDEX_AVAILABLE = True
+except (ImportError, AttributeError):
+    INDEX_AVAILABLE = False
+
+# Index files live here, one per indexed root, unless the caller picks a directory
+DEFAULT_INDEX_DIR = Path.home() / ".deepagents" / "grep_index"
+# Bump when the folding, hashing or filter layout changes
+INDEX_VERSION = 1
+# Two bit positions per trigram at 16 bits each: ~1.4% false positives
+BLOOM_BITS_PER_TRIGRAM = 16
+MIN_BLOOM_BYTES = 8
+MAX_BLOOM_BYTES = 256 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    bloom BLOB NOT NULL
+);
+"""
+
+
+def fold(text: str) -> str:
+    """Case-fold text so that case-insensitive regex matches survive folding."""
+    # re.IGNORECASE matches i, I, ı and İ with each other, which casefold()
+    # alone does not unify; every other case-insensitive match agrees with it.
+    # str.replace() is much faster than str.translate() on large texts.
+    return text.replace("İ", "i").replace("ı", "i").casefold()
+
+
+def _literal_runs(items: Iterable) -> list[str]:
+    """Literal strings every match of a parsed regex must contain."""
+    runs: list[str] = []
+    current: list[str] = []
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            current.append(chr(av))
+            continue
+        if op is sre_constants.AT:
+            # Anchors are zero-width and do not split a literal run
+            continue
+        if current:
+            runs.append("".join(current))
+            current = []
+        if op is sre_constants.SUBPATTERN:
+            runs.extend(_literal_runs(av[3]))
+        elif op is sre_constants.ATOMIC_GROUP:
+            runs.extend(_literal_runs(av))
+        elif op in _REPEATS and av[0] >= 1:
+            runs.extend(_literal_runs(av[2]))
+        # Alternations, character classes, optional repeats etc. require nothing
+    if current:
+        runs.append("".join(current))
+    return runs
+
+
+def _trigrams(text: str) -> set[str]:
+    """Trigrams that do not span whitespace.
+
+    A literal without whitespace lies inside one token of any line it
+    occurs in, so per-token trigrams suffice, and deduplicating tokens
+    first skips most of the text.
+    """
+    trigrams: set[str] = set()
+    for token in set(text.split()):
+        if len(token) >= 3:
+            trigrams.update([token[i : i + 3] for i in range(len(token) - 2)])
+    return trigrams
+
+
+def required_trigrams(pattern: str) -> set[str]:
+    """Folded trigrams that any line matching ``pattern`` must contain.
+
+    Returns:
+        Trigrams, or an empty set if the pattern requires no literal of three
+        or more characters (every file is then a candidate).
+    """
+    if not INDEX_AVAILABLE:
+        return set()
+    try:
+        runs = _literal_runs(sre_parser.parse(pattern))
+    except Exception:
+        # Invalid patterns, or a parser whose output we do not understand
+        return set()
+    trigrams: set[str] = set()
+    for run in runs:
+        trigrams |= _trigrams(fold(run))
+    return trigrams
+
+
+def _hash(trigram: str) -> tuple[int, int]:
+    # Checksums are stable across processes, unlike hash()
+    data = trigram.encode("utf-8", "surrogatepass")
+    return zlib.crc32(data), zlib.adler32(data)
+
+
+def _bit_positions(hashes: tuple[int, int], num_bits: int) -> tuple[int, int]:
+    h1, h2 = hashes
+    return h1 % num_bits, (h1 + h2) % num_bits
+
+
+def build_bloom(text: str) -> bytes:
+    """Bloom filter over the folded trigrams of text."""
+    trigrams = _trigrams(fold(text))
+    size = min(max(len(trigrams) * BLOOM_BITS_PER_TRIGRAM // 8, MIN_BLOOM_BYTES), MAX_BLOOM_BYTES)
+    bloom = bytearray(size)
+    num_bits = size * 8
+    for hashes in map(_hash, trigrams):
+        for bit in _bit_positions(hashes, num_bits):
+            bloom[bit >> 3] |= 1 << (bit & 7)
+    return bytes(bloom)
+
+
+def may_contain(bloom: bytes, hashes: list[tuple[int, int]]) -> bool:
+    """Whether a file with this filter can contain all hashed trigrams."""
+    num_bits = len(bloom) * 8
+    for trigram_hashes in hashes:
+        for bit in _bit_positions(trigram_hashes, num_bits):
+            if not bloom[bit >> 3] >> (bit & 7) & 1:
+                return False
+    return True
+
+
+class GrepIndex:
+    """Trigram Bloom filters for the files under one backend root.
+
+    Storage errors are swallowed; the search then reads every file, as it
+    would without an index.
+    """
+
+    def __init__(self, root: str | Path, index_dir: str | Path | None = None):
+        """Initialize grep index.
+
+        Args:
+            root: Backend root directory; must already exist. The index
+                covers files below root.
+            index_dir: Directory for the index file, created on first use;
+                defaults to ``DEFAULT_INDEX_DIR``. Keep it outside root, or
+                the index shows up among the files it indexes.
+        """
+        self.root = Path(root)
+        digest = hashlib.sha256(str(self.root.resolve()).encode("utf-8", "surrogatepass")).hexdigest()[:16]
+        self.path = Path(index_dir or DEFAULT_INDEX_DIR) / f"{self.root.name}-{digest}.sqlite"
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection, creating or resetting the schema on first use."""
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    with closing(sqlite3.connect(self.path, timeout=5)) as conn:
+                        conn.execute("PRAGMA journal_mode=WAL")
+                        conn.executescript(_SCHEMA)
+                        row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+                        if row is None or row[0] != str(INDEX_VERSION):
+                            with conn:
+                                conn.execute("DELETE FROM files")
+                                conn.execute(
+                                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)",
+                                    (str(INDEX_VERSION),),
+                                )
+                    self._initialized = True
+        return sqlite3.connect(self.path, timeout=5)
+
+    def _key(self, path: Path) -> str | None:
+        try:
+            return path.relative_to(self.root).as_posix()
+        except ValueError:
+            return None
+
+    def _bloom(self, conn: sqlite3.Connection, key: str) -> bytes | None:
+        try:
+            row = conn.execute("SELECT bloom FROM files WHERE path = ?", (key,)).fetchone()
+        except sqlite3.Error:
+            return None
+        return row[0] if row is not None else None
+
+    def select(self, files: Iterable[Path], pattern: str, scope: Path) -> Iterator[Path]:
+        """Yield the files that may contain a match for pattern.
+
+        Files whose filter rules the pattern out are skipped unread; new and
+        changed files are read to (re)index them and always yielded.
+        Unreadable files are skipped. Index rows under ``scope`` whose files
+        no longer exist are dropped.
+
+        Args:
+            files: Candidate files, e.g. everything under the search path.
+            pattern: Regex the caller will search for.
+            scope: Directory ``files`` were collected from.
+
+        Yields:
+            Candidate files, in the order of ``files``.
+        """
+        hashes = [_hash(t) for t in required_trigrams(pattern)]
+        conn = None
+        try:
+            conn = self._connect()
+            rows = conn.execute("SELECT path, mtime_ns, size FROM files")
+            known = {path: (mtime_ns, size) for path, mtime_ns, size in rows}
+        except (sqlite3.Error, OSError):
+            if conn is not None:
+                conn.close()
+            conn, known = None, {}
+
+        updates = []
+        seen = set()
+        try:
+            for fp in files:
+                key = self._key(fp) if conn is not None else None
+                try:
+                    st = fp.stat()
+                except OSError:
+                    continue
+                if key is not None:
+                    seen.add(key)
+                    if known.get(key) == (st.st_mtime_ns, st.st_size):
+                        if hashes:
+                            bloom = self._bloom(conn, key)
+                            if bloom is not None and not may_contain(bloom, hashes):
+                                continue
+                        yield fp
+                        continue
+                    try:
+                        # Decoded like the search decodes it
+                        text = fp.read_bytes().decode("utf-8", "replace")
+                    except OSError:
+                        continue
+                    updates.append((key, st.st_mtime_ns, st.st_size, build_bloom(text)))
+                yield fp
+        finally:
+            if conn is not None:
+                scope_key = self._key(scope)
+                prefix = "" if scope_key in (None, ".") else scope_key + "/"
+                gone = [
+                    (key,)
+                    for key in known.keys() - seen
+                    if key.startswith(prefix) and not (self.root / key).exists()
+                ]
+                try:
+                    with conn:
+                        conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)", updates)
+                        conn.executemany("DELETE FROM files WHERE path = ?", gone)
+                except sqlite3.Error:
+                    pass
+                finally:
+                    conn.close()
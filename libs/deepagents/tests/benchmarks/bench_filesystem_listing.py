@@ -0,0 +1,61 @@
+"""Benchmark for cached directory listings in FilesystemBackend.
+
+Globs and lists a generated PDF-cache-like tree repeatedly, with the
+listing cache disabled and enabled.
+
+Run from the repository root with ``make benchmark`` or::
+
+    PYTHONPATH=libs:. python libs/deepagents/tests/benchmarks/bench_filesystem_listing.py [stocks]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from deepagents.backends import filesystem
+from deepagents.backends.filesystem import FilesystemBackend
+
+
+def _time_calls(backend: FilesystemBackend, stocks: list[str], rounds: int = 5) -> tuple[float, list]:
+    backend.glob_info("*.txt")  # Warm up
+    started = time.perf_counter()
+    for _ in range(rounds):
+        listing = backend.glob_info("*.txt")
+        for stock in stocks[:20]:
+            backend.ls_info(f"/{stock}")
+    return (time.perf_counter() - started) / rounds, listing
+
+
+def main(num_stocks: int = 500) -> None:
+    stocks = [f"{n:05d}" for n in range(num_stocks)]
+    with tempfile.TemporaryDirectory() as tmp:
+        for stock in stocks:
+            stock_dir = Path(tmp, stock)
+            stock_dir.mkdir()
+            for doc in range(20):
+                (stock_dir / f"2024-01-{doc:02d}-report.pdf").write_bytes(b"")
+                (stock_dir / f"2024-01-{doc:02d}-report.txt").write_text("x")
+        # Listings of just-modified directories are not cached
+        for root, dirs, _ in os.walk(tmp):
+            for d in dirs:
+                os.utime(Path(root, d), ns=(0, 0))
+        os.utime(tmp, ns=(0, 0))
+
+        cache_size = filesystem.DIR_CACHE_SIZE
+        filesystem.DIR_CACHE_SIZE = 0
+        try:
+            uncached_time, uncached = _time_calls(FilesystemBackend(root_dir=tmp, virtual_mode=True), stocks)
+        finally:
+            filesystem.DIR_CACHE_SIZE = cache_size
+        cached_time, cached = _time_calls(FilesystemBackend(root_dir=tmp, virtual_mode=True), stocks)
+
+    assert cached == uncached
+    print(f"tree:     {num_stocks} directories, {num_stocks * 40} files")
+    print(f"uncached: {uncached_time * 1000:7.1f} ms per glob + 20 ls")
+    print(f"cached:   {cached_time * 1000:7.1f} ms per glob + 20 ls")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
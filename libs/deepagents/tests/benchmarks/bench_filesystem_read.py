@@ -0,0 +1,57 @@
+"""Benchmark for ranged reads of large files in FilesystemBackend.
+
+Pages through a generated ~40 MB text file in 500-line windows at several
+offsets, once with whole-file reads and once through the mmap line index.
+
+Run from the repository root with ``make benchmark`` or::
+
+    PYTHONPATH=libs:. python libs/deepagents/tests/benchmarks/bench_filesystem_read.py [lines]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from deepagents.backends import filesystem
+from deepagents.backends.filesystem import FilesystemBackend
+
+
+def _time_reads(backend: FilesystemBackend, offsets: list[int]) -> tuple[list[float], list[str]]:
+    times, outputs = [], []
+    for offset in offsets:
+        started = time.perf_counter()
+        outputs.append(backend.read("/report.txt", offset=offset, limit=500))
+        times.append(time.perf_counter() - started)
+    return times, outputs
+
+
+def main(num_lines: int = 500_000) -> None:
+    offsets = [0, num_lines // 2, num_lines - 500]
+    with tempfile.TemporaryDirectory() as tmp:
+        line = "Revenue for the period increased by 12.5 per cent compared with last year. "
+        Path(tmp, "report.txt").write_text("".join(f"{i} {line}\n" for i in range(num_lines)), encoding="utf-8")
+        size_mb = Path(tmp, "report.txt").stat().st_size / 1024 / 1024
+
+        min_bytes = filesystem.RANGED_READ_MIN_BYTES
+        filesystem.RANGED_READ_MIN_BYTES = float("inf")
+        try:
+            full_times, full_outputs = _time_reads(FilesystemBackend(root_dir=tmp, virtual_mode=True), offsets)
+        finally:
+            filesystem.RANGED_READ_MIN_BYTES = min_bytes
+
+        backend = FilesystemBackend(root_dir=tmp, virtual_mode=True)
+        started = time.perf_counter()
+        backend.read("/report.txt", limit=1)
+        index_time = time.perf_counter() - started
+        ranged_times, ranged_outputs = _time_reads(backend, offsets)
+
+    assert ranged_outputs == full_outputs
+    print(f"file:        {size_mb:.1f} MB, {num_lines} lines")
+    print(f"index build: {index_time * 1000:.1f} ms (once per file version)")
+    for offset, full, ranged in zip(offsets, full_times, ranged_times):
+        print(f"offset {offset:>7}: full {full * 1000:7.1f} ms  ranged {ranged * 1000:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
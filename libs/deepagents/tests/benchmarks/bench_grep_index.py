@@ -0,0 +1,56 @@
+"""Benchmark for the trigram grep index of FilesystemBackend.
+
+Greps a generated cache of text sidecars with the Python fallback (no
+ripgrep), without an index, on the first indexed run (which builds the
+index while searching) and on a warm index.
+
+Run from the repository root with ``make benchmark`` or::
+
+    PYTHONPATH=libs:. python libs/deepagents/tests/benchmarks/bench_grep_index.py [files]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from deepagents.backends.filesystem import FilesystemBackend
+
+
+def _grep(backend: FilesystemBackend, pattern: str) -> tuple[float, list]:
+    started = time.perf_counter()
+    matches = backend.grep_raw(pattern, path="/")
+    return time.perf_counter() - started, matches
+
+
+def main(num_files: int = 200) -> None:
+    body = "".join(
+        f"Line {i}: revenue for the period increased by {i % 97}.{i % 10} per cent; 集团营业额同比上升。\n"
+        for i in range(3000)
+    )
+    with tempfile.TemporaryDirectory() as tmp, tempfile.TemporaryDirectory() as index_dir:
+        for n in range(num_files):
+            stock = Path(tmp, f"{n % 50:05d}")
+            stock.mkdir(exist_ok=True)
+            extra = "Impairment of goodwill was recognised.\n" if n == num_files // 2 else ""
+            (stock / f"report-{n}.txt").write_text(body + extra, encoding="utf-8")
+        size_mb = sum(p.stat().st_size for p in Path(tmp).rglob("*.txt")) / 1024 / 1024
+
+        plain = FilesystemBackend(root_dir=tmp, virtual_mode=True)
+        indexed = FilesystemBackend(root_dir=tmp, virtual_mode=True, grep_index=True, grep_index_dir=index_dir)
+        for backend in (plain, indexed):
+            backend._ripgrep_search = lambda *args: None
+
+        plain_time, expected = _grep(plain, "goodwill")
+        cold_time, cold = _grep(indexed, "goodwill")
+        warm_time, warm = _grep(indexed, "goodwill")
+
+    assert cold == warm == expected and len(expected) == 1
+    print(f"cache:      {num_files} files, {size_mb:.0f} MB")
+    print(f"no index:   {plain_time * 1000:8.1f} ms")
+    print(f"cold index: {cold_time * 1000:8.1f} ms (builds the index)")
+    print(f"warm index: {warm_time * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
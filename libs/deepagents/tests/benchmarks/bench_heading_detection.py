@@ -0,0 +1,58 @@
+"""Benchmark for NumPy font profiling against the per-character dict histogram.
+
+Character lists are taken from a generated report up front, so only the
+font statistics themselves are timed. Both sides read every character's
+size once; the profile reads nothing else per character.
+
+Run from the repository root with ``make benchmark`` or::
+
+    PYTHONPATH=libs:. python libs/deepagents/tests/benchmarks/bench_heading_detection.py
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+import pdfplumber
+
+from deepagents.tests.pdf_fixtures import write_text_pdf
+from src.services.pdf_extraction import font_profile
+
+
+def legacy_max_font_size(chars: list[dict]) -> float:
+    """Per-page font size histogram as analyze_structure used to build it."""
+    font_sizes = {}
+    for char in chars:
+        size = char.get("size", 0)
+        if size > 0:
+            font_sizes[size] = font_sizes.get(size, 0) + 1
+    return max(font_sizes.keys()) if font_sizes else 0
+
+
+def _best_of(func, pages: list[list[dict]], repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for chars in pages:
+            func(chars)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(num_pages: int = 40) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = write_text_pdf(Path(tmp) / "annual_report.pdf", num_pages, lines_per_page=60, subheadings=True)
+        with pdfplumber.open(pdf_path) as pdf:
+            pages = [page.chars for page in pdf.pages]
+
+    legacy = _best_of(legacy_max_font_size, pages)
+    current = _best_of(font_profile, pages)
+    chars = sum(len(p) for p in pages)
+    print(f"pages: {num_pages}, chars: {chars:,}")
+    print(f"legacy histogram (max size only):        {legacy * 1000:.1f} ms")
+    print(f"numpy profile (sizes, heading lines):    {current * 1000:.1f} ms")
+    print(f"ratio: {legacy / current:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Micro-benchmark for cleaning titleSearchServlet.do responses.
+
+Compares the single-pass cleaner in ``HKEXAPIBase`` with the previous
+replace/re.sub chain on a 500-row response shaped like a recorded one.
+
+Run from the repository root with ``make benchmark`` or::
+
+    PYTHONPATH=libs:. python libs/deepagents/tests/benchmarks/bench_hkex_cleaning.py
+"""
+
+import json
+import re
+import timeit
+from typing import Any
+
+from src.services.hkex_api import HKEXAPIBase
+
+
+def legacy_clean_html_entities(text: str) -> str:
+    """The replace/re.sub chain used before the single-pass cleaner."""
+    if not text:
+        return text
+    text = text.replace("&lt;", "<")
+    text = text.replace("&gt;", ">")
+    text = text.replace("&amp;", "&")
+    text = re.sub(r"\\u003c", "<", text)
+    text = re.sub(r"\\u003e", ">", text)
+    text = re.sub(r"\\u2013", "-", text)
+    text = text.replace("\\u0026", "-")
+    return text.replace("\\\\", "")
+
+
+def legacy_clean_result_data(result_data: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    cleaned_results = []
+    for item in result_data:
+        cleaned_item = {}
+        for key, value in item.items():
+            cleaned_item[key] = legacy_clean_html_entities(value) if isinstance(value, str) else value
+        cleaned_results.append(cleaned_item)
+    return cleaned_results
+
+
+def build_search_response(rows: int = 500) -> str:
+    """Build the ``result`` string of a titleSearchServlet.do response.
+
+    Field names, value shapes and escape density follow a recorded 500-row
+    search for a large-cap issuer: most fields are plain, LONG_TEXT carries
+    HTML line breaks and the odd ampersand.
+    """
+    items = []
+    for i in range(rows):
+        day = 28 - i % 28
+        items.append(
+            {
+                "FILE_INFO": f"{100 + i % 900}KB",
+                "NEWS_ID": str(11_000_000 + i),
+                "SHORT_TEXT": "公告及通告 - [其他 - 業務發展]",
+                "TOTAL_COUNT": str(rows),
+                "DOD_WEB_PATH": "",
+                "STOCK_NAME": "騰訊控股",
+                "TITLE": f"翌日披露報表 &amp; 股份購回 ({i})",
+                "FILE_TYPE": "PDF",
+                "DATE_TIME": f"{day:02d}/03/2025 17:{i % 60:02d}",
+                "LONG_TEXT": (
+                    "公告及通告 - [翌日披露報表]\\u003cbr/\\u003e"
+                    + "根據《上市規則》第 13.25A 條作出之披露 \\u2013 股份購回 " * 8
+                    + "&lt;br/&gt;"
+                ),
+                "STOCK_CODE": "00700",
+                "FILE_LINK": f"/listedco/listconews/sehk/2025/03{day:02d}/2025030{i % 10}{i:05d}_c.pdf",
+            }
+        )
+    return json.dumps(items, ensure_ascii=False)
+
+
+def main(number: int = 50) -> None:
+    service = HKEXAPIBase()
+    raw = build_search_response()
+    parsed = json.loads(raw)
+
+    assert legacy_clean_result_data(parsed) == service._clean_result_data(raw)
+
+    legacy = timeit.timeit(lambda: legacy_clean_result_data(json.loads(raw)), number=number)
+    current = timeit.timeit(lambda: service._clean_result_data(raw), number=number)
+    print(f"legacy:  {legacy / number * 1000:.2f} ms per 500-row response")
+    print(f"current: {current / number * 1000:.2f} ms per 500-row response")
+    print(f"speedup: {legacy / current:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Benchmark for the PDF text layer backends.
+
+Extracts every PDF of a local corpus with each backend in TEXT_BACKENDS and
+reports throughput plus output parity against pdfplumber (word-level
+similarity per page). Defaults to the ``pdf_cache`` directory of downloaded
+HKEX announcements; when it holds no PDFs, a generated report is used.
+
+Run from the repository root with ``make benchmark`` or::
+
+    PYTHONPATH=libs:. python libs/deepagents/tests/benchmarks/bench_pdf_text_backends.py [corpus_dir]
+"""
+
+import difflib
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from deepagents.tests.pdf_fixtures import write_text_pdf
+from src.services.pdf_extraction import TEXT_BACKENDS, extract_page_texts
+
+
+def _corpus(root: Path) -> list[Path]:
+    """PDFs under ``root``, one per inode (cache entries hardlink blobs)."""
+    seen = set()
+    pdfs = []
+    for path in sorted(root.rglob("*.pdf")) if root.is_dir() else []:
+        inode = path.stat().st_ino
+        if inode not in seen:
+            seen.add(inode)
+            pdfs.append(path)
+    return pdfs
+
+
+def _similarity(a: str, b: str) -> float:
+    return difflib.SequenceMatcher(None, a.split(), b.split(), autojunk=False).ratio()
+
+
+def main(corpus_dir: str = "pdf_cache") -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        pdfs = _corpus(Path(corpus_dir))
+        if not pdfs:
+            print(f"no PDFs under {corpus_dir}, using a generated 100-page report")
+            pdfs = [write_text_pdf(Path(tmp) / "annual_report.pdf", 100, table_every=4)]
+
+        texts: dict[str, list[list[str]]] = {}
+        for backend in TEXT_BACKENDS:
+            started = time.perf_counter()
+            texts[backend] = [extract_page_texts(str(pdf), backend=backend) for pdf in pdfs]
+            elapsed = time.perf_counter() - started
+            pages = sum(len(doc) for doc in texts[backend])
+            chars = sum(len(page) for doc in texts[backend] for page in doc)
+            print(f"{backend:<11} {len(pdfs)} PDFs, {pages} pages in {elapsed:.2f} s ({pages / elapsed:.1f} pages/s, {chars:,} chars)")
+
+    reference = texts["pdfplumber"]
+    for backend in TEXT_BACKENDS:
+        if backend == "pdfplumber":
+            continue
+        scores = [_similarity(ours, ref) for doc, ref_doc in zip(texts[backend], reference) for ours, ref in zip(doc, ref_doc)]
+        mean = sum(scores) / len(scores) if scores else 1.0
+        print(f"{backend} vs pdfplumber: mean page similarity {mean:.3f}, min {min(scores, default=1.0):.3f}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
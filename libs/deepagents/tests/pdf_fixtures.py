@@ -0,0 +1,111 @@
+"""Synthetic PDF documents for PDF service tests and benchmarks.
+
+Written by hand (no PDF library needed) so fixtures of any size can be
+generated on the fly instead of being checked in.
+"""
+
+from pathlib import Path
+
+
+def _pdf_string(text: str) -> str:
+    return "(" + text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ")"
+
+
+def _page_stream(page_num: int, lines_per_page: int, table_rows: int, subheading: bool = False) -> bytes:
+    ops = ["BT", "/F1 18 Tf", "50 800 Td", _pdf_string(f"Section {page_num}") + " Tj", "/F1 9 Tf", "0 -24 Td"]
+    for line in range(lines_per_page):
+        if subheading and line == lines_per_page // 2:
+            ops += ["/F2 9 Tf", _pdf_string(f"Review of operations {page_num}") + " Tj", "0 -12 Td", "/F1 9 Tf"]
+        ops.append(
+            _pdf_string(
+                f"Page {page_num} line {line}: revenue for the period increased by {line * 7 % 97}.{line % 10}"
+                " per cent compared with the corresponding period last year."
+            )
+            + " Tj"
+        )
+        ops.append("0 -12 Td")
+    ops.append("ET")
+
+    if table_rows:
+        # A ruled grid with a number in each cell, as in financial statements
+        top = 300
+        ops.append("0.5 w")
+        for row in range(table_rows + 1):
+            y = top - row * 16
+            ops.append(f"50 {y} m 500 {y} l S")
+        for col in range(4):
+            x = 50 + col * 150
+            ops.append(f"{x} {top} m {x} {top - table_rows * 16} l S")
+        for row in range(table_rows):
+            for col in range(3):
+                x, y = 56 + col * 150, top - row * 16 - 12
+                ops.append(f"BT /F1 9 Tf {x} {y} Td " + _pdf_string(f"{page_num}.{row}.{col}") + " Tj ET")
+
+    return "\n".join(ops).encode("latin-1")
+
+
+def build_text_pdf(
+    num_pages: int,
+    lines_per_page: int = 40,
+    table_every: int = 0,
+    table_rows: int = 6,
+    subheadings: bool = False,
+) -> bytes:
+    """Build a multi-page text PDF.
+
+    Every page starts with an 18pt "Section <n>" heading over 9pt body text.
+
+    Args:
+        num_pages: Number of pages.
+        lines_per_page: Body text lines per page.
+        table_every: Put a ruled table on every n-th page (0 for none).
+        table_rows: Rows per table.
+        subheadings: Add a bold 9pt "Review of operations <n>" line mid-page.
+
+    Returns:
+        PDF file contents.
+    """
+    objects: list[bytes] = []
+    page_ids = []
+    # 1: catalog, 2: pages, 3-4: fonts; pages and contents follow
+    next_id = 5
+    for page_num in range(1, num_pages + 1):
+        rows = table_rows if table_every and page_num % table_every == 0 else 0
+        stream = _page_stream(page_num, lines_per_page, rows, subheadings)
+        page_id, content_id = next_id, next_id + 1
+        next_id += 2
+        page_ids.append(page_id)
+        objects.append(
+            f"{page_id} 0 obj\n<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents {content_id} 0 R >>\nendobj\n".encode()
+        )
+        objects.append(
+            f"{content_id} 0 obj\n<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream\nendobj\n"
+        )
+
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids)
+    header_objects = [
+        b"1 0 obj\n<< /Type /Catalog /Pages 2 0 R >>\nendobj\n",
+        f"2 0 obj\n<< /Type /Pages /Kids [{kids}] /Count {num_pages} >>\nendobj\n".encode(),
+        b"3 0 obj\n<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>\nendobj\n",
+        b"4 0 obj\n<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold >>\nendobj\n",
+    ]
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for obj in header_objects + objects:
+        offsets.append(len(out))
+        out += obj
+    xref_offset = len(out)
+    out += f"xref\n0 {len(offsets) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(offsets) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def write_text_pdf(path: str | Path, num_pages: int, **kwargs) -> Path:
+    """Write build_text_pdf() output to ``path`` and return it."""
+    path = Path(path)
+    path.write_bytes(build_text_pdf(num_pages, **kwargs))
+    return path
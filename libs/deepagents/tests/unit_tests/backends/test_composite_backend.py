@@ -387,3 +387,40 @@ def test_composite_backend_intercept_large_tool_result_routed_to_store():
     stored_item = rt.store.get(("filesystem",), "/test_routed_123")
     assert stored_item is not None
     assert stored_item.value["content"] == [large_content]
+
+
+def test_composite_backend_root_search_fans_out(tmp_path: Path):
+    """Root-level grep and glob query all backends concurrently and merge in a fixed order."""
+    import asyncio
+    import threading
+
+    class SlowBackend(FilesystemBackend):
+        def __init__(self, root_dir, barrier):
+            super().__init__(root_dir=root_dir, virtual_mode=True)
+            self.barrier = barrier
+
+        def grep_raw(self, pattern, path=None, glob=None):
+            # Every backend must be running at the same time to pass the barrier
+            self.barrier.wait(timeout=5)
+            return super().grep_raw(pattern, path, glob)
+
+        def glob_info(self, pattern, path="/"):
+            self.barrier.wait(timeout=5)
+            return super().glob_info(pattern, path)
+
+    barrier = threading.Barrier(3)
+    for name in ("root", "pdf_cache", "md"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / f"{name}.txt").write_text("revenue\n")
+    comp = CompositeBackend(
+        default=SlowBackend(tmp_path / "root", barrier),
+        routes={"/pdf_cache/": SlowBackend(tmp_path / "pdf_cache", barrier), "/md/": SlowBackend(tmp_path / "md", barrier)},
+    )
+
+    expected_grep = ["/root.txt", "/pdf_cache/pdf_cache.txt", "/md/md.txt"]
+    assert [m["path"] for m in comp.grep_raw("revenue", path="/")] == expected_grep
+    assert [m["path"] for m in asyncio.run(comp.agrep_raw("revenue", path="/"))] == expected_grep
+
+    expected_glob = ["/md/md.txt", "/pdf_cache/pdf_cache.txt", "/root.txt"]
+    assert [i["path"] for i in comp.glob_info("*.txt", path="/")] == expected_glob
+    assert [i["path"] for i in asyncio.run(comp.aglob_info("*.txt", path="/"))] == expected_glob
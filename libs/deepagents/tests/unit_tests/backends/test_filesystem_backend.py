@@ -1,5 +1,8 @@
+import shutil
 from pathlib import Path
 
+import pytest
+
 from deepagents.backends.filesystem import FilesystemBackend
 from deepagents.backends.protocol import EditResult, WriteResult
 
@@ -217,3 +220,152 @@ def test_filesystem_backend_intercept_large_tool_result(tmp_path: Path):
     saved_file = root / "large_tool_results" / "test_fs_123"
     assert saved_file.exists()
     assert saved_file.read_text() == large_content
+
+
+def test_filesystem_backend_ranged_read_matches_full_read(tmp_path: Path, monkeypatch):
+    from deepagents.backends import filesystem
+
+    lines = [f"line {i} 营业额 {i * 7}" for i in range(2500)]
+    f = tmp_path / "report.txt"
+    f.write_bytes("\r\n".join(lines).encode("utf-8"))
+    be = FilesystemBackend(root_dir=str(tmp_path), virtual_mode=True)
+
+    full = {(o, n): be.read("/report.txt", offset=o, limit=n) for o, n in [(0, 10), (999, 3), (2495, 500), (2500, 1)]}
+    monkeypatch.setattr(filesystem, "RANGED_READ_MIN_BYTES", 1)
+    for (o, n), expected in full.items():
+        assert be.read("/report.txt", offset=o, limit=n) == expected
+
+    # The index is rebuilt once the file changes
+    f.write_text("\n".join(lines[:5]) + "\n")
+    assert "exceeds file length (5 lines)" in be.read("/report.txt", offset=7)
+
+
+@pytest.mark.parametrize("content", ["\u3000\n" * 3, " \x1f\t\n\u00a0\u2003\n", "\u3000\n营\n", "\u3000\n\x1f!\n"])
+def test_filesystem_backend_ranged_read_agrees_on_empty_files(tmp_path: Path, monkeypatch, content):
+    from deepagents.backends import filesystem
+
+    (tmp_path / "f.txt").write_text(content, encoding="utf-8")
+    be = FilesystemBackend(root_dir=str(tmp_path), virtual_mode=True)
+    full = be.read("/f.txt", limit=1)
+    monkeypatch.setattr(filesystem, "RANGED_READ_MIN_BYTES", 1)
+    assert be.read("/f.txt", limit=1) == full
+
+
+def test_filesystem_backend_ranged_read_falls_back_on_other_line_breaks(tmp_path: Path, monkeypatch):
+    from deepagents.backends import filesystem
+
+    f = tmp_path / "mixed.txt"
+    f.write_bytes("a\rb c\nd".encode("utf-8"))
+    be = FilesystemBackend(root_dir=str(tmp_path), virtual_mode=True)
+    expected = be.read("/mixed.txt", offset=2, limit=2)
+
+    monkeypatch.setattr(filesystem, "RANGED_READ_MIN_BYTES", 1)
+    assert be.read("/mixed.txt", offset=2, limit=2) == expected
+    assert "d" in expected
+
+
+def test_filesystem_backend_python_grep_skips_binaries(tmp_path: Path, monkeypatch):
+    write_file(tmp_path / "b.txt", "revenue up\r\nno match\r\nrevenue down\r\n")
+    write_file(tmp_path / "a" / "notes.md", "revenue: n/a\n")
+    (tmp_path / "report.pdf").write_bytes(b"%PDF-1.4\nrevenue\n")
+    (tmp_path / "report.dat").write_bytes(b"%PDF-1.4\nrevenue\n")
+    (tmp_path / "blob").write_bytes(b"revenue\x00\x01\x02")
+    (tmp_path / "latin1.txt").write_bytes("revenue caf\xe9\n".encode("latin-1"))
+    write_file(tmp_path / "big.txt", "revenue\n" + "x" * (1024 * 1024))
+
+    be = FilesystemBackend(root_dir=str(tmp_path), virtual_mode=True, max_file_size_mb=1)
+    monkeypatch.setattr(be, "_ripgrep_search", lambda *args: None)
+
+    assert be.grep_raw("revenue") == [
+        {"path": "/a/notes.md", "line": 1, "text": "revenue: n/a"},
+        {"path": "/b.txt", "line": 1, "text": "revenue up"},
+        {"path": "/b.txt", "line": 3, "text": "revenue down"},
+        {"path": "/latin1.txt", "line": 1, "text": "revenue caf�"},
+    ]
+
+
+def test_filesystem_backend_python_grep_line_numbers_across_blocks(tmp_path: Path, monkeypatch):
+    from deepagents.backends import filesystem
+
+    lines = [f"{i} {'营业额' if i % 7 == 0 else 'x' * (i % 50)}" for i in range(400)]
+    write_file(tmp_path / "r.txt", "\n".join(lines))
+    monkeypatch.setattr(filesystem, "BINARY_SNIFF_BYTES", 5)
+    monkeypatch.setattr(filesystem, "GREP_BLOCK_BYTES", 16)
+    be = FilesystemBackend(root_dir=str(tmp_path), virtual_mode=True)
+    monkeypatch.setattr(be, "_ripgrep_search", lambda *args: None)
+
+    expected = [{"path": "/r.txt", "line": i + 1, "text": line} for i, line in enumerate(lines) if "营业额" in line]
+    assert be.grep_raw("营业额") == expected
+    assert be.grep_raw("^399 ") == [{"path": "/r.txt", "line": 400, "text": lines[-1]}]
+
+
+def make_search_tree(root: Path) -> None:
+    write_file(root / "a.txt", "revenue 1\n")
+    write_file(root / "sub" / "b.md", "revenue 2\n")
+    write_file(root / "sub" / "skip.txt", "revenue 3\n")
+    write_file(root / "sub" / ".gitignore", "skip.txt\n")
+    write_file(root / ".hidden.txt", "revenue 4\n")
+    write_file(root / ".blobs" / "ab" / "c.txt", "revenue 5\n")
+    write_file(root / "vendor" / "v.txt", "revenue 6\n")
+    write_file(root / "keep.log", "revenue 7\n")
+    write_file(root / "drop.log", "revenue 8\n")
+    write_file(root / ".ignore", "*.log\n!keep.log\n/vendor/\n")
+    (root / ".git").mkdir()
+    (root / "link.txt").symlink_to(root / "a.txt")
+    (root / "late.dat").write_bytes(b"revenue 9\n" + b"x" * 20000 + b"\n\x00")
+
+
+def test_filesystem_backend_python_grep_picks_files_like_ripgrep(tmp_path: Path, monkeypatch):
+    make_search_tree(tmp_path)
+    be = FilesystemBackend(root_dir=str(tmp_path), virtual_mode=True)
+    monkeypatch.setattr(be, "_ripgrep_search", lambda *args: None)
+
+    assert [m["path"] for m in be.grep_raw("revenue")] == ["/a.txt", "/keep.log", "/sub/b.md"]
+    assert [m["path"] for m in be.grep_raw("revenue", glob="*.txt")] == ["/.hidden.txt", "/a.txt", "/sub/skip.txt"]
+    assert [m["path"] for m in be.grep_raw("revenue", "/.blobs")] == ["/.blobs/ab/c.txt"]
+    assert [m["path"] for m in be.grep_raw("revenue", "/sub/skip.txt", glob="*.md")] == ["/sub/skip.txt"]
+
+
+@pytest.mark.skipif(shutil.which("rg") is None, reason="ripgrep is not installed")
+@pytest.mark.parametrize(
+    ("path", "glob"),
+    [("/", None), ("/", "*.txt"), ("/", "*.{md,log}"), ("/sub", None), ("/.blobs", None), ("/sub/skip.txt", "*.md"), ("/.hidden.txt", None)],
+)
+def test_filesystem_backend_python_grep_matches_ripgrep(tmp_path: Path, monkeypatch, path, glob):
+    make_search_tree(tmp_path)
+    be = FilesystemBackend(root_dir=str(tmp_path), virtual_mode=True)
+    from_ripgrep = be.grep_raw("revenue", path, glob)
+    monkeypatch.setattr(be, "_ripgrep_search", lambda *args: None)
+
+    assert be.grep_raw("revenue", path, glob) == from_ripgrep
+
+
+def test_filesystem_backend_listing_cache(tmp_path: Path, monkeypatch):
+    import os
+
+    from deepagents.backends import filesystem
+
+    write_file(tmp_path / "0001" / "report.txt", "revenue")
+    write_file(tmp_path / "0002" / "notice.txt", "dividend")
+    for d in (tmp_path, tmp_path / "0001", tmp_path / "0002"):
+        os.utime(d, ns=(1_000_000_000, 1_000_000_000))
+
+    be = FilesystemBackend(root_dir=str(tmp_path), virtual_mode=True)
+    first = be.glob_info("*.txt")
+    assert [i["path"] for i in first] == ["/0001/report.txt", "/0002/notice.txt"]
+
+    scanned = []
+    scan_dir = filesystem._scan_dir
+    monkeypatch.setattr(filesystem, "_scan_dir", lambda d: scanned.append(d.name) or scan_dir(d))
+    assert be.glob_info("*.txt") == first
+    assert be.ls_info("/0001") == [i for i in first if i["path"].startswith("/0001/")]
+    assert scanned == []
+
+    # Our own edits invalidate the listing even though the directory mtime is unchanged
+    be.edit("/0001/report.txt", "revenue", "revenue and profit")
+    assert be.ls_info("/0001")[0]["size"] == len("revenue and profit")
+    assert scanned == ["0001"]
+
+    # Changes by others show up through the directory mtime
+    write_file(tmp_path / "0002" / "circular.txt", "x")
+    assert [i["path"] for i in be.glob_info("*.txt", path="/0002")] == ["/0002/circular.txt", "/0002/notice.txt"]
@@ -0,0 +1,71 @@
+import re
+from pathlib import Path
+
+from deepagents.backends import grep_index
+from deepagents.backends.filesystem import FilesystemBackend
+from deepagents.backends.grep_index import required_trigrams
+
+
+def test_required_trigrams():
+    assert required_trigrams("revenue") == {"rev", "eve", "ven", "enu", "nue"}
+    # Case-insensitive matches survive folding
+    assert required_trigrams("(?i)PROFIT") == required_trigrams("profit")
+    assert required_trigrams(r"^营业额\s+\d+") == {"营业额"}
+    assert required_trigrams(r"(?:abc)+x?def") == {"abc", "def"}
+    # Alternations and optional parts require nothing
+    assert required_trigrams("revenue|profit") == set()
+    assert required_trigrams("(?:revenue)?") == set()
+    assert required_trigrams("[a-z]+") == set()
+
+
+def test_folding_agrees_with_ignorecase():
+    for text, pattern in [("İSTANBUL", "istanbul"), ("DİYARBAKIR", "diyarbakir"), ("\u212aelvin", "KELVIN"), ("ſtrasse", "STRASSE")]:
+        assert re.search(pattern, text, re.IGNORECASE)
+        assert grep_index.fold(pattern) in grep_index.fold(text)
+
+
+def test_grep_index_skips_files_that_cannot_match(tmp_path: Path, monkeypatch):
+    for i in range(5):
+        (tmp_path / f"doc{i}.txt").write_text(f"company {i} annual report\nrevenue {i * 10}\n")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "target.txt").write_text("集团营业额增长 12%\n")
+
+    index_dir = tmp_path.parent / f"{tmp_path.name}-index"
+    be = FilesystemBackend(root_dir=str(tmp_path), virtual_mode=True, grep_index=True, grep_index_dir=index_dir)
+    monkeypatch.setattr(be, "_ripgrep_search", lambda *args: None)
+    assert be.grep_raw("营业额") == [{"path": "/sub/target.txt", "line": 1, "text": "集团营业额增长 12%"}]
+    # The index is kept out of the tree it indexes
+    assert be._grep_index.path.parent == index_dir
+    assert be._grep_index.path.exists()
+    assert [f["path"] for f in be.ls_info("/")] == [f"/doc{i}.txt" for i in range(5)] + ["/sub/"]
+
+    read = []
+    search_file = be._search_file
+    monkeypatch.setattr(be, "_search_file", lambda regex, fp: read.append(fp.name) or search_file(regex, fp))
+
+    assert [m["path"] for m in be.grep_raw("营业额")] == ["/sub/target.txt"]
+    assert read == ["target.txt"]
+
+    # Changed and new files are picked up, deleted ones dropped
+    read.clear()
+    (tmp_path / "doc3.txt").write_text("revenue up; 营业额 rose\n")
+    (tmp_path / "sub" / "target.txt").unlink()
+    assert [m["path"] for m in be.grep_raw("营业额")] == ["/doc3.txt"]
+    assert read == ["doc3.txt"]
+
+    # Patterns without a required literal still search everything
+    assert len(be.grep_raw(r"\d+")) == 8
+
+
+def test_grep_index_disabled_without_regex_parser(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(grep_index, "INDEX_AVAILABLE", False)
+    assert required_trigrams("revenue") == set()
+
+    from deepagents.backends import filesystem
+
+    monkeypatch.setattr(filesystem, "INDEX_AVAILABLE", False)
+    (tmp_path / "a.txt").write_text("revenue\n")
+    be = FilesystemBackend(root_dir=str(tmp_path), virtual_mode=True, grep_index=True, grep_index_dir=tmp_path / "index")
+    monkeypatch.setattr(be, "_ripgrep_search", lambda *args: None)
+    assert be._grep_index is None
+    assert [m["path"] for m in be.grep_raw("revenue")] == ["/a.txt"]
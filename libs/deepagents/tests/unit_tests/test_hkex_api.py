@@ -0,0 +1,688 @@
+"""Unit tests for the HKEX API service."""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+import httpx
+
+from deepagents.backends.filesystem import FilesystemBackend
+from src.services import hkex_api
+from src.services.category_cache import CategoryTaxonomy
+from src.services.feed_index import AnnouncementFeedIndex
+from src.services.hkex_api import AsyncHKEXAPIService, HKEXAPIService
+from src.services.http_client import HTTPPoolConfig
+from src.services.pdf_parser import PDFParserService, parse_file_info_size
+from src.services.rate_limit import RateLimiter, RetryPolicy, TokenBucket
+from src.services.stock_cache import StockIdCache
+
+
+def make_client(handler) -> httpx.Client:
+    return httpx.Client(transport=httpx.MockTransport(handler), headers=HKEXAPIService.DEFAULT_HEADERS)
+
+
+class TestConnectionPool:
+    """Test the shared keep-alive HTTP client."""
+
+    def test_methods_reuse_service_client(self):
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.url.path)
+            if request.url.path.endswith("prefix.do"):
+                return httpx.Response(200, text='callback({"stockInfo": [{"stockId": 123, "code": "00673"}]});')
+            return httpx.Response(200, json={"result": "[]"})
+
+        client = make_client(handler)
+        service = HKEXAPIService(client=client)
+        stock_id, _ = service.get_stock_id("00673")
+        service.search_announcements(stock_id=str(stock_id), from_date="20250101", to_date="20250201")
+
+        assert stock_id == 123
+        assert seen == ["/search/prefix.do", "/search/titleSearchServlet.do"]
+        assert service.client is client
+
+    def test_close_only_closes_owned_client(self):
+        shared = make_client(lambda request: httpx.Response(200))
+        service = HKEXAPIService(client=shared)
+        service.close()
+        assert not shared.is_closed
+
+        with HKEXAPIService() as owned:
+            pass
+        assert owned.client.is_closed
+
+    def test_pdf_service_shares_pool(self):
+        hkex = HKEXAPIService()
+        pdf = PDFParserService(client=hkex.client)
+        assert pdf.client is hkex.client
+        pdf.close()
+        assert not hkex.client.is_closed
+        hkex.close()
+
+    def test_pool_config_from_env(self, monkeypatch):
+        monkeypatch.setenv("HKEX_HTTP_MAX_CONNECTIONS", "7")
+        monkeypatch.setenv("HKEX_HTTP2", "true")
+        config = HTTPPoolConfig.from_env()
+        assert config.max_connections == 7
+        assert config.http2 is True
+        assert config.limits.max_connections == 7
+
+
+class TestAsyncService:
+    """Test the async HKEX service and tool coroutines."""
+
+    def test_search_many_is_bounded_and_ordered(self):
+        in_flight = 0
+        peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if request.url.path.endswith("prefix.do"):
+                code = request.url.params["name"]
+                return httpx.Response(200, text=f'callback({{"stockInfo": [{{"stockId": {int(code)}}}]}});')
+            stock_id = request.url.params["stockId"]
+            return httpx.Response(200, json={"result": f'[{{"NEWS_ID": "{stock_id}"}}]'})
+
+        async def run():
+            client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            async with AsyncHKEXAPIService(client=client, max_concurrency=3) as service:
+                return await service.search_many([f"{i:05d}" for i in range(1, 11)], "20250101", "20250201")
+
+        results = asyncio.run(run())
+
+        assert [r["stock_id"] for r in results] == list(range(1, 11))
+        assert [r["announcements"][0]["NEWS_ID"] for r in results] == [str(i) for i in range(1, 11)]
+        assert 1 < peak <= 3
+
+    def test_owned_clients_are_closed_with_their_loop(self, monkeypatch):
+        clients = []
+
+        def create_client(headers, timeout, config=None):
+            clients.append(httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, json=[]))))
+            return clients[-1]
+
+        monkeypatch.setattr(hkex_api, "create_async_http_client", create_client)
+        service = AsyncHKEXAPIService()
+
+        async def session(calls: int) -> bool:
+            async with service:
+                await asyncio.gather(*(service.get_categories("doc") for _ in range(calls)))
+                return service.client.is_closed
+
+        async def overlapping() -> None:
+            # The pool stays open until the last overlapping block exits
+            await asyncio.gather(session(3), session(1))
+            assert len(clients) == 2 and clients[-1].is_closed
+
+        assert asyncio.run(session(2)) is False
+        assert [client.is_closed for client in clients] == [True]
+        asyncio.run(overlapping())
+
+        # A client left open on an idle loop is closed by the synchronous shutdown hook
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(service.get_categories("doc"))
+            assert not clients[-1].is_closed
+            service.close()
+            assert clients[-1].is_closed
+        finally:
+            loop.close()
+
+    def test_client_is_closed_on_its_own_loop_from_another_thread(self, monkeypatch):
+        clients = []
+
+        def create_client(headers, timeout, config=None):
+            clients.append(httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, json=[]))))
+            return clients[-1]
+
+        monkeypatch.setattr(hkex_api, "create_async_http_client", create_client)
+        service = AsyncHKEXAPIService()
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever)
+        thread.start()
+        try:
+            asyncio.run_coroutine_threadsafe(service.get_categories("doc"), loop).result(timeout=5)
+            # Closing from another loop hands the client to the loop it was opened on
+            asyncio.run(service.aclose())
+            deadline = time.monotonic() + 5
+            while not clients[0].is_closed and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert clients[0].is_closed
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+    def test_tools_have_async_coroutines(self):
+        from src.tools.hkex_tools import (
+            get_announcement_categories,
+            get_latest_hkex_announcements,
+            get_stock_info,
+            search_hkex_announcements,
+        )
+
+        for t in (search_hkex_announcements, get_latest_hkex_announcements, get_stock_info, get_announcement_categories):
+            assert t.coroutine is not None
+
+
+class TestResultCleaning:
+    """Test the single-pass response cleaner."""
+
+    def test_entities_and_escapes(self):
+        clean = HKEXAPIService()._clean_html_entities
+
+        assert clean("a &lt;b&gt; &amp; c") == "a <b> & c"
+        assert clean("x\\u003cbr/\\u003e y \\u2013 z \\u0026") == "x<br/> y - z -"
+        # Replacements are not re-applied to their own output
+        assert clean("&amp;lt;") == "&lt;"
+        assert clean("a\\\\b") == "ab"
+        assert clean("\\\\u003c") == "\\<"
+        assert clean("plain text") == "plain text"
+
+    def test_non_string_fields_untouched(self):
+        service = HKEXAPIService()
+        rows = service._clean_result_data('[{"TITLE": "A &amp; B", "TOTAL_COUNT": 3}]')
+        assert rows == [{"TITLE": "A & B", "TOTAL_COUNT": 3}]
+
+
+class TestStockIdCache:
+    """Test the persistent stock code → stockId cache."""
+
+    def test_lookup_is_cached_including_misses(self, tmp_path):
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            code = request.url.params["name"]
+            calls.append(code)
+            if code == "99999":
+                return httpx.Response(200, text='callback({"stockInfo": []});')
+            return httpx.Response(200, text='callback({"stockInfo": [{"stockId": 7, "code": "00673"}]});')
+
+        cache = StockIdCache(tmp_path / "stock_ids.sqlite")
+        service = HKEXAPIService(client=make_client(handler), stock_cache=cache)
+
+        assert service.get_stock_id("00673") == (7, [{"stockId": 7, "code": "00673"}])
+        assert service.get_stock_id("00673")[0] == 7
+        assert service.get_stock_id("99999") == (None, [])
+        assert service.get_stock_id("99999") == (None, [])
+        assert calls == ["00673", "99999"]
+
+        # Persisted across service instances
+        other = HKEXAPIService(client=make_client(handler), stock_cache=StockIdCache(tmp_path / "stock_ids.sqlite"))
+        assert other.get_stock_id("00673")[0] == 7
+        assert calls == ["00673", "99999"]
+
+    def test_expired_entries_and_errors_are_not_served(self, tmp_path):
+        cache = StockIdCache(tmp_path / "c.sqlite", ttl_seconds=-1, negative_ttl_seconds=-1)
+        cache.set("00001", "SEHK", 1, [])
+        cache.set("00002", "SEHK", None, [])
+        assert cache.get("00001") is None
+        assert cache.get("00002") is None
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(500)
+
+        service = HKEXAPIService(client=make_client(handler), stock_cache=cache)
+        stock_id, info = service.get_stock_id("00003")
+        assert stock_id is None and "error" in info[0]
+        assert cache.get("00003") is None
+
+    def test_bulk_warm_up(self, tmp_path):
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request.url.path)
+            return httpx.Response(200, json=[{"i": 1, "c": "00001", "n": "A"}, {"i": 2, "c": "00002", "n": "B"}])
+
+        cache = StockIdCache(tmp_path / "c.sqlite")
+        service = HKEXAPIService(client=make_client(handler), stock_cache=cache)
+
+        assert service.warm_stock_id_cache() == 2
+        assert service.warm_stock_id_cache() == 0  # one-shot within TTL
+        assert service.get_stock_id("00002")[0] == 2
+        assert requests == ["/ncms/script/eds/activestock_sehk_c.json"]
+
+
+FEED = [
+    {"newsId": 1, "market": "SEHK", "t1Code": "10000", "t2Code": "13300", "stock": [{"sc": "00001"}]},
+    {"newsId": 2, "market": "GEM", "t1Code": "NaN", "t2Code": "NaN", "stock": [{"sc": "08001"}]},
+    {"newsId": 3, "market": "SEHK", "t1Code": "40000", "t2Code": "40100", "stock": [{"sc": "00001"}, {"sc": "00002"}]},
+    {"newsId": 4, "market": "SEHK", "t1Code": "NaN", "t2Code": "13300", "stock": [{"sc": "00002"}]},
+]
+
+
+class TestLatestFeedCache:
+    """Test conditional GET caching and indexed filtering of the latest feed."""
+
+    def test_304_reuses_parsed_feed(self):
+        seen_headers = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen_headers.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json={"newsInfoLst": FEED}, headers={"ETag": '"v1"'})
+
+        service = HKEXAPIService(client=make_client(handler))
+        first = service.get_latest_announcements()
+        second = service.get_latest_announcements(stock_code="00002")
+
+        assert seen_headers == [None, '"v1"']
+        assert [a["newsId"] for a in first] == [1, 2, 3, 4]
+        assert [a["newsId"] for a in second] == [3, 4]
+
+    def test_index_matches_linear_filter(self):
+        index = AnnouncementFeedIndex(FEED)
+
+        assert [a["newsId"] for a in index.filter(market="SEHK")] == [1, 3, 4]
+        assert [a["newsId"] for a in index.filter(stock_code="00001")] == [1, 3]
+        # Uncategorized ("NaN") items match any category filter
+        assert [a["newsId"] for a in index.filter(t1_code="10000")] == [1, 2, 4]
+        assert [a["newsId"] for a in index.filter(market="SEHK", t1_code="40000", t2_code="40100")] == [3]
+        assert index.filter(market="GEM", stock_code="00001") == []
+
+
+TIER_TWO = [
+    {"code": "13300", "name": "Results", "t1code": "10000"},
+    {"code": "13400", "name": "Dividend", "t1code": "10000"},
+    {"code": "40100", "name": "Annual Report", "t1code": "40000"},
+]
+
+
+class TestCategoryTaxonomy:
+    """Test the disk-cached category taxonomy."""
+
+    def test_categories_cached_on_disk_and_indexed(self, tmp_path):
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            return httpx.Response(200, json=TIER_TWO, headers={"ETag": '"t2"'})
+
+        taxonomy = CategoryTaxonomy(cache_dir=tmp_path)
+        service = HKEXAPIService(client=make_client(handler), category_cache=taxonomy)
+
+        assert service.get_categories("tiertwo") == TIER_TWO
+        assert service.get_categories("tiertwo") == TIER_TWO
+        assert calls == ["/ncms/script/eds/tiertwo_c.json"]
+
+        # A fresh process resolves names and children from disk, offline
+        cold = CategoryTaxonomy(cache_dir=tmp_path)
+        assert cold.name_for("13400", "tiertwo") == "Dividend"
+        assert [c["code"] for c in cold.children("10000")] == ["13300", "13400"]
+
+    def test_stale_entry_revalidated_with_conditional_get(self, tmp_path):
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == '"t2"':
+                return httpx.Response(304)
+            return httpx.Response(200, json=TIER_TWO, headers={"ETag": '"t2"'})
+
+        taxonomy = CategoryTaxonomy(cache_dir=tmp_path, ttl_seconds=-1)
+        service = HKEXAPIService(client=make_client(handler), category_cache=taxonomy)
+
+        service.get_categories("tiertwo")
+        assert service.get_categories("tiertwo") == TIER_TWO
+        assert seen == [None, '"t2"']
+
+
+class TestPaginatedSearch:
+    """Test date-window pagination beyond the 500-row cap."""
+
+    @staticmethod
+    def _handler(days_per_row: dict[str, int]):
+        """Serve one row per listed day, capped at rowRange like the real API."""
+
+        def rows(request: httpx.Request) -> list[dict]:
+            params = request.url.params
+            from_date, to_date = params["fromDate"], params["toDate"]
+            days = sorted((d for d in days_per_row if from_date <= d <= to_date), reverse=True)
+            items = [{"NEWS_ID": f"{d}-{i}"} for d in days for i in range(days_per_row[d])]
+            return items[: int(params["rowRange"])]
+
+        return rows
+
+    def test_saturated_windows_are_split(self):
+        # 600 filings in one month: the 500-row cap forces a split
+        days = {f"202403{d:02d}": 20 for d in range(1, 31)}
+        rows = self._handler(days)
+        windows = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            windows.append((request.url.params["fromDate"], request.url.params["toDate"]))
+            return httpx.Response(200, json={"result": json.dumps(rows(request))})
+
+        service = HKEXAPIService(client=make_client(handler))
+        items = list(service.iter_announcements("1", "20240101", "20240630", window_days=200))
+
+        assert len(items) == 600
+        assert len({a["NEWS_ID"] for a in items}) == 600
+        assert [a["NEWS_ID"][:8] for a in items] == sorted((a["NEWS_ID"][:8] for a in items), reverse=True)
+        assert len(windows) > 1
+
+    def test_windows_cover_range_without_overlap(self):
+        service = HKEXAPIService(client=make_client(lambda request: httpx.Response(200)))
+        windows = service._date_windows("20240101", "20240310", 30)
+
+        assert windows[0][1] == "20240310"
+        assert windows[-1][0] == "20240101"
+        for newer, older in zip(windows, windows[1:]):
+            assert older[1] < newer[0]
+
+    def test_async_stream_matches_sync(self):
+        days = {f"2023{m:02d}15": 3 for m in range(1, 13)}
+        rows = self._handler(days)
+
+        async def ahandler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json={"result": json.dumps(rows(request))})
+
+        async def run():
+            client = httpx.AsyncClient(transport=httpx.MockTransport(ahandler))
+            async with AsyncHKEXAPIService(client=client) as service:
+                return [a async for a in service.iter_announcements("1", "20230101", "20231231", window_days=60)]
+
+        sync_service = HKEXAPIService(
+            client=make_client(lambda request: httpx.Response(200, json={"result": json.dumps(rows(request))}))
+        )
+        expected = list(sync_service.iter_announcements("1", "20230101", "20231231", window_days=60))
+
+        assert asyncio.run(run()) == expected
+        assert len(expected) == 36
+
+
+class TestRateLimiter:
+    """Test the shared token bucket and retry policy."""
+
+    def test_transient_failures_are_retried(self):
+        statuses = [503, 429, 200]
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            status = statuses[len(seen)]
+            seen.append(status)
+            return httpx.Response(status, text='callback({"stockInfo": [{"stockId": 5}]});', headers={"Retry-After": "0"})
+
+        limiter = RateLimiter(rate=0, retry=RetryPolicy(base_delay=0.001))
+        service = HKEXAPIService(client=make_client(handler), rate_limiter=limiter)
+
+        assert service.get_stock_id("00005")[0] == 5
+        assert seen == [503, 429, 200]
+        metrics = limiter.metrics.snapshot()
+        assert metrics["requests"] == 3
+        assert metrics["retries"] == 2
+        assert metrics["throttled"] == 1
+
+    def test_metrics_are_logged(self, caplog):
+        statuses = [429, 200]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(statuses.pop(0), text='callback({"stockInfo": [{"stockId": 5}]});', headers={"Retry-After": "0"})
+
+        limiter = RateLimiter(rate=0, retry=RetryPolicy(base_delay=0.001))
+        service = HKEXAPIService(client=make_client(handler), rate_limiter=limiter)
+        assert service.get_stock_id("00005")[0] == 5
+
+        caplog.clear()
+        with caplog.at_level(logging.INFO, logger="src.services.rate_limit"):
+            limiter.log_metrics()
+
+        [record] = caplog.records
+        assert record.levelno == logging.WARNING
+        assert "requests=2 retries=1 throttled=1 failures=0" in record.getMessage()
+
+    def test_retries_exhausted_surface_error(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("refused")
+
+        limiter = RateLimiter(rate=0, retry=RetryPolicy(max_retries=2, base_delay=0.001))
+        service = HKEXAPIService(client=make_client(handler), rate_limiter=limiter)
+
+        stock_id, info = service.get_stock_id("00005")
+        assert stock_id is None and "refused" in info[0]["error"]
+        assert limiter.metrics.snapshot()["requests"] == 3
+        assert limiter.metrics.snapshot()["failures"] == 1
+
+    def test_token_bucket_paces_requests(self):
+        bucket = TokenBucket(rate=100, burst=2)
+        waits = [bucket.reserve() for _ in range(4)]
+
+        assert waits[:2] == [0.0, 0.0]
+        assert 0 < waits[2] < waits[3] <= 0.021
+
+    def test_throttling_halves_rate_and_recovers(self):
+        bucket = TokenBucket(rate=8, burst=1)
+        bucket.throttled()
+        assert bucket.rate == 4
+        for _ in range(40):
+            bucket.succeeded()
+        assert bucket.rate == 8
+
+    def test_async_requests_share_limiter(self):
+        calls = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                return httpx.Response(502)
+            return httpx.Response(200, json=TIER_TWO)
+
+        limiter = RateLimiter(rate=0, retry=RetryPolicy(base_delay=0.001))
+
+        async def run():
+            client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            async with AsyncHKEXAPIService(client=client, rate_limiter=limiter) as service:
+                return await service.get_categories("tiertwo")
+
+        assert asyncio.run(run()) == TIER_TWO
+        assert limiter.metrics.snapshot()["retries"] == 1
+
+
+PDF_BODY = b"%PDF-1.4\n" + bytes(range(256)) * 400 + b"\n%%EOF\n"
+
+
+class TestStreamingDownload:
+    """Test streamed, resumable PDF downloads."""
+
+    def test_interrupted_download_resumes_with_range(self, tmp_path):
+        ranges = []
+
+        class DropAfter(httpx.SyncByteStream):
+            """Body stream that fails after sending ``limit`` bytes."""
+
+            def __init__(self, data: bytes, limit: int):
+                self.data, self.limit = data, limit
+
+            def __iter__(self):
+                yield self.data[: self.limit]
+                raise httpx.ReadError("connection reset")
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            ranges.append(request.headers.get("Range"))
+            if "Range" not in request.headers:
+                return httpx.Response(200, headers={"Content-Length": str(len(PDF_BODY))}, stream=DropAfter(PDF_BODY, 4000))
+            start = int(request.headers["Range"].removeprefix("bytes=").rstrip("-"))
+            return httpx.Response(
+                206,
+                content=PDF_BODY[start:],
+                headers={"Content-Range": f"bytes {start}-{len(PDF_BODY) - 1}/{len(PDF_BODY)}"},
+            )
+
+        service = PDFParserService(client=make_client(handler))
+        path = service.download_pdf("/a.pdf", "00001", "2025-01-01", "Annual Report", str(tmp_path))
+
+        assert ranges == [None, "bytes=4000-"]
+        assert open(path, "rb").read() == PDF_BODY
+        assert not list(tmp_path.rglob("*.part"))
+
+    def test_size_mismatch_with_file_info_is_rejected(self, tmp_path):
+        def handler(request: httpx.Request) -> httpx.Response:
+            # Chunked response: no Content-Length to check against
+            return httpx.Response(200, stream=httpx.ByteStream(PDF_BODY[:20_000]))
+
+        service = PDFParserService(client=make_client(handler))
+        try:
+            service.download_pdf("/a.pdf", "00001", "2025-01-01", "Report", str(tmp_path), expected_size="100KB")
+        except RuntimeError as e:
+            assert "FILE_INFO" in str(e)
+        else:
+            raise AssertionError("expected a size mismatch")
+        assert not list(tmp_path.rglob("*.pdf")) and not list(tmp_path.rglob("*.part"))
+
+        path = service.download_pdf("/a.pdf", "00001", "2025-01-01", "Report", str(tmp_path), expected_size="20KB")
+        assert open(path, "rb").read() == PDF_BODY[:20_000]
+
+    def test_parse_file_info_size(self):
+        assert parse_file_info_size("523KB") == (523 * 1024, 1024)
+        assert parse_file_info_size("1.2MB") == (int(1.2 * 1024**2), 1024**2 // 10)
+        assert parse_file_info_size("Multiple Files") is None
+        assert parse_file_info_size(2048) == (2048, 0)
+
+    def test_batch_download_is_bounded_per_host(self, tmp_path):
+        in_flight = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.02)
+            with lock:
+                in_flight -= 1
+            if request.url.path.endswith("missing.pdf"):
+                return httpx.Response(404)
+            return httpx.Response(200, content=PDF_BODY)
+
+        service = PDFParserService(client=make_client(handler), per_host_limit=2)
+        # One date per document: the cache falls back to any file of the same date
+        items = [
+            {"news_id": i, "url": f"/{i}.pdf", "stock_code": "00001", "date": f"2025-01-0{i + 1}", "title": f"Doc {i}"}
+            for i in range(6)
+        ]
+        items.append({"news_id": "x", "url": "/missing.pdf", "stock_code": "00002", "date": "2025-01-02", "title": "Gone"})
+
+        results = service.download_pdfs(items, str(tmp_path), max_workers=6)
+
+        assert [r["news_id"] for r in results] == [0, 1, 2, 3, 4, 5, "x"]
+        assert all(r["success"] and not r["cached"] and r["size"] == len(PDF_BODY) for r in results[:6])
+        assert results[6]["success"] is False and "404" in results[6]["error"]
+        assert peak == 2
+
+        again = service.download_pdfs(items[:2], str(tmp_path))
+        assert all(r["cached"] for r in again)
+        assert all("latency_ms" in r for r in again)
+
+
+class TestPDFCatalog:
+    """Test the indexed PDF cache catalog."""
+
+    def test_lookup_matches_legacy_rules_without_globbing(self, tmp_path, monkeypatch):
+        stock_dir = tmp_path / "00001"
+        stock_dir.mkdir()
+        for name in ("2025-01-02-Annual Results.pdf", "2025-01-02-Notice of AGM.pdf", "2025-01-03-Dividend.pdf"):
+            (stock_dir / name).write_bytes(PDF_BODY)
+        service = PDFParserService()
+
+        lookup = lambda date, title: service.get_cached_pdf_path("00001", date, title, str(tmp_path))  # noqa: E731
+        assert lookup("2025-01-02", "Annual Results").endswith("Annual Results.pdf")
+        assert lookup("2025-01-02", "notice of  AGM 2025").endswith("Notice of AGM.pdf")
+        assert lookup("2025-01-03", "Something else").endswith("Dividend.pdf")
+        assert lookup("2025-01-04", "Dividend") is None
+
+        # Unchanged directory: no further globbing
+        globs = []
+        original_glob = Path.glob
+        monkeypatch.setattr(Path, "glob", lambda self, pattern: globs.append(pattern) or original_glob(self, pattern))
+        assert lookup("2025-01-02", "Annual Results")
+        assert globs == []
+
+    def test_catalog_tracks_downloads_and_cleanup(self, tmp_path):
+        service = PDFParserService(client=make_client(lambda request: httpx.Response(200, content=PDF_BODY)))
+        path = service.download_pdf("/x.pdf", "00002", "2025-02-01", "Interim Report", str(tmp_path), news_id="42")
+
+        assert service.get_cached_pdf_path("00002", "2025-02-01", "Renamed title", str(tmp_path), news_id="42") == path
+
+        os.utime(path, (0, 0))
+        service.cleanup_old_pdfs(str(tmp_path), days=1)
+        assert service.get_cached_pdf_path("00002", "2025-02-01", "Interim Report", str(tmp_path), news_id="42") is None
+
+    def test_external_changes_are_picked_up(self, tmp_path):
+        stock_dir = tmp_path / "00003"
+        stock_dir.mkdir()
+        service = PDFParserService()
+        assert service.get_cached_pdf_path("00003", "2025-03-01", "Circular", str(tmp_path)) is None
+
+        (stock_dir / "2025-03-01-Circular.pdf").write_bytes(PDF_BODY)
+        assert service.get_cached_pdf_path("00003", "2025-03-01", "Circular", str(tmp_path))
+
+        (stock_dir / "2025-03-01-Circular.pdf").unlink()
+        assert service.get_cached_pdf_path("00003", "2025-03-01", "Circular", str(tmp_path)) is None
+
+
+class TestContentAddressedStore:
+    """Test deduplication of identical PDFs across stock codes."""
+
+    def test_joint_announcement_stored_and_downloaded_once(self, tmp_path):
+        downloads = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            downloads.append(request.url.path)
+            return httpx.Response(200, content=PDF_BODY)
+
+        service = PDFParserService(client=make_client(handler))
+        first = service.download_pdf("/joint.pdf", "00001", "2025-04-01", "Joint Announcement", str(tmp_path), news_id="7")
+        second = service.download_pdf("/joint.pdf", "00002", "2025-04-01", "Joint Announcement", str(tmp_path), news_id="7")
+
+        assert downloads == ["/joint.pdf"]
+        assert first != second
+        assert os.stat(first).st_ino == os.stat(second).st_ino
+        assert len(list((tmp_path / ".blobs").rglob("*.pdf"))) == 1
+
+        # Same content under another news ID is downloaded but not stored twice
+        third = service.download_pdf("/copy.pdf", "00003", "2025-04-01", "Joint Announcement", str(tmp_path), news_id="8")
+        assert os.stat(third).st_ino == os.stat(first).st_ino
+
+    def test_extracted_content_keyed_by_hash(self, tmp_path):
+        service = PDFParserService(client=make_client(lambda request: httpx.Response(200, content=PDF_BODY)))
+        first = service.download_pdf("/a.pdf", "00001", "2025-04-02", "Circular", str(tmp_path), news_id="9")
+        second = service.download_pdf("/a.pdf", "00002", "2025-04-02", "Circular", str(tmp_path), news_id="9")
+
+        text_a, tables_a = service.save_extracted_content(first, "text", [])
+        text_b, tables_b = service.save_extracted_content(second, "other", [])
+
+        # Written once next to the blob, linked next to each stock's PDF
+        assert Path(text_a) == Path(first).with_suffix(".txt")
+        assert Path(text_b) == Path(second).with_suffix(".txt")
+        assert os.stat(text_a).st_ino == os.stat(text_b).st_ino
+        assert os.stat(tables_a).st_ino == os.stat(tables_b).st_ino
+        assert Path(text_b).read_text(encoding="utf-8") == "text"
+        assert len(list((tmp_path / ".blobs").rglob("*.txt"))) == 1
+
+    def test_extracted_text_is_grepable(self, tmp_path):
+        service = PDFParserService(client=make_client(lambda request: httpx.Response(200, content=PDF_BODY)))
+        for stock_code in ("00001", "00002"):
+            path = service.download_pdf("/a.pdf", stock_code, "2025-04-03", "Results", str(tmp_path), news_id="10")
+            service.save_extracted_content(path, "Revenue rose 12 per cent", [{"page": 1, "table": [["Revenue", "12"]]}])
+
+        backend = FilesystemBackend(root_dir=tmp_path, virtual_mode=True)
+        matches = backend.grep_raw("Revenue", "/")
+
+        assert {
+            "/00001/2025-04-03-Results.txt",
+            "/00001/2025-04-03-Results_tables.jsonl",
+            "/00002/2025-04-03-Results.txt",
+            "/00002/2025-04-03-Results_tables.jsonl",
+        } == {m["path"] for m in matches}
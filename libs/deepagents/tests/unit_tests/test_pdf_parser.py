@@ -0,0 +1,355 @@
+"""Unit tests for PDF parsing and extraction."""
+
+import pdfplumber
+import pytest
+
+from src.services import pdf_extraction, pdf_parser, table_store
+from src.services.pdf_extraction import TEXT_BACKENDS, ExtractionConfig, PDFAnalysis, extract_texts_parallel, font_profile
+from src.services.pdf_parser import PDFParserService
+from src.tools import pdf_tools
+
+from ..pdf_fixtures import write_text_pdf
+
+
+class TestParallelExtraction:
+    """Test page-parallel text extraction."""
+
+    def test_parallel_matches_serial(self, tmp_path):
+        pdf_path = str(write_text_pdf(tmp_path / "report.pdf", 10, lines_per_page=5))
+        serial = PDFParserService(extraction_config=ExtractionConfig(workers=1))
+        parallel = PDFParserService(
+            extraction_config=ExtractionConfig(workers=2, pages_per_chunk=3, parallel_min_pages=0)
+        )
+
+        expected = serial.extract_text(pdf_path)
+        assert parallel.extract_text(pdf_path) == expected
+        assert expected.index("Page 3 line 0") < expected.index("Page 4 line 0") < expected.index("Page 10 line 4")
+
+    def test_small_documents_stay_in_process(self, tmp_path, monkeypatch):
+        pdf_path = str(write_text_pdf(tmp_path / "notice.pdf", 2, lines_per_page=2))
+        monkeypatch.setattr(
+            "src.services.pdf_extraction._get_executor",
+            lambda workers: (_ for _ in ()).throw(AssertionError("pool used")),
+        )
+
+        texts = extract_texts_parallel(pdf_path, ExtractionConfig(workers=4, pages_per_chunk=1, parallel_min_pages=48))
+        assert len(texts) == 2
+
+    def test_config_from_env(self, monkeypatch):
+        monkeypatch.setenv("HKEX_PDF_WORKERS", "3")
+        monkeypatch.setenv("HKEX_PDF_PAGES_PER_CHUNK", "5")
+        config = ExtractionConfig.from_env()
+        assert (config.workers, config.pages_per_chunk) == (3, 5)
+
+
+class TestSinglePassAnalysis:
+    """Test that text, tables and structure share one parse."""
+
+    def test_one_parse_serves_all_views(self, tmp_path, monkeypatch):
+        pdf_path = str(write_text_pdf(tmp_path / "results.pdf", 4, lines_per_page=3, table_every=2))
+        service = PDFParserService(extraction_config=ExtractionConfig(workers=1))
+        calls = []
+        original = pdf_parser.analyze_pdf
+        monkeypatch.setattr(pdf_parser, "analyze_pdf", lambda *args: calls.append(args) or original(*args))
+
+        text = service.extract_text(pdf_path)
+        tables = service.extract_tables(pdf_path)
+        structure = service.analyze_structure(pdf_path)
+
+        assert len(calls) == 1
+        assert "Page 4 line 2" in text
+        assert [t["page"] for t in tables] == [2, 4]
+        assert tables[0]["table"][0] == ["2.0.0", "2.0.1", "2.0.2"]
+        assert structure["num_pages"] == 4
+        assert structure["has_tables"] is True
+        assert structure["estimated_sections"][0] == {"page": 1, "max_font_size": 18}
+
+    def test_modified_file_is_reparsed(self, tmp_path):
+        path = write_text_pdf(tmp_path / "notice.pdf", 1, lines_per_page=1)
+        service = PDFParserService(extraction_config=ExtractionConfig(workers=1))
+        assert service.analyze_structure(str(path))["num_pages"] == 1
+
+        write_text_pdf(path, 3, lines_per_page=1)
+        assert service.analyze_structure(str(path))["num_pages"] == 3
+
+
+class TestPersistentAnalysisCache:
+    """Test the on-disk extraction cache."""
+
+    def test_new_service_reads_cache_instead_of_parsing(self, tmp_path, monkeypatch):
+        pdf_path = str(write_text_pdf(tmp_path / "results.pdf", 3, lines_per_page=2, table_every=3))
+        expected = PDFParserService(extraction_config=ExtractionConfig(workers=1)).analyze_structure(pdf_path)
+        assert (tmp_path / "results.analysis.json").exists()
+
+        monkeypatch.setattr(pdf_parser, "analyze_pdf", lambda *args: pytest.fail("re-parsed a cached PDF"))
+        service = PDFParserService(extraction_config=ExtractionConfig(workers=1))
+        assert service.analyze_structure(pdf_path) == expected
+        assert "Page 3 line 1" in service.extract_text(pdf_path)
+        assert service.extract_tables(pdf_path)[0]["page"] == 3
+
+    def test_stale_cache_is_ignored(self, tmp_path, monkeypatch):
+        path = write_text_pdf(tmp_path / "notice.pdf", 1, lines_per_page=1)
+        PDFParserService(extraction_config=ExtractionConfig(workers=1)).analyze_structure(str(path))
+
+        write_text_pdf(path, 2, lines_per_page=1)
+        service = PDFParserService(extraction_config=ExtractionConfig(workers=1))
+        assert service.analyze_structure(str(path))["num_pages"] == 2
+
+        monkeypatch.setattr(pdf_parser, "EXTRACTOR_VERSION", "0/other")
+        calls = []
+        original = pdf_parser.analyze_pdf
+        monkeypatch.setattr(pdf_parser, "analyze_pdf", lambda *args: calls.append(args) or original(*args))
+        PDFParserService(extraction_config=ExtractionConfig(workers=1)).analyze_structure(str(path))
+        assert len(calls) == 1
+
+    @pytest.fixture
+    def backend_calls(self, monkeypatch):
+        calls = {"texts": 0, "plumber": 0}
+        original_texts = pdf_extraction.iter_page_texts
+        original_open = pdf_extraction.pdfplumber.open
+
+        def iter_page_texts(*args, **kwargs):
+            calls["texts"] += 1
+            return original_texts(*args, **kwargs)
+
+        def open_pdf(*args, **kwargs):
+            calls["plumber"] += 1
+            return original_open(*args, **kwargs)
+
+        monkeypatch.setattr(pdf_extraction, "iter_page_texts", iter_page_texts)
+        monkeypatch.setattr(pdf_extraction.pdfplumber, "open", open_pdf)
+        return calls
+
+    @pytest.mark.parametrize("include_tables", [True, False])
+    def test_extract_pdf_content_parses_once(self, tmp_path, monkeypatch, backend_calls, include_tables):
+        pdf_path = str(write_text_pdf(tmp_path / "results.pdf", 20, lines_per_page=3, table_every=5))
+        config = ExtractionConfig(workers=1, text_backend="pdfium")
+
+        results = []
+        for _ in range(2):
+            # A fresh service per call, so the second one relies on the persistent cache
+            monkeypatch.setattr(pdf_tools, "_pdf_service", PDFParserService(extraction_config=config))
+            results.append(pdf_tools.extract_pdf_content.invoke({"pdf_path": pdf_path, "include_tables": include_tables}))
+
+        assert results[0] == results[1]
+        assert "Page 20 line 2" in results[0]["text"]
+        assert results[0]["num_tables"] == (4 if include_tables else 0)
+        assert backend_calls == {"texts": 1, "plumber": 1 if include_tables else 0}
+
+
+class TestPageIterator:
+    """Test lazy page-range reads."""
+
+    @pytest.fixture
+    def parsed_pages(self, monkeypatch):
+        parsed = []
+        original = pdf_extraction._analyze_page
+        monkeypatch.setattr(
+            pdf_extraction, "_analyze_page", lambda page, *args: parsed.append(page.page_number) or original(page, *args)
+        )
+        return parsed
+
+    def test_range_touches_only_requested_pages(self, tmp_path, parsed_pages):
+        pdf_path = str(write_text_pdf(tmp_path / "report.pdf", 20, lines_per_page=2))
+        service = PDFParserService(extraction_config=ExtractionConfig(workers=1))
+
+        pages = list(service.iter_pages(pdf_path, 5, 7))
+
+        assert [p["page"] for p in pages] == [5, 6, 7]
+        assert pages[0]["text"].startswith("Section 5")
+        assert parsed_pages == [5, 6, 7]
+
+    def test_preview_stops_parsing_early(self, tmp_path, parsed_pages, monkeypatch):
+        pdf_path = str(write_text_pdf(tmp_path / "annual.pdf", 60, lines_per_page=40))
+        monkeypatch.setattr(pdf_tools, "_pdf_service", PDFParserService(extraction_config=ExtractionConfig(workers=1)))
+
+        result = pdf_tools.extract_pdf_content.invoke({"pdf_path": pdf_path, "preview_only": True})
+
+        assert result["success"] and result["truncated"]
+        assert 0 < len(result["text"]) <= pdf_tools.TEXT_PREVIEW_CHARS
+        assert result["num_pages"] == 60
+        assert result["next_page"] == result["end_page"] + 1
+        # The page that did not fit was parsed, then left for the next call
+        assert len(parsed_pages) == result["end_page"] + 1 < 5
+
+    @pytest.mark.parametrize("page_lengths", [[60, 30], [30, 30, 30], [20, 27, 10]])
+    def test_pages_past_the_budget_stay_readable(self, monkeypatch, page_lengths):
+        pages = [{"page": i + 1, "text": chr(ord("a") + i) * n, "tables": []} for i, n in enumerate(page_lengths)]
+
+        class StubService:
+            def iter_pages(self, pdf_path, start_page, end_page, include_tables):
+                yield from pages[start_page - 1 : end_page]
+
+            def page_count(self, pdf_path):
+                return len(pages)
+
+        monkeypatch.setattr(pdf_tools, "_pdf_service", StubService())
+
+        read, start = [], 1
+        while True:
+            result = pdf_tools._extract_pdf_pages("report.pdf", False, start, None, 50, 200)
+            read.append(result["text"])
+            if "next_page" not in result:
+                break
+            assert len(result["text"]) <= 50 or result["end_page"] == start
+            start = result["next_page"]
+
+        assert "\n\n".join(read) == "\n\n".join(page["text"] for page in pages)
+
+    def test_cached_analysis_serves_pages(self, tmp_path, parsed_pages):
+        pdf_path = str(write_text_pdf(tmp_path / "results.pdf", 4, lines_per_page=2, table_every=2))
+        service = PDFParserService(extraction_config=ExtractionConfig(workers=1))
+        service.analyze_pdf(pdf_path)
+        parsed_pages.clear()
+
+        pages = list(service.iter_pages(pdf_path, 2))
+
+        assert [p["page"] for p in pages] == [2, 3, 4]
+        assert [len(p["tables"]) for p in pages] == [1, 0, 1]
+        assert parsed_pages == []
+
+
+class TestTextBackends:
+    """Test the pluggable text layer backends."""
+
+    def test_backends_agree_on_text(self, tmp_path):
+        pdf_path = str(write_text_pdf(tmp_path / "results.pdf", 3, lines_per_page=4, table_every=2))
+        texts = {
+            backend: PDFParserService(extraction_config=ExtractionConfig(workers=1, text_backend=backend)).extract_text(pdf_path)
+            for backend in TEXT_BACKENDS
+        }
+        assert texts["pdfium"] == texts["pdfplumber"]
+
+    def test_text_only_read_skips_pdfplumber(self, tmp_path, monkeypatch):
+        pdf_path = str(write_text_pdf(tmp_path / "notice.pdf", 3, lines_per_page=2, table_every=3))
+        service = PDFParserService(extraction_config=ExtractionConfig(workers=1, text_backend="pdfium"))
+        monkeypatch.setattr(pdf_extraction.pdfplumber, "open", lambda *args, **kwargs: pytest.fail("pdfplumber used"))
+
+        assert "Page 3 line 1" in service.extract_text(pdf_path)
+        assert [p["page"] for p in service.iter_pages(pdf_path, 2, include_tables=False)] == [2, 3]
+
+    def test_tables_still_come_from_pdfplumber(self, tmp_path):
+        pdf_path = str(write_text_pdf(tmp_path / "results.pdf", 2, lines_per_page=2, table_every=2))
+        service = PDFParserService(extraction_config=ExtractionConfig(workers=1, text_backend="pdfium"))
+
+        assert [t["page"] for t in service.extract_tables(pdf_path)] == [2]
+
+    def test_unknown_backend_rejected(self, monkeypatch):
+        monkeypatch.setenv("HKEX_PDF_TEXT_BACKEND", "ocr")
+        with pytest.raises(ValueError, match="ocr"):
+            ExtractionConfig.from_env()
+
+
+class TestTableCandidatePages:
+    """Test the ruling-line pre-pass for table extraction."""
+
+    def test_prose_pages_skip_table_extraction(self, tmp_path, monkeypatch):
+        pdf_path = str(write_text_pdf(tmp_path / "circular.pdf", 6, lines_per_page=3, table_every=3))
+        searched = []
+        original = pdfplumber.page.Page.extract_tables
+        monkeypatch.setattr(
+            pdfplumber.page.Page, "extract_tables", lambda page, *args: searched.append(page.page_number) or original(page, *args)
+        )
+        service = PDFParserService(extraction_config=ExtractionConfig(workers=1))
+
+        tables = service.extract_tables(pdf_path)
+
+        assert searched == [3, 6]
+        assert [t["page"] for t in tables] == [3, 6]
+        assert service.table_detection(pdf_path) == {
+            "pages_scanned": 6,
+            "candidate_pages": 2,
+            "pages_with_tables": 2,
+            "hit_rate": 1.0,
+        }
+
+    def test_structure_reports_detection(self, tmp_path):
+        pdf_path = str(write_text_pdf(tmp_path / "notice.pdf", 2, lines_per_page=2))
+        structure = PDFParserService(extraction_config=ExtractionConfig(workers=1)).analyze_structure(pdf_path)
+
+        assert structure["has_tables"] is False
+        assert structure["table_detection"]["candidate_pages"] == 0
+        assert structure["table_detection"]["hit_rate"] is None
+
+
+class TestHeadingDetection:
+    """Test font-size based heading detection."""
+
+    def test_headings_with_levels(self, tmp_path):
+        pdf_path = str(write_text_pdf(tmp_path / "annual.pdf", 3, lines_per_page=6, subheadings=True))
+        structure = PDFParserService(extraction_config=ExtractionConfig(workers=1)).analyze_structure(pdf_path)
+
+        assert structure["font_size_percentiles"]["p50"] == 9.0
+        # The bold body-size subheadings are not picked up; only size counts
+        assert structure["headings"] == [
+            {"page": page, "level": 1, "size": 18.0, "text": f"Section {page}"} for page in (1, 2, 3)
+        ]
+        # The legacy per-page markers are still reported
+        assert structure["estimated_sections"][2] == {"page": 3, "max_font_size": 18.0}
+
+    def test_running_headers_are_dropped(self):
+        page_lines = [{"page": page, "size": 14.0, "text": "ABC Holdings Limited"} for page in (1, 2, 3, 4)]
+        analysis = PDFAnalysis(
+            num_pages=4,
+            font_size_counts=[[9.0, 1000], [14.0, 80], [20.0, 10]],
+            heading_lines=[*page_lines, {"page": 2, "size": 20.0, "text": "Chairman's Statement"}],
+        )
+
+        assert analysis.headings() == [{"page": 2, "level": 1, "size": 20.0, "text": "Chairman's Statement"}]
+
+    def test_font_profile_inserts_missing_spaces(self):
+        chars = [
+            {"text": ch, "size": 16.0, "top": 10.0, "x0": x, "x1": x + 8, "fontname": "Arial-BoldMT"}
+            for ch, x in zip("RiskFactors", [0, 8, 16, 24, 40, 48, 56, 64, 72, 80, 88])
+        ]
+        chars.append({"text": "x", "size": 9.0, "top": 40.0, "x0": 0, "x1": 5, "fontname": "ArialMT"})
+        chars += [{**chars[-1], "x0": 6 * i, "x1": 6 * i + 5} for i in range(1, 40)]
+
+        profile = font_profile(chars)
+
+        assert profile["lines"] == [{"size": 16.0, "text": "Risk Factors"}]
+        assert profile["size_counts"] == [[9.0, 40], [16.0, 11]]
+
+
+class TestTableStore:
+    """Test the JSON Lines table store and query_pdf_tables."""
+
+    def test_write_and_query(self, tmp_path):
+        rows_path, index_path = tmp_path / "doc_tables.jsonl", tmp_path / "doc_tables.idx.json"
+        tables = [
+            {"page": 2, "table": [["Item", "2024"], ["Revenue", "1,200"], ["Profit", "300"]]},
+            {"page": 5, "table": [["资产", "金额"], ["现金", "50"]]},
+        ]
+        table_store.write_tables(rows_path, index_path, tables, {"size": 1})
+
+        assert rows_path.read_text(encoding="utf-8").splitlines()[0] == '["Item","2024"]'
+        entries = table_store.read_index(rows_path, index_path, {"size": 1})
+        assert [e["num_rows"] for e in entries] == [3, 2]
+
+        by_header = table_store.query_tables(rows_path, entries, header="资产")
+        assert [t["page"] for t in by_header] == [5]
+        sliced = table_store.query_tables(rows_path, entries, page=2, start_row=1, max_rows=1)
+        assert sliced[0]["rows"] == [["Revenue", "1,200"]]
+        assert sliced[0]["header"] == ["Item", "2024"]
+
+    def test_stale_index_is_rejected(self, tmp_path):
+        rows_path, index_path = tmp_path / "doc_tables.jsonl", tmp_path / "doc_tables.idx.json"
+        table_store.write_tables(rows_path, index_path, [{"page": 1, "table": [["A"], ["1"]]}], {"size": 1})
+
+        assert table_store.read_index(rows_path, index_path, {"size": 2}) is None
+        rows_path.write_text('["A"]\n', encoding="utf-8")
+        assert table_store.read_index(rows_path, index_path, {"size": 1}) is None
+
+    def test_query_pdf_tables_tool(self, tmp_path, monkeypatch):
+        pdf_path = str(write_text_pdf(tmp_path / "results.pdf", 4, lines_per_page=2, table_every=2))
+        monkeypatch.setattr(pdf_tools, "_pdf_service", PDFParserService(extraction_config=ExtractionConfig(workers=1)))
+
+        result = pdf_tools.query_pdf_tables.invoke({"pdf_path": pdf_path, "page": 4, "start_row": 2, "max_rows": 2})
+
+        assert result["success"] is True
+        assert result["num_tables"] == 2
+        assert result["num_matched"] == 1
+        table = result["tables"][0]
+        assert table["num_rows"] == 6
+        assert table["rows"] == [["4.2.0", "4.2.1", "4.2.2"], ["4.3.0", "4.3.1", "4.3.2"]]
+        assert result["tables_path"].endswith("results_tables.jsonl")
@@ -5,6 +5,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from src.services.pdf_extraction import PDFAnalysis
 from src.services.pdf_parser import PDFParserService
 from src.tools.pdf_tools import (
     MAX_INLINE_TEXT_CHARS,
@@ -31,9 +32,11 @@ class TestPDFParserCacheMethods:
         assert tables_path == Path("/path/to/document_tables.json")
 
     @patch("pathlib.Path.write_text")
+    @patch("pathlib.Path.write_bytes")
     @patch("pathlib.Path.exists")
     @patch("pathlib.Path.rename")
-    def test_save_extracted_content(self, mock_rename, mock_exists, mock_write_text):
+    @patch("os.replace")
+    def test_save_extracted_content(self, mock_replace, mock_rename, mock_exists, mock_write_bytes, mock_write_text):
         """Test saving extracted content to cache."""
         mock_exists.return_value = False
         parser = PDFParserService()
@@ -46,8 +49,9 @@ class TestPDFParserCacheMethods:
         )
 
         assert text_path == "/path/to/document.txt"
-        assert tables_path == "/path/to/document_tables.json"
-        assert mock_write_text.call_count == 2  # Text + tables
+        assert tables_path == "/path/to/document_tables.jsonl"
+        assert mock_write_text.call_count == 2  # Text + table index
+        assert mock_write_bytes.call_count == 1  # Table rows
 
     @patch("pathlib.Path.exists")
     def test_save_extracted_content_skip_existing(self, mock_exists):
@@ -64,7 +68,7 @@ class TestPDFParserCacheMethods:
 
         # Should return paths but not write
         assert text_path == "/path/to/document.txt"
-        assert tables_path == "/path/to/document_tables.json"
+        assert tables_path == "/path/to/document_tables.jsonl"
 
 
 class TestExtractPDFContentTruncation:
@@ -77,8 +81,7 @@ class TestExtractPDFContentTruncation:
         small_text = "A" * 1000  # 1k characters
         small_tables = [{"page": 1, "table": [["A", "B"], ["1", "2"]]}]
 
-        mock_service.extract_text.return_value = small_text
-        mock_service.extract_tables.return_value = small_tables
+        mock_service.analyze_pdf.return_value = PDFAnalysis(num_pages=1, page_texts=[small_text], tables=small_tables)
 
         result = extract_pdf_content("/path/to/small.pdf")
 
@@ -96,8 +99,7 @@ class TestExtractPDFContentTruncation:
         large_text = "A" * 100_000  # 100k characters
         small_tables = []
 
-        mock_service.extract_text.return_value = large_text
-        mock_service.extract_tables.return_value = small_tables
+        mock_service.analyze_pdf.return_value = PDFAnalysis(num_pages=1, page_texts=[large_text], tables=small_tables)
         mock_service.save_extracted_content.return_value = (
             "/path/to/large.txt",
             "/path/to/large_tables.json",
@@ -122,8 +124,7 @@ class TestExtractPDFContentTruncation:
             for i in range(10)  # 10 tables = 500 rows total
         ]
 
-        mock_service.extract_text.return_value = small_text
-        mock_service.extract_tables.return_value = large_tables
+        mock_service.analyze_pdf.return_value = PDFAnalysis(num_pages=1, page_texts=[small_text], tables=large_tables)
         mock_service.save_extracted_content.return_value = (
             "/path/to/doc.txt",
             "/path/to/doc_tables.json",
@@ -143,8 +144,7 @@ class TestExtractPDFContentTruncation:
         # Exactly at threshold
         text_at_threshold = "A" * MAX_INLINE_TEXT_CHARS
 
-        mock_service.extract_text.return_value = text_at_threshold
-        mock_service.extract_tables.return_value = []
+        mock_service.analyze_pdf.return_value = PDFAnalysis(num_pages=1, page_texts=[text_at_threshold], tables=[])
 
         result = extract_pdf_content("/path/to/boundary.pdf")
 
@@ -155,7 +155,7 @@ class TestExtractPDFContentTruncation:
     @patch("src.tools.pdf_tools._pdf_service")
     def test_error_handling(self, mock_service):
         """Test error handling in extract_pdf_content."""
-        mock_service.extract_text.side_effect = RuntimeError("PDF parsing failed")
+        mock_service.analyze_pdf.side_effect = RuntimeError("PDF parsing failed")
 
         result = extract_pdf_content("/path/to/broken.pdf")
 
@@ -23,8 +23,10 @@ from src.tools.hkex_tools import (
 from src.tools.pdf_tools import (
     analyze_pdf_structure,
     download_announcement_pdf,
+    download_announcement_pdfs,
     extract_pdf_content,
     get_cached_pdf_path,
+    query_pdf_tables,
 )
 from src.tools.summary_tools import generate_summary_markdown
 from .subagents import get_all_subagents
@@ -59,7 +61,7 @@ async def create_hkex_agent(
         Configured HKEX agent instance.
     """
     # Set up agent directory structure
-    from src.config.agent_config import get_agent_dir_name
+    from src.config.agent_config import get_agent_cache_dir, get_agent_dir_name
     agent_dir_name = get_agent_dir_name()
     agent_dir = Path.home() / agent_dir_name / assistant_id
     agent_dir.mkdir(parents=True, exist_ok=True)
@@ -83,8 +85,11 @@ async def create_hkex_agent(
     project_root = Path.cwd()
     pdf_cache_dir = project_root / "pdf_cache"
     pdf_cache_dir.mkdir(exist_ok=True)
+    # Trigram index keeps grep over the large text sidecars fast; it is
+    # stored in the agent cache, outside the trees it indexes
+    grep_index_dir = get_agent_cache_dir() / "grep_index"
     pdf_cache_backend = FilesystemBackend(
-        root_dir=pdf_cache_dir, virtual_mode=True
+        root_dir=pdf_cache_dir, virtual_mode=True, grep_index=True, grep_index_dir=grep_index_dir
     )
 
     # Memories backend - persistent storage for agent memory
@@ -96,7 +101,7 @@ async def create_hkex_agent(
     md_dir = project_root / "md"
     md_dir.mkdir(exist_ok=True)
     md_backend = FilesystemBackend(
-        root_dir=md_dir, virtual_mode=True
+        root_dir=md_dir, virtual_mode=True, grep_index=True, grep_index_dir=grep_index_dir
     )
 
     # Skills backend - read-only access to skills directory
@@ -138,8 +143,10 @@ async def create_hkex_agent(
         get_announcement_categories,
         get_cached_pdf_path,
         download_announcement_pdf,
+        download_announcement_pdfs,
         extract_pdf_content,
         analyze_pdf_structure,
+        query_pdf_tables,
         generate_summary_markdown,
     ]
 
@@ -253,6 +260,29 @@ async def create_hkex_agent(
         ),
     }
 
+    def _describe_pdf_batch(tool_call, state, runtime) -> str:
+        announcements = tool_call["args"].get("announcements") or []
+        lines = [
+            f"- {a.get('STOCK_CODE') or a.get('stock_code', '?')} "
+            f"{a.get('DATE_TIME') or a.get('date_time', '')} "
+            f"{a.get('TITLE') or a.get('title', 'unknown')}"
+            for a in announcements[:10]
+            if isinstance(a, dict)
+        ]
+        if len(announcements) > 10:
+            lines.append(f"... and {len(announcements) - 10} more")
+        return (
+            f"Download {len(announcements)} PDF Announcements\n"
+            + "\n".join(lines)
+            + "\n\n⚠️  This will download uncached PDFs from HKEX and save them to cache."
+        )
+
+    # Batch PDF download interrupt config - one approval for the whole batch
+    download_pdfs_interrupt_config: InterruptOnConfig = {
+        "allowed_decisions": ["approve", "reject"],
+        "description": _describe_pdf_batch,
+    }
+
     # Convert subagent dicts to SubAgent format for create_deep_agent
     subagent_specs = []
     for subagent_dict in subagents:
@@ -268,6 +298,7 @@ async def create_hkex_agent(
                     "write_file": write_file_interrupt_config,
                     "edit_file": edit_file_interrupt_config,
                     "download_announcement_pdf": download_pdf_interrupt_config,
+                    "download_announcement_pdfs": download_pdfs_interrupt_config,
                 },
             }
         )
@@ -287,6 +318,7 @@ async def create_hkex_agent(
             "write_file": write_file_interrupt_config,
             "edit_file": edit_file_interrupt_config,
             "download_announcement_pdf": download_pdf_interrupt_config,
+            "download_announcement_pdfs": download_pdfs_interrupt_config,
         },
     )
 
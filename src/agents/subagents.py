@@ -17,6 +17,7 @@ from src.tools.pdf_tools import (
     analyze_pdf_structure,
     extract_pdf_content,
     get_cached_pdf_path,
+    query_pdf_tables,
 )
 
 # PDF analyzer subagent tools
@@ -24,6 +25,7 @@ PDF_ANALYZER_TOOLS = [
     get_cached_pdf_path,
     extract_pdf_content,
     analyze_pdf_structure,
+    query_pdf_tables,
 ]
 
 # Report generator subagent tools (has access to all tools)
@@ -35,6 +37,7 @@ REPORT_GENERATOR_TOOLS = [
     get_cached_pdf_path,
     extract_pdf_content,
     analyze_pdf_structure,
+    query_pdf_tables,
 ]
 
 
@@ -14,12 +14,14 @@ from .input import create_prompt_session
 from .tools import (
     analyze_pdf_structure,
     download_announcement_pdf,
+    download_announcement_pdfs,
     extract_pdf_content,
     generate_summary_markdown,
     get_announcement_categories,
     get_cached_pdf_path,
     get_latest_hkex_announcements,
     get_stock_info,
+    query_pdf_tables,
     search_hkex_announcements,
 )
 from .ui import TokenTracker, show_help
@@ -202,8 +204,10 @@ async def main(assistant_id: str, session_state):
         get_announcement_categories,
         get_cached_pdf_path,
         download_announcement_pdf,
+        download_announcement_pdfs,
         extract_pdf_content,
         analyze_pdf_structure,
+        query_pdf_tables,
         generate_summary_markdown,
     ]
 
@@ -9,8 +9,10 @@ from src.tools.hkex_tools import (
 from src.tools.pdf_tools import (
     analyze_pdf_structure,
     download_announcement_pdf,
+    download_announcement_pdfs,
     extract_pdf_content,
     get_cached_pdf_path,
+    query_pdf_tables,
 )
 from src.tools.summary_tools import generate_summary_markdown
 
@@ -22,8 +24,10 @@ __all__ = [
     "get_announcement_categories",
     "get_cached_pdf_path",
     "download_announcement_pdf",
+    "download_announcement_pdfs",
     "extract_pdf_content",
     "analyze_pdf_structure",
+    "query_pdf_tables",
     "generate_summary_markdown",
 ]
 
@@ -2,6 +2,7 @@
 
 import os
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Optional
 
 # Load environment variables early
@@ -259,6 +260,17 @@ def get_agent_dir_name() -> str:
     return os.getenv("HKEX_AGENT_DIR", AGENT_DIR_NAME)
 
 
+def get_agent_cache_dir() -> Path:
+    """获取服务层共享缓存目录.
+    
+    位于 ~/{agent_dir}/cache，存放股票ID、分类等跨会话缓存
+    
+    Returns:
+        缓存目录路径（不保证已存在）
+    """
+    return Path.home() / get_agent_dir_name() / "cache"
+
+
 # 全局配置实例
 agent_model_config = SubAgentModelConfig()
 
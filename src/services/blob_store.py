@@ -0,0 +1,73 @@
+"""Content-addressed storage for downloaded PDFs."""
+
+import hashlib
+import os
+import shutil
+from pathlib import Path
+
+BLOB_DIRNAME = ".blobs"
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(path: str | Path) -> str:
+    """Hex SHA-256 digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class PDFBlobStore:
+    """PDFs stored once per content hash under ``<cache_dir>/.blobs/<sha[:2]>/<sha>.pdf``.
+
+    Per-stock cache entries are hardlinks to the blob, so a document filed
+    under several stock codes takes the disk space of one file. Where the
+    filesystem does not support hardlinks the entry falls back to a copy.
+    """
+
+    def __init__(self, cache_dir: str | Path):
+        """Initialize blob store.
+
+        Args:
+            cache_dir: PDF cache directory.
+        """
+        self.root = Path(cache_dir) / BLOB_DIRNAME
+
+    def path_for(self, sha256: str) -> Path:
+        """Blob path for a content hash."""
+        return self.root / sha256[:2] / f"{sha256}.pdf"
+
+    def put(self, source: Path, sha256: str) -> Path:
+        """Move a finished download into the store.
+
+        Args:
+            source: File to move (e.g., a verified partial download).
+            sha256: Content hash of ``source``.
+
+        Returns:
+            Blob path. If the content is already stored, ``source`` is deleted.
+        """
+        blob = self.path_for(sha256)
+        if blob.exists():
+            source.unlink(missing_ok=True)
+            return blob
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(source, blob)
+        return blob
+
+    def link(self, blob: Path, dest: Path) -> None:
+        """Atomically expose a blob at ``dest`` as a hardlink (or copy).
+
+        Args:
+            blob: Blob path.
+            dest: Per-stock cache path.
+        """
+        tmp = dest.with_name(f".{dest.name}.link")
+        tmp.unlink(missing_ok=True)
+        try:
+            os.link(blob, tmp)
+        except OSError:
+            shutil.copyfile(blob, tmp)
+        os.replace(tmp, dest)
@@ -0,0 +1,169 @@
+"""Disk-cached HKEX category taxonomy with preloaded lookup tables."""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from src.config.agent_config import get_agent_cache_dir
+from src.services.http_cache import CachedResponse
+
+# Bump when the on-disk entry layout changes; older files are ignored
+CATEGORY_CACHE_VERSION = 1
+# Category files change a few times a year at most
+DEFAULT_CATEGORY_TTL_SECONDS = 7 * 24 * 60 * 60
+
+# Key spellings seen in HKEX category files
+_CODE_KEYS = ("code", "c")
+_NAME_KEYS = ("name", "n")
+_PARENT_KEYS = ("t1code", "t1Code", "tierOneCode")
+
+
+def _first(item: dict[str, Any], keys: tuple[str, ...]) -> Any:
+    """Return the first present value among alternative key spellings."""
+    for key in keys:
+        if item.get(key) not in (None, ""):
+            return item[key]
+    return None
+
+
+class CategoryTaxonomy:
+    """Category reference files cached on disk and indexed in memory.
+
+    Lookups go memory → disk cache, so names can be resolved with no
+    network round trip. Each disk entry records the cache
+    format version and the server's ETag/Last-Modified validators, which
+    are used to revalidate stale entries with a conditional GET.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path | None = None,
+        ttl_seconds: float = DEFAULT_CATEGORY_TTL_SECONDS,
+    ):
+        """Initialize category taxonomy cache.
+
+        Args:
+            cache_dir: Directory for cached files (default: ~/.hkex-agent/cache/categories).
+            ttl_seconds: Age after which entries are revalidated (default: 7 days).
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else get_agent_cache_dir() / "categories"
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[str, CachedResponse] = {}
+        self._by_code: dict[str, dict[str, dict[str, Any]]] = {}
+        self._children: dict[str, list[dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def _cache_path(self, category_type: str) -> Path:
+        return self.cache_dir / f"{category_type}.json"
+
+    def _read_entry(self, path: Path) -> CachedResponse | None:
+        """Read a versioned entry file, ignoring missing or incompatible files."""
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(payload, dict) or payload.get("version") != CATEGORY_CACHE_VERSION:
+            return None
+        if not isinstance(payload.get("data"), list):
+            return None
+        return CachedResponse(
+            data=payload["data"],
+            etag=payload.get("etag"),
+            last_modified=payload.get("last_modified"),
+            fetched_at=float(payload.get("fetched_at", 0)),
+        )
+
+    def _write_entry(self, path: Path, entry: CachedResponse) -> None:
+        """Atomically write a versioned entry file."""
+        payload = {
+            "version": CATEGORY_CACHE_VERSION,
+            "fetched_at": entry.fetched_at,
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+            "data": entry.data,
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".json.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+            tmp_path.replace(path)
+        except OSError:
+            pass
+
+    def _index(self, category_type: str, entry: CachedResponse) -> None:
+        """Install an entry in memory and rebuild its lookup tables."""
+        self._entries[category_type] = entry
+        self._by_code[category_type] = {
+            str(code): item
+            for item in entry.data
+            if isinstance(item, dict) and (code := _first(item, _CODE_KEYS)) is not None
+        }
+        if category_type == "tiertwo":
+            children: dict[str, list[dict[str, Any]]] = {}
+            for item in entry.data:
+                if isinstance(item, dict) and (parent := _first(item, _PARENT_KEYS)) is not None:
+                    children.setdefault(str(parent), []).append(item)
+            self._children = children
+
+    def load(self, category_type: str) -> CachedResponse | None:
+        """Return the best local entry for a category type, loading it once.
+
+        Args:
+            category_type: "doc", "tierone", "tiertwo" or "tiertwogrp".
+
+        Returns:
+            Cached entry (possibly stale), or None if nothing is available locally.
+        """
+        entry = self._entries.get(category_type)
+        if entry is not None:
+            return entry
+
+        with self._lock:
+            entry = self._entries.get(category_type)
+            if entry is None:
+                entry = self._read_entry(self._cache_path(category_type))
+            if entry is not None:
+                self._index(category_type, entry)
+        return entry
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        """Check whether an entry is young enough to skip revalidation."""
+        return time.time() - entry.fetched_at <= self.ttl_seconds
+
+    def store(self, category_type: str, entry: CachedResponse) -> list[dict[str, Any]]:
+        """Persist and index a freshly fetched or revalidated entry.
+
+        Args:
+            category_type: Category type the entry belongs to.
+            entry: Entry to store.
+
+        Returns:
+            The entry's category list.
+        """
+        with self._lock:
+            self._index(category_type, entry)
+            self._write_entry(self._cache_path(category_type), entry)
+        return entry.data
+
+    def categories(self, category_type: str) -> list[dict[str, Any]]:
+        """Category list available locally (empty if never fetched)."""
+        entry = self.load(category_type)
+        return entry.data if entry is not None else []
+
+    def get(self, code: str, category_type: str = "tierone") -> dict[str, Any] | None:
+        """Look up a category entry by code without network access."""
+        self.load(category_type)
+        return self._by_code.get(category_type, {}).get(str(code))
+
+    def name_for(self, code: str, category_type: str = "tierone") -> str | None:
+        """Resolve a category code to its name without network access."""
+        item = self.get(code, category_type)
+        return _first(item, _NAME_KEYS) if item else None
+
+    def children(self, t1_code: str) -> list[dict[str, Any]]:
+        """Tier 2 categories under a tier 1 code, without network access."""
+        self.load("tiertwo")
+        return self._children.get(str(t1_code), [])
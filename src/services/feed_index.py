@@ -0,0 +1,87 @@
+"""In-memory index over the HKEX latest-announcements feed."""
+
+from collections import defaultdict
+from typing import Any
+
+# Category value HKEX uses for announcements that match every category filter
+UNCATEGORIZED = "NaN"
+
+
+class AnnouncementFeedIndex:
+    """Positional index of ``newsInfoLst`` by market, stock code and t1/t2 code.
+
+    Built once per feed download, so filtered queries become dict lookups and
+    a small set intersection instead of a scan over every announcement.
+    Results keep feed order.
+    """
+
+    def __init__(self, news_list: list[dict[str, Any]]):
+        """Build the index.
+
+        Args:
+            news_list: ``newsInfoLst`` entries from lcisehk1relsdc_1.json.
+        """
+        self.items = news_list
+        self.by_market: dict[Any, list[int]] = defaultdict(list)
+        self.by_stock: dict[str, list[int]] = defaultdict(list)
+        self.by_t1: dict[Any, list[int]] = defaultdict(list)
+        self.by_t2: dict[Any, list[int]] = defaultdict(list)
+
+        for pos, item in enumerate(news_list):
+            self.by_market[item.get("market")].append(pos)
+            self.by_t1[item.get("t1Code")].append(pos)
+            self.by_t2[item.get("t2Code")].append(pos)
+            for stock_code in {s.get("sc", "") for s in item.get("stock", [])}:
+                self.by_stock[stock_code].append(pos)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def _category_positions(self, index: dict[Any, list[int]], code: str) -> list[int]:
+        """Positions matching a category code, including uncategorized items."""
+        if code == UNCATEGORIZED:
+            return index.get(code, [])
+        return index.get(code, []) + index.get(UNCATEGORIZED, [])
+
+    def filter(
+        self,
+        market: str | None = None,
+        stock_code: str | None = None,
+        t1_code: str | None = None,
+        t2_code: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return announcements matching all given filters.
+
+        Category filters also match items whose code is "NaN", as HKEX leaves
+        some announcements uncategorized.
+
+        Args:
+            market: Market code (SEHK/GEM, optional).
+            stock_code: Stock code (optional).
+            t1_code: Tier 1 category code (optional).
+            t2_code: Tier 2 category code (optional).
+
+        Returns:
+            Matching announcements in feed order.
+        """
+        candidates: list[list[int]] = []
+        if market:
+            candidates.append(self.by_market.get(market, []))
+        if stock_code:
+            candidates.append(self.by_stock.get(stock_code, []))
+        if t1_code:
+            candidates.append(self._category_positions(self.by_t1, t1_code))
+        if t2_code:
+            candidates.append(self._category_positions(self.by_t2, t2_code))
+
+        if not candidates:
+            return list(self.items)
+
+        candidates.sort(key=len)
+        positions = set(candidates[0])
+        for other in candidates[1:]:
+            if not positions:
+                break
+            positions.intersection_update(other)
+
+        return [self.items[pos] for pos in sorted(positions)]
@@ -1,16 +1,64 @@
 """HKEX API service for fetching announcement data."""
 
+import asyncio
 import json
 import re
 import ssl
-from datetime import datetime
+from collections import deque
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from typing import Any
 
 import httpx
 
-
-class HKEXAPIService:
-    """Service for interacting with HKEX APIs."""
+from src.services.category_cache import CategoryTaxonomy
+from src.services.feed_index import AnnouncementFeedIndex
+from src.services.http_cache import CachedResponse
+from src.services.http_client import (
+    HTTPPoolConfig,
+    create_async_http_client,
+    create_http_client,
+)
+from src.services.rate_limit import RateLimiter
+from src.services.stock_cache import StockIdCache
+
+# Default number of in-flight requests for the async service
+DEFAULT_MAX_CONCURRENCY = 8
+# titleSearchServlet.do returns at most this many rows per request
+MAX_ROW_RANGE = 500
+# Initial date-window size for paginated searches; saturated windows are halved
+DEFAULT_WINDOW_DAYS = 90
+# Windows fetched in parallel by the paginated searches
+DEFAULT_WINDOW_CONCURRENCY = 4
+
+# Replacements applied to every string field of a search response
+_CLEAN_REPLACEMENTS = {
+    "&lt;": "<",
+    "&gt;": ">",
+    "&amp;": "&",
+    "\\u003c": "<",
+    "\\u003e": ">",
+    "\\u2013": "-",
+    "\\u0026": "-",
+    "\\\\": "",
+}
+# A double backslash directly before an escape keeps its second backslash for
+# the escape, as when escapes were replaced before stripping backslashes
+_CLEAN_PATTERN = re.compile(
+    r"&(?:lt|gt|amp);|\\u(?:003c|003e|2013|0026)|\\\\(?!u(?:003c|003e|2013|0026))"
+)
+
+
+def _clean_match(match: re.Match[str]) -> str:
+    return _CLEAN_REPLACEMENTS[match.group()]
+
+
+class HKEXAPIBase:
+    """Request building and response parsing shared by the sync and async services.
+
+    Subclasses only provide the transport; everything here is I/O free.
+    """
 
     BASE_URL = "https://www1.hkexnews.hk"
     DEFAULT_HEADERS = {
@@ -18,14 +66,38 @@ class HKEXAPIService:
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
         ),
     }
+    CATEGORY_FILES = {
+        "doc": "doc_c.json",
+        "tierone": "tierone_c.json",
+        "tiertwo": "tiertwo_c.json",
+        "tiertwogrp": "tiertwogrp_c.json",
+    }
+    ACTIVE_STOCK_FILES = {
+        "SEHK": "activestock_sehk_c.json",
+        "GEM": "activestock_gem_c.json",
+    }
 
-    def __init__(self, timeout: int = 30):
-        """Initialize HKEX API service.
+    def __init__(
+        self,
+        timeout: int = 30,
+        stock_cache: StockIdCache | None = None,
+        category_cache: CategoryTaxonomy | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ):
+        """Initialize shared service state.
 
         Args:
             timeout: Request timeout in seconds.
+            stock_cache: Persistent stock code → stockId cache (optional).
+            category_cache: Disk-cached category taxonomy (optional).
+            rate_limiter: Shared rate limiter with retry/backoff (optional).
         """
         self.timeout = timeout
+        self.stock_cache = stock_cache
+        self.category_cache = category_cache
+        self.rate_limiter = rate_limiter
+        # Last latest-announcements download, revalidated with conditional GETs
+        self._latest_feed: CachedResponse | None = None
         # Create SSL context that doesn't verify certificates
         self.ssl_context = ssl.create_default_context()
         self.ssl_context.check_hostname = False
@@ -35,30 +107,18 @@ class HKEXAPIService:
     def _clean_html_entities(self, text: str) -> str:
         """Clean HTML entities and Unicode escapes from text.
 
+        A single precompiled pass, equivalent to applying the entity, escape
+        and backslash replacements one after another.
+
         Args:
             text: Text to clean.
 
         Returns:
             Cleaned text.
         """
-        if not text:
+        if not text or ("&" not in text and "\\" not in text):
             return text
-
-        # HTML entities
-        text = text.replace("&lt;", "<")
-        text = text.replace("&gt;", ">")
-        text = text.replace("&amp;", "&")
-
-        # Unicode literal escapes
-        text = re.sub(r"\\u003c", "<", text)
-        text = re.sub(r"\\u003e", ">", text)
-        text = re.sub(r"\\u2013", "-", text)
-        text = text.replace("\\u0026", "-")
-
-        # Remove backslash escapes
-        text = text.replace("\\\\", "")
-
-        return text
+        return _CLEAN_PATTERN.sub(_clean_match, text)
 
     def _parse_jsonp(self, response_text: str) -> dict[str, Any]:
         """Parse JSONP response.
@@ -103,55 +163,357 @@ class HKEXAPIService:
         if not isinstance(result_data, list):
             return []
 
-        cleaned_results = []
-        for item in result_data:
-            if isinstance(item, dict):
-                cleaned_item = {}
-                for key, value in item.items():
-                    if isinstance(value, str):
-                        cleaned_item[key] = self._clean_html_entities(value)
-                    else:
-                        cleaned_item[key] = value
-                cleaned_results.append(cleaned_item)
+        # Strings with no "&" or backslash are returned untouched by the cleaner
+        clean = self._clean_html_entities
+        return [
+            {key: clean(value) if isinstance(value, str) else value for key, value in item.items()}
+            for item in result_data
+            if isinstance(item, dict)
+        ]
+
+    def _stock_id_url(self, stock_code: str, market: str = "SEHK") -> str:
+        """Build the prefix.do lookup URL for a stock code."""
+        return (
+            f"{self.BASE_URL}/search/prefix.do?"
+            f"callback=callback&lang=ZH&type=A&name={stock_code}"
+            f"&market={market}&_={int(datetime.now().timestamp() * 1000)}"
+        )
+
+    def _cached_stock_id(
+        self, stock_code: str, market: str
+    ) -> tuple[str | None, list[dict[str, Any]]] | None:
+        """Return a cached (stock_id, stock_info) pair, or None on a cache miss."""
+        if self.stock_cache is None:
+            return None
+        return self.stock_cache.get(stock_code, market)
+
+    def _store_stock_id(
+        self,
+        stock_code: str,
+        market: str,
+        stock_id: str | None,
+        stock_info: list[dict[str, Any]],
+    ) -> None:
+        """Cache a successful lookup (including "not found" answers)."""
+        if self.stock_cache is not None:
+            self.stock_cache.set(stock_code, market, stock_id, stock_info)
+
+    def _active_stocks_url(self, market: str) -> str:
+        """URL of the full active-stock list used for cache warm-up."""
+        filename = self.ACTIVE_STOCK_FILES.get(market, "activestock_sehk_c.json")
+        return f"{self.BASE_URL}/ncms/script/eds/{filename}"
+
+    def _parse_active_stocks(self, data: Any) -> list[tuple[str, Any, list[dict[str, Any]]]]:
+        """Convert the active-stock list into (stock_code, stock_id, stock_info) entries."""
+        entries = []
+        for item in data if isinstance(data, list) else []:
+            if not isinstance(item, dict):
+                continue
+            stock_code = item.get("c") or item.get("code")
+            stock_id = item.get("i") or item.get("stockId")
+            if not stock_code or stock_id is None:
+                continue
+            stock_info = [{"stockId": stock_id, "code": stock_code, "name": item.get("n") or item.get("name", "")}]
+            entries.append((stock_code, stock_id, stock_info))
+        return entries
+
+    def _parse_stock_id_response(self, response_text: str) -> tuple[str | None, list[dict[str, Any]]]:
+        """Extract (stock_id, stock_info) from a prefix.do JSONP response."""
+        data = self._parse_jsonp(response_text)
+
+        stock_info = data.get("stockInfo", [])
+        if stock_info and len(stock_info) > 0:
+            stock_id = stock_info[0].get("stockId")
+            return stock_id, stock_info
+
+        return None, []
+
+    def _search_params(
+        self,
+        stock_id: str,
+        from_date: str,
+        to_date: str,
+        title: str | None,
+        market: str,
+        document_type: int,
+        row_range: int,
+        lang: str,
+    ) -> dict[str, str]:
+        """Build titleSearchServlet.do query parameters."""
+        params = {
+            "sortDir": "0",
+            "sortByOptions": "DateTime",
+            "category": "0",
+            "market": market,
+            "stockId": stock_id,
+            "documentType": str(document_type),
+            "fromDate": from_date,
+            "toDate": to_date,
+            "searchType": "0",
+            "t1code": "-2",
+            "t2Gcode": "-2",
+            "t2code": "-2",
+            "rowRange": str(row_range),
+            "lang": lang,
+        }
+
+        if title:
+            params["title"] = title
+
+        return params
+
+    def _search_url(self) -> str:
+        """URL of the announcement title search."""
+        return f"{self.BASE_URL}/search/titleSearchServlet.do"
 
-        return cleaned_results
+    def _parse_search_response(self, response: httpx.Response) -> list[dict[str, Any]]:
+        """Parse and clean a titleSearchServlet.do response."""
+        result_data = response.json()
+        return self._clean_result_data(result_data.get("result", []))
+
+    def _date_windows(
+        self, from_date: str, to_date: str, window_days: int
+    ) -> list[tuple[str, str]]:
+        """Split an inclusive YYYYMMDD range into windows, newest first.
+
+        Windows do not overlap, so together with the newest-first order of
+        each response the concatenated results keep the API's sort order.
+        """
+        start = datetime.strptime(from_date, "%Y%m%d").date()
+        end = datetime.strptime(to_date, "%Y%m%d").date()
+        windows = []
+        while end >= start:
+            window_start = max(start, end - timedelta(days=max(window_days, 1) - 1))
+            windows.append((window_start.strftime("%Y%m%d"), end.strftime("%Y%m%d")))
+            end = window_start - timedelta(days=1)
+        return windows
+
+    def _split_window(self, window: tuple[str, str]) -> list[tuple[str, str]]:
+        """Halve a window (newest half first); single-day windows cannot be split."""
+        start = datetime.strptime(window[0], "%Y%m%d").date()
+        end = datetime.strptime(window[1], "%Y%m%d").date()
+        if start >= end:
+            return []
+        middle = start + (end - start) // 2
+        return [
+            ((middle + timedelta(days=1)).strftime("%Y%m%d"), window[1]),
+            (window[0], middle.strftime("%Y%m%d")),
+        ]
+
+    def _unseen(
+        self, announcements: list[dict[str, Any]], seen: set[Any]
+    ) -> list[dict[str, Any]]:
+        """Drop announcements whose NEWS_ID was already yielded."""
+        fresh = []
+        for item in announcements:
+            news_id = item.get("NEWS_ID")
+            if news_id is not None:
+                if news_id in seen:
+                    continue
+                seen.add(news_id)
+            fresh.append(item)
+        return fresh
+
+    def _latest_url(self) -> str:
+        """URL of the latest-announcements feed."""
+        return f"{self.BASE_URL}/ncms/json/eds/lcisehk1relsdc_1.json"
+
+    def _latest_request_headers(self) -> dict[str, str]:
+        """Conditional headers for revalidating the cached latest feed."""
+        if self._latest_feed is None:
+            return {}
+        return self._latest_feed.conditional_headers()
+
+    def _latest_feed_index(self, response: httpx.Response) -> AnnouncementFeedIndex:
+        """Return the feed index, reusing the cached one on 304 Not Modified."""
+        if response.status_code == 304 and self._latest_feed is not None:
+            return self._latest_feed.revalidated().data
+
+        data = response.json()
+        index = AnnouncementFeedIndex(data.get("newsInfoLst", []))
+        self._latest_feed = CachedResponse.from_response(response, index)
+        return index
+
+    def _category_url(self, category_type: str) -> str:
+        """URL of a category reference file."""
+        filename = self.CATEGORY_FILES.get(category_type, "tierone_c.json")
+        return f"{self.BASE_URL}/ncms/script/eds/{filename}"
+
+    def _category_key(self, category_type: str) -> str:
+        """Normalize unknown category types to the tierone default, as the URL does."""
+        return category_type if category_type in self.CATEGORY_FILES else "tierone"
+
+    def _local_categories(self, category_type: str) -> CachedResponse | None:
+        """Locally cached category entry (possibly stale), if any."""
+        if self.category_cache is None:
+            return None
+        return self.category_cache.load(self._category_key(category_type))
+
+    def _store_categories(
+        self,
+        category_type: str,
+        response: httpx.Response,
+        local: CachedResponse | None,
+    ) -> list[dict[str, Any]]:
+        """Parse a category response, reusing the local entry on 304 Not Modified."""
+        if response.status_code == 304 and local is not None:
+            categories = local.revalidated().data
+            if self.category_cache is not None:
+                self.category_cache.store(self._category_key(category_type), local)
+            return categories
+
+        categories = response.json()
+        categories = categories if isinstance(categories, list) else []
+        if self.category_cache is not None:
+            self.category_cache.store(
+                self._category_key(category_type),
+                CachedResponse.from_response(response, categories),
+            )
+        return categories
+
+    def parse_date_time(self, date_time_str: str) -> tuple[str, str]:
+        """Parse date time string from API response.
+
+        Args:
+            date_time_str: Date time string in format "dd/mm/yyyy HH:MM".
+
+        Returns:
+            Tuple of (date_str in YYYY-MM-DD format, time_str in HH:MM format).
+        """
+        try:
+            # Parse "dd/mm/yyyy HH:MM" format
+            dt = datetime.strptime(date_time_str.split()[0], "%d/%m/%Y")
+            date_str = dt.strftime("%Y-%m-%d")
+            time_str = date_time_str.split()[1] if " " in date_time_str else ""
+            return date_str, time_str
+        except Exception:
+            return "", ""
+
+
+class HKEXAPIService(HKEXAPIBase):
+    """Service for interacting with HKEX APIs."""
+
+    def __init__(
+        self,
+        timeout: int = 30,
+        client: httpx.Client | None = None,
+        pool_config: HTTPPoolConfig | None = None,
+        stock_cache: StockIdCache | None = None,
+        category_cache: CategoryTaxonomy | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ):
+        """Initialize HKEX API service.
+
+        Args:
+            timeout: Request timeout in seconds.
+            client: Shared HTTP client to reuse (optional). When omitted, the
+                service creates and owns a keep-alive connection pool.
+            pool_config: Pool limits / HTTP/2 settings for an owned client
+                (default: read from environment).
+            stock_cache: Persistent stock code → stockId cache (optional).
+            category_cache: Disk-cached category taxonomy (optional).
+            rate_limiter: Rate limiter shared with other services (optional).
+                Requests are throttled and transient failures retried.
+        """
+        super().__init__(timeout, stock_cache, category_cache, rate_limiter)
+
+        # Long-lived connection pool, reused across calls to avoid a TCP+TLS
+        # handshake per request
+        self._owns_client = client is None
+        self.client = client or create_http_client(self.DEFAULT_HEADERS, timeout, pool_config)
+
+    def close(self) -> None:
+        """Close the connection pool if this service owns it."""
+        if self._owns_client:
+            self.client.close()
+
+    def __enter__(self) -> "HKEXAPIService":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _get(
+        self,
+        url: str,
+        params: dict[str, str] | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> httpx.Response:
+        """Issue a GET request over the pooled client.
 
-    def get_stock_id(self, stock_code: str) -> tuple[str | None, list[dict[str, Any]]]:
+        With a rate limiter, the request waits for a token and transient
+        failures (transport errors, 429, 5xx) are retried with backoff.
+
+        Args:
+            url: Request URL.
+            params: Query parameters (optional).
+            headers: Extra request headers, e.g. conditional-GET validators (optional).
+
+        Returns:
+            Successful (2xx) or 304 Not Modified HTTP response.
+
+        Raises:
+            httpx.HTTPError: On transport errors or other non-2xx status codes.
+        """
+
+        def send() -> httpx.Response:
+            return self.client.get(url, params=params, headers=headers, timeout=self.timeout)
+
+        response = self.rate_limiter.request(send) if self.rate_limiter else send()
+        if response.status_code != 304:
+            response.raise_for_status()
+        return response
+
+    def get_stock_id(
+        self, stock_code: str, market: str = "SEHK"
+    ) -> tuple[str | None, list[dict[str, Any]]]:
         """Get stock ID from stock code.
 
+        Served from the stock ID cache when one is configured.
+
         Args:
             stock_code: 5-digit stock code (e.g., "00673").
+            market: Market code (default: "SEHK").
 
         Returns:
             Tuple of (stock_id, stock_info_list). stock_id is None if not found.
         """
-        url = (
-            f"{self.BASE_URL}/search/prefix.do?"
-            f"callback=callback&lang=ZH&type=A&name={stock_code}"
-            f"&market=SEHK&_={int(datetime.now().timestamp() * 1000)}"
-        )
+        cached = self._cached_stock_id(stock_code, market)
+        if cached is not None:
+            return cached
 
         try:
-            with httpx.Client(
-                headers=self.DEFAULT_HEADERS,
-                timeout=self.timeout,
-                verify=False,
-            ) as client:
-                response = client.get(url)
-                response.raise_for_status()
+            response = self._get(self._stock_id_url(stock_code, market))
+            stock_id, stock_info = self._parse_stock_id_response(response.text)
 
-                # Parse JSONP response
-                data = self._parse_jsonp(response.text)
+        except Exception as e:
+            return None, [{"error": str(e)}]
 
-                stock_info = data.get("stockInfo", [])
-                if stock_info and len(stock_info) > 0:
-                    stock_id = stock_info[0].get("stockId")
-                    return stock_id, stock_info
+        self._store_stock_id(stock_code, market, stock_id, stock_info)
+        return stock_id, stock_info
 
-                return None, []
+    def warm_stock_id_cache(self, market: str = "SEHK", force: bool = False) -> int:
+        """Load the full active-stock list into the stock ID cache in one request.
 
-        except Exception as e:
-            return None, [{"error": str(e)}]
+        Args:
+            market: Market code - "SEHK" or "GEM" (default: "SEHK").
+            force: Reload even if a warm-up is still within TTL.
+
+        Returns:
+            Number of cached entries (0 if skipped, no cache, or on error).
+        """
+        if self.stock_cache is None or (not force and self.stock_cache.is_warm(market)):
+            return 0
+
+        try:
+            response = self._get(self._active_stocks_url(market))
+            entries = self._parse_active_stocks(response.json())
+        except Exception:
+            return 0
+
+        self.stock_cache.set_many(market, entries)
+        self.stock_cache.mark_warm(market)
+        return len(entries)
 
     def search_announcements(
         self,
@@ -179,47 +541,85 @@ class HKEXAPIService:
         Returns:
             Tuple of (stock_id, list of announcement dictionaries).
         """
-        params = {
-            "sortDir": "0",
-            "sortByOptions": "DateTime",
-            "category": "0",
-            "market": market,
-            "stockId": stock_id,
-            "documentType": str(document_type),
-            "fromDate": from_date,
-            "toDate": to_date,
-            "searchType": "0",
-            "t1code": "-2",
-            "t2Gcode": "-2",
-            "t2code": "-2",
-            "rowRange": str(row_range),
-            "lang": lang,
-        }
+        params = self._search_params(
+            stock_id, from_date, to_date, title, market, document_type, row_range, lang
+        )
 
-        if title:
-            params["title"] = title
+        try:
+            response = self._get(self._search_url(), params=params)
+            return stock_id, self._parse_search_response(response)
 
-        url = f"{self.BASE_URL}/search/titleSearchServlet.do"
+        except Exception as e:
+            return stock_id, [{"error": str(e)}]
 
-        try:
-            with httpx.Client(
-                headers=self.DEFAULT_HEADERS,
-                timeout=self.timeout,
-                verify=False,
-            ) as client:
-                response = client.get(url, params=params)
-                response.raise_for_status()
+    def iter_announcements(
+        self,
+        stock_id: str,
+        from_date: str,
+        to_date: str,
+        title: str | None = None,
+        market: str = "SEHK",
+        document_type: int = -1,
+        lang: str = "zh",
+        window_days: int = DEFAULT_WINDOW_DAYS,
+        max_concurrency: int = DEFAULT_WINDOW_CONCURRENCY,
+    ) -> Iterator[dict[str, Any]]:
+        """Stream every announcement in a date range, beyond the 500-row cap.
+
+        The range is split into date windows fetched in parallel. A window
+        that comes back with the full 500 rows is split in half and fetched
+        again, so nothing is silently truncated (except a single day with
+        more than 500 filings, which cannot be split further). Results are
+        de-duplicated by NEWS_ID and yielded newest first as soon as each
+        window, in order, is available.
 
-                result_data = response.json()
-                result = result_data.get("result", [])
+        Args:
+            stock_id: Internal stock ID from get_stock_id().
+            from_date: Start date in YYYYMMDD format (e.g., "20150101").
+            to_date: End date in YYYYMMDD format (e.g., "20251008").
+            title: Search keyword in title (optional).
+            market: Market code (default: "SEHK").
+            document_type: Document type code (default: -1 for all).
+            lang: Language code (default: "zh").
+            window_days: Initial window size in days (default: 90).
+            max_concurrency: Windows fetched in parallel (default: 4).
 
-                # Clean and parse result data
-                announcements = self._clean_result_data(result)
+        Yields:
+            Announcement dictionaries.
 
-                return stock_id, announcements
+        Raises:
+            httpx.HTTPError: If a window request fails.
+        """
 
-        except Exception as e:
-            return stock_id, [{"error": str(e)}]
+        def fetch(window: tuple[str, str]) -> list[dict[str, Any]]:
+            params = self._search_params(
+                stock_id, window[0], window[1], title, market, document_type, MAX_ROW_RANGE, lang
+            )
+            return self._parse_search_response(self._get(self._search_url(), params=params))
+
+        windows = deque(self._date_windows(from_date, to_date, window_days))
+        in_flight: deque = deque()
+        seen: set[Any] = set()
+        pool = ThreadPoolExecutor(max_workers=max(max_concurrency, 1))
+        try:
+            while windows or in_flight:
+                while windows and len(in_flight) < max(max_concurrency, 1):
+                    window = windows.popleft()
+                    in_flight.append((window, pool.submit(fetch, window)))
+
+                window, future = in_flight.popleft()
+                announcements = future.result()
+                halves = self._split_window(window) if len(announcements) >= MAX_ROW_RANGE else []
+                if halves:
+                    # Fetch the halves next, ahead of older windows, to keep order
+                    for half in reversed(halves):
+                        in_flight.appendleft((half, pool.submit(fetch, half)))
+                    continue
+
+                yield from self._unseen(announcements, seen)
+        finally:
+            # Stop promptly if the consumer abandons the generator early
+            pool.shutdown(wait=False, cancel_futures=True)
 
     def get_latest_announcements(
         self,
@@ -239,46 +639,12 @@ class HKEXAPIService:
         Returns:
             List of announcement dictionaries.
         """
-        url = f"{self.BASE_URL}/ncms/json/eds/lcisehk1relsdc_1.json"
-
         try:
-            with httpx.Client(
-                headers=self.DEFAULT_HEADERS,
-                timeout=self.timeout,
-                verify=False,
-            ) as client:
-                response = client.get(url)
-                response.raise_for_status()
-
-                data = response.json()
-                news_list = data.get("newsInfoLst", [])
-
-                # Apply filters
-                filtered_news = []
-                for item in news_list:
-                    # Market filter
-                    if market and item.get("market") != market:
-                        continue
-
-                    # Stock code filter
-                    if stock_code:
-                        stock_items = item.get("stock", [])
-                        stock_codes = [s.get("sc", "") for s in stock_items]
-                        if stock_code not in stock_codes:
-                            continue
-
-                    # Category filters
-                    if t1_code and item.get("t1Code") != t1_code:
-                        if item.get("t1Code") != "NaN":
-                            continue
-
-                    if t2_code and item.get("t2Code") != t2_code:
-                        if item.get("t2Code") != "NaN":
-                            continue
-
-                    filtered_news.append(item)
-
-                return filtered_news
+            # Conditional GET: on 304 the previously parsed and indexed feed is reused
+            response = self._get(self._latest_url(), headers=self._latest_request_headers())
+            index = self._latest_feed_index(response)
+
+            return index.filter(market, stock_code, t1_code, t2_code)
 
         except Exception as e:
             return [{"error": str(e)}]
@@ -294,46 +660,470 @@ class HKEXAPIService:
         Returns:
             List of category dictionaries.
         """
-        category_files = {
-            "doc": "doc_c.json",
-            "tierone": "tierone_c.json",
-            "tiertwo": "tiertwo_c.json",
-            "tiertwogrp": "tiertwogrp_c.json",
+        local = self._local_categories(category_type)
+        if local is not None and self.category_cache is not None and self.category_cache.is_fresh(local):
+            return local.data
+
+        try:
+            headers = local.conditional_headers() if local is not None else None
+            response = self._get(self._category_url(category_type), headers=headers)
+            return self._store_categories(category_type, response, local)
+
+        except Exception as e:
+            # A stale copy beats an error for static reference data
+            if local is not None:
+                return local.data
+            return [{"error": str(e)}]
+
+
+class AsyncHKEXAPIService(HKEXAPIBase):
+    """Async twin of HKEXAPIService built on ``httpx.AsyncClient``.
+
+    Every request runs under a shared semaphore, so callers can fan out with
+    ``asyncio.gather`` over many tickers without flooding hkexnews.
+
+    Wrap requests in ``async with service:``. Overlapping blocks share the
+    owned connection pool, and the last one to exit closes it. Code that
+    does not use a block should ``await aclose()`` before its loop ends.
+    """
+
+    def __init__(
+        self,
+        timeout: int = 30,
+        client: httpx.AsyncClient | None = None,
+        pool_config: HTTPPoolConfig | None = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        stock_cache: StockIdCache | None = None,
+        category_cache: CategoryTaxonomy | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ):
+        """Initialize async HKEX API service.
+
+        Args:
+            timeout: Request timeout in seconds.
+            client: Shared async HTTP client to reuse (optional). When omitted,
+                the service lazily creates and owns one per event loop.
+            pool_config: Pool limits / HTTP/2 settings for an owned client
+                (default: read from environment).
+            max_concurrency: Maximum in-flight requests (default: 8).
+            stock_cache: Persistent stock code → stockId cache (optional).
+            category_cache: Disk-cached category taxonomy (optional).
+            rate_limiter: Rate limiter shared with other services (optional).
+        """
+        super().__init__(timeout, stock_cache, category_cache, rate_limiter)
+        self.pool_config = pool_config
+        self.max_concurrency = max_concurrency
+        self._owns_client = client is None
+        self._client = client
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # Open ``async with`` blocks; the owned client is closed when the last exits
+        self._sessions = 0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Async HTTP client bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._client
+        if client is None or (self._owns_client and self._loop is not loop):
+            # Connections cannot be shared across event loops, so an owned
+            # client is recreated when the service is used from a new loop
+            if client is not None:
+                self._close_on_loop(*self._release_client())
+            client = create_async_http_client(self.DEFAULT_HEADERS, self.timeout, self.pool_config)
+            self._client = client
+            self._semaphore = None
+            self._loop = loop
+        return client
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        """Concurrency limiter for in-flight requests."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def _release_client(self) -> tuple[httpx.AsyncClient | None, asyncio.AbstractEventLoop | None]:
+        """Forget the owned client; returns it and its event loop."""
+        client, loop = self._client, self._loop
+        self._client = self._loop = self._semaphore = None
+        return client, loop
+
+    @staticmethod
+    def _close_on_loop(client: httpx.AsyncClient | None, loop: asyncio.AbstractEventLoop | None) -> None:
+        """Close a client from outside the event loop it was opened on.
+
+        Its connections can only be closed on that loop. If the loop runs in
+        another thread, the close is scheduled there. An idle loop is run once
+        to close it, unless a loop is already running in this thread. A client
+        whose loop is closed cannot be closed any more.
+        """
+        if client is None or loop is None or loop.is_closed():
+            return
+        if loop.is_running():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            loop.run_until_complete(client.aclose())
+
+    async def aclose(self) -> None:
+        """Close the connection pool if this service owns it."""
+        if not self._owns_client:
+            return
+        client, loop = self._release_client()
+        if client is not None and loop is asyncio.get_running_loop():
+            await client.aclose()
+        else:
+            self._close_on_loop(client, loop)
+
+    def close(self) -> None:
+        """Close an owned connection pool from synchronous code, e.g. at exit."""
+        if self._owns_client:
+            self._close_on_loop(*self._release_client())
+
+    async def __aenter__(self) -> "AsyncHKEXAPIService":
+        self._sessions += 1
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self._sessions -= 1
+        if self._sessions == 0:
+            await self.aclose()
+
+    async def _get(
+        self,
+        url: str,
+        params: dict[str, str] | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> httpx.Response:
+        """Issue a GET request under the concurrency limit and rate limiter.
+
+        Args:
+            url: Request URL.
+            params: Query parameters (optional).
+            headers: Extra request headers, e.g. conditional-GET validators (optional).
+
+        Returns:
+            Successful (2xx) or 304 Not Modified HTTP response.
+
+        Raises:
+            httpx.HTTPError: On transport errors or other non-2xx status codes.
+        """
+        client = self.client
+
+        async def send() -> httpx.Response:
+            return await client.get(url, params=params, headers=headers, timeout=self.timeout)
+
+        async with self.semaphore:
+            response = await (self.rate_limiter.arequest(send) if self.rate_limiter else send())
+        if response.status_code != 304:
+            response.raise_for_status()
+        return response
+
+    async def get_stock_id(
+        self, stock_code: str, market: str = "SEHK"
+    ) -> tuple[str | None, list[dict[str, Any]]]:
+        """Get stock ID from stock code.
+
+        Served from the stock ID cache when one is configured.
+
+        Args:
+            stock_code: 5-digit stock code (e.g., "00673").
+            market: Market code (default: "SEHK").
+
+        Returns:
+            Tuple of (stock_id, stock_info_list). stock_id is None if not found.
+        """
+        cached = self._cached_stock_id(stock_code, market)
+        if cached is not None:
+            return cached
+
+        try:
+            response = await self._get(self._stock_id_url(stock_code, market))
+            stock_id, stock_info = self._parse_stock_id_response(response.text)
+
+        except Exception as e:
+            return None, [{"error": str(e)}]
+
+        self._store_stock_id(stock_code, market, stock_id, stock_info)
+        return stock_id, stock_info
+
+    async def warm_stock_id_cache(self, market: str = "SEHK", force: bool = False) -> int:
+        """Load the full active-stock list into the stock ID cache in one request.
+
+        Args:
+            market: Market code - "SEHK" or "GEM" (default: "SEHK").
+            force: Reload even if a warm-up is still within TTL.
+
+        Returns:
+            Number of cached entries (0 if skipped, no cache, or on error).
+        """
+        if self.stock_cache is None or (not force and self.stock_cache.is_warm(market)):
+            return 0
+
+        try:
+            response = await self._get(self._active_stocks_url(market))
+            entries = self._parse_active_stocks(response.json())
+        except Exception:
+            return 0
+
+        self.stock_cache.set_many(market, entries)
+        self.stock_cache.mark_warm(market)
+        return len(entries)
+
+    async def search_announcements(
+        self,
+        stock_id: str,
+        from_date: str,
+        to_date: str,
+        title: str | None = None,
+        market: str = "SEHK",
+        document_type: int = -1,
+        row_range: int = 100,
+        lang: str = "zh",
+    ) -> tuple[str, list[dict[str, Any]]]:
+        """Search announcements for a stock.
+
+        Args:
+            stock_id: Internal stock ID from get_stock_id().
+            from_date: Start date in YYYYMMDD format (e.g., "20250101").
+            to_date: End date in YYYYMMDD format (e.g., "20251008").
+            title: Search keyword in title (optional).
+            market: Market code (default: "SEHK").
+            document_type: Document type code (default: -1 for all).
+            row_range: Number of results (1-500, default: 100).
+            lang: Language code (default: "zh").
+
+        Returns:
+            Tuple of (stock_id, list of announcement dictionaries).
+        """
+        params = self._search_params(
+            stock_id, from_date, to_date, title, market, document_type, row_range, lang
+        )
+
+        try:
+            response = await self._get(self._search_url(), params=params)
+            return stock_id, self._parse_search_response(response)
+
+        except Exception as e:
+            return stock_id, [{"error": str(e)}]
+
+    async def iter_announcements(
+        self,
+        stock_id: str,
+        from_date: str,
+        to_date: str,
+        title: str | None = None,
+        market: str = "SEHK",
+        document_type: int = -1,
+        lang: str = "zh",
+        window_days: int = DEFAULT_WINDOW_DAYS,
+        max_concurrency: int = DEFAULT_WINDOW_CONCURRENCY,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Stream every announcement in a date range, beyond the 500-row cap.
+
+        Async twin of HKEXAPIService.iter_announcements(); window requests
+        also count against the service-wide ``max_concurrency`` semaphore.
+
+        Args:
+            stock_id: Internal stock ID from get_stock_id().
+            from_date: Start date in YYYYMMDD format (e.g., "20150101").
+            to_date: End date in YYYYMMDD format (e.g., "20251008").
+            title: Search keyword in title (optional).
+            market: Market code (default: "SEHK").
+            document_type: Document type code (default: -1 for all).
+            lang: Language code (default: "zh").
+            window_days: Initial window size in days (default: 90).
+            max_concurrency: Windows fetched in parallel (default: 4).
+
+        Yields:
+            Announcement dictionaries.
+
+        Raises:
+            httpx.HTTPError: If a window request fails.
+        """
+
+        async def fetch(window: tuple[str, str]) -> list[dict[str, Any]]:
+            params = self._search_params(
+                stock_id, window[0], window[1], title, market, document_type, MAX_ROW_RANGE, lang
+            )
+            return self._parse_search_response(await self._get(self._search_url(), params=params))
+
+        windows = deque(self._date_windows(from_date, to_date, window_days))
+        in_flight: deque = deque()
+        seen: set[Any] = set()
+        try:
+            while windows or in_flight:
+                while windows and len(in_flight) < max(max_concurrency, 1):
+                    window = windows.popleft()
+                    in_flight.append((window, asyncio.ensure_future(fetch(window))))
+
+                window, task = in_flight.popleft()
+                announcements = await task
+                halves = self._split_window(window) if len(announcements) >= MAX_ROW_RANGE else []
+                if halves:
+                    for half in reversed(halves):
+                        in_flight.appendleft((half, asyncio.ensure_future(fetch(half))))
+                    continue
+
+                for item in self._unseen(announcements, seen):
+                    yield item
+        finally:
+            for _, task in in_flight:
+                task.cancel()
+
+    async def search_stock_announcements(
+        self,
+        stock_code: str,
+        from_date: str,
+        to_date: str,
+        title: str | None = None,
+        market: str = "SEHK",
+        row_range: int = 100,
+        all_pages: bool = False,
+    ) -> dict[str, Any]:
+        """Resolve a stock code and search its announcements.
+
+        Args:
+            stock_code: 5-digit stock code (e.g., "00673").
+            from_date: Start date in YYYYMMDD format.
+            to_date: End date in YYYYMMDD format.
+            title: Search keyword in title (optional).
+            market: Market code (default: "SEHK").
+            row_range: Number of results (1-500, default: 100).
+            all_pages: Fetch the whole date range via iter_announcements(),
+                ignoring row_range (default: False).
+
+        Returns:
+            Dictionary with stock_code, stock_id and announcements (plus error
+            when the stock cannot be resolved).
+        """
+        stock_id, _ = await self.get_stock_id(stock_code)
+        if not stock_id:
+            return {
+                "stock_code": stock_code,
+                "stock_id": None,
+                "error": "Stock not found",
+                "announcements": [],
+            }
+
+        if all_pages:
+            try:
+                announcements = [
+                    item
+                    async for item in self.iter_announcements(
+                        stock_id=stock_id,
+                        from_date=from_date,
+                        to_date=to_date,
+                        title=title,
+                        market=market,
+                    )
+                ]
+            except Exception as e:
+                announcements = [{"error": str(e)}]
+        else:
+            stock_id, announcements = await self.search_announcements(
+                stock_id=stock_id,
+                from_date=from_date,
+                to_date=to_date,
+                title=title,
+                market=market,
+                row_range=row_range,
+            )
+        return {
+            "stock_code": stock_code,
+            "stock_id": stock_id,
+            "announcements": announcements,
         }
 
-        filename = category_files.get(category_type, "tierone_c.json")
-        url = f"{self.BASE_URL}/ncms/script/eds/{filename}"
+    async def search_many(
+        self,
+        stock_codes: list[str],
+        from_date: str,
+        to_date: str,
+        title: str | None = None,
+        market: str = "SEHK",
+        row_range: int = 100,
+    ) -> list[dict[str, Any]]:
+        """Search announcements for many stocks concurrently.
+
+        Requests are bounded by ``max_concurrency``; results keep input order.
+
+        Args:
+            stock_codes: 5-digit stock codes.
+            from_date: Start date in YYYYMMDD format.
+            to_date: End date in YYYYMMDD format.
+            title: Search keyword in title (optional).
+            market: Market code (default: "SEHK").
+            row_range: Number of results per stock (1-500, default: 100).
+
+        Returns:
+            One result dictionary per stock code, as returned by
+            search_stock_announcements().
+        """
+        return list(
+            await asyncio.gather(
+                *(
+                    self.search_stock_announcements(
+                        code, from_date, to_date, title=title, market=market, row_range=row_range
+                    )
+                    for code in stock_codes
+                )
+            )
+        )
 
+    async def get_latest_announcements(
+        self,
+        market: str | None = None,
+        stock_code: str | None = None,
+        t1_code: str | None = None,
+        t2_code: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Get latest announcements from HKEX.
+
+        Args:
+            market: Filter by market (SEHK/GEM, optional).
+            stock_code: Filter by stock code (optional).
+            t1_code: Filter by tier 1 category code (optional).
+            t2_code: Filter by tier 2 category code (optional).
+
+        Returns:
+            List of announcement dictionaries.
+        """
         try:
-            with httpx.Client(
-                headers=self.DEFAULT_HEADERS,
-                timeout=self.timeout,
-                verify=False,
-            ) as client:
-                response = client.get(url)
-                response.raise_for_status()
+            # Conditional GET: on 304 the previously parsed and indexed feed is reused
+            response = await self._get(self._latest_url(), headers=self._latest_request_headers())
+            index = self._latest_feed_index(response)
 
-                categories = response.json()
-                return categories if isinstance(categories, list) else []
+            return index.filter(market, stock_code, t1_code, t2_code)
 
         except Exception as e:
             return [{"error": str(e)}]
 
-    def parse_date_time(self, date_time_str: str) -> tuple[str, str]:
-        """Parse date time string from API response.
+    async def get_categories(
+        self, category_type: str = "tierone"
+    ) -> list[dict[str, Any]]:
+        """Get category data from HKEX.
 
         Args:
-            date_time_str: Date time string in format "dd/mm/yyyy HH:MM".
+            category_type: Category type - "doc", "tierone", "tiertwo", "tiertwogrp".
 
         Returns:
-            Tuple of (date_str in YYYY-MM-DD format, time_str in HH:MM format).
+            List of category dictionaries.
         """
+        local = self._local_categories(category_type)
+        if local is not None and self.category_cache is not None and self.category_cache.is_fresh(local):
+            return local.data
+
         try:
-            # Parse "dd/mm/yyyy HH:MM" format
-            dt = datetime.strptime(date_time_str.split()[0], "%d/%m/%Y")
-            date_str = dt.strftime("%Y-%m-%d")
-            time_str = date_time_str.split()[1] if " " in date_time_str else ""
-            return date_str, time_str
-        except Exception:
-            return "", ""
+            headers = local.conditional_headers() if local is not None else None
+            response = await self._get(self._category_url(category_type), headers=headers)
+            return self._store_categories(category_type, response, local)
 
+        except Exception as e:
+            # A stale copy beats an error for static reference data
+            if local is not None:
+                return local.data
+            return [{"error": str(e)}]
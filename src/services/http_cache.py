@@ -0,0 +1,52 @@
+"""Conditional-GET (ETag / Last-Modified) cache entries for HKEX resources."""
+
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+
+@dataclass
+class CachedResponse:
+    """Parsed payload of a resource plus the validators needed to revalidate it.
+
+    The payload can be any parsed form (list, index object, ...); only the
+    validators are sent back to the server.
+    """
+
+    data: Any
+    etag: str | None = None
+    last_modified: str | None = None
+    fetched_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def from_response(cls, response: httpx.Response, data: Any) -> "CachedResponse":
+        """Build a cache entry from a 200 response and its parsed payload.
+
+        Args:
+            response: HTTP response the payload was parsed from.
+            data: Parsed payload.
+
+        Returns:
+            Cache entry carrying the response validators.
+        """
+        return cls(
+            data=data,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Request headers that let the server answer 304 Not Modified."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def revalidated(self) -> "CachedResponse":
+        """Mark the entry as confirmed fresh by a 304 response."""
+        self.fetched_at = time.time()
+        return self
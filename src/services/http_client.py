@@ -0,0 +1,130 @@
+"""Shared HTTP connection pool for HKEX services."""
+
+import importlib.util
+import os
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    """Read a boolean flag from the environment.
+
+    Args:
+        name: Environment variable name.
+        default: Value used when the variable is unset.
+
+    Returns:
+        Parsed boolean value.
+    """
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def http2_available() -> bool:
+    """Check whether the optional ``h2`` package needed for HTTP/2 is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+@dataclass
+class HTTPPoolConfig:
+    """Connection pool settings for the long-lived HKEX HTTP client.
+
+    Environment variables:
+        HKEX_HTTP_MAX_CONNECTIONS: Maximum open connections (default: 20)
+        HKEX_HTTP_MAX_KEEPALIVE: Maximum idle keep-alive connections (default: 10)
+        HKEX_HTTP_KEEPALIVE_EXPIRY: Idle connection lifetime in seconds (default: 30)
+        HKEX_HTTP2: Enable HTTP/2 when ``h2`` is installed (default: false)
+    """
+
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+
+    @classmethod
+    def from_env(cls) -> "HTTPPoolConfig":
+        """Build a pool configuration from environment variables.
+
+        Returns:
+            Pool configuration with environment overrides applied.
+        """
+        config = cls()
+        if value := os.getenv("HKEX_HTTP_MAX_CONNECTIONS"):
+            config.max_connections = int(value)
+        if value := os.getenv("HKEX_HTTP_MAX_KEEPALIVE"):
+            config.max_keepalive_connections = int(value)
+        if value := os.getenv("HKEX_HTTP_KEEPALIVE_EXPIRY"):
+            config.keepalive_expiry = float(value)
+        config.http2 = _env_flag("HKEX_HTTP2", config.http2)
+        return config
+
+    @property
+    def limits(self) -> httpx.Limits:
+        """Pool limits in httpx form."""
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def client_kwargs(self, headers: dict[str, str], timeout: float) -> dict[str, Any]:
+        """Keyword arguments shared by the sync and async httpx clients.
+
+        HTTP/2 silently falls back to HTTP/1.1 when ``h2`` is not installed.
+
+        Args:
+            headers: Default request headers.
+            timeout: Default request timeout in seconds.
+
+        Returns:
+            Keyword arguments for ``httpx.Client`` / ``httpx.AsyncClient``.
+        """
+        return {
+            "headers": headers,
+            "timeout": timeout,
+            "verify": False,
+            "limits": self.limits,
+            "http2": self.http2 and http2_available(),
+        }
+
+
+def create_http_client(
+    headers: dict[str, str],
+    timeout: float,
+    config: HTTPPoolConfig | None = None,
+) -> httpx.Client:
+    """Create a pooled, keep-alive HTTP client.
+
+    Args:
+        headers: Default request headers.
+        timeout: Default request timeout in seconds.
+        config: Pool configuration (default: read from environment).
+
+    Returns:
+        Configured ``httpx.Client``. The caller owns it and must close it.
+    """
+    config = config or HTTPPoolConfig.from_env()
+    return httpx.Client(**config.client_kwargs(headers, timeout))
+
+
+def create_async_http_client(
+    headers: dict[str, str],
+    timeout: float,
+    config: HTTPPoolConfig | None = None,
+) -> httpx.AsyncClient:
+    """Create a pooled, keep-alive async HTTP client.
+
+    Args:
+        headers: Default request headers.
+        timeout: Default request timeout in seconds.
+        config: Pool configuration (default: read from environment).
+
+    Returns:
+        Configured ``httpx.AsyncClient``. The caller owns it and must close it.
+    """
+    config = config or HTTPPoolConfig.from_env()
+    return httpx.AsyncClient(**config.client_kwargs(headers, timeout))
@@ -0,0 +1,302 @@
+"""Persistent index of downloaded announcement PDFs in a cache directory."""
+
+import re
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+
+CATALOG_FILENAME = ".catalog.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pdfs (
+    stock_code TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    date TEXT NOT NULL,
+    title_key TEXT NOT NULL,
+    news_id TEXT,
+    url TEXT,
+    size INTEGER,
+    added_at REAL NOT NULL,
+    sha256 TEXT,
+    PRIMARY KEY (stock_code, filename)
+);
+CREATE INDEX IF NOT EXISTS pdfs_by_date ON pdfs (stock_code, date, title_key);
+CREATE INDEX IF NOT EXISTS pdfs_by_news_id ON pdfs (news_id);
+CREATE INDEX IF NOT EXISTS pdfs_by_sha256 ON pdfs (sha256);
+CREATE TABLE IF NOT EXISTS stock_dirs (
+    stock_code TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL
+);
+"""
+
+_DATE_PREFIX = re.compile(r"\d{4}-\d{2}-\d{2}-")
+
+
+def normalize_title(title: str) -> str:
+    """Lower-case a title and collapse whitespace, for title comparisons."""
+    return re.sub(r"\s+", " ", title.strip().lower())
+
+
+def _split_filename(filename: str) -> tuple[str, str]:
+    """Split "YYYY-MM-DD-title.pdf" into (date, normalized title)."""
+    stem = filename[:-4] if filename.lower().endswith(".pdf") else filename
+    if _DATE_PREFIX.match(stem):
+        return stem[:10], normalize_title(stem[11:])
+    return "", normalize_title(stem)
+
+
+def best_title_match(title: str, candidates: list[tuple[str, str]]) -> str | None:
+    """Pick the candidate whose title best overlaps ``title``.
+
+    A candidate qualifies when one normalized title contains the other; the
+    winner has the highest word-level Jaccard overlap.
+
+    Args:
+        title: Announcement title being looked up.
+        candidates: (filename, normalized title) pairs for the same stock and date.
+
+    Returns:
+        Filename of the best match, or None if no candidate qualifies.
+    """
+    normalized_title = normalize_title(title)
+    title_words = set(normalized_title.split())
+    best_match = None
+    best_score = 0.0
+    for filename, cached_title in candidates:
+        if normalized_title in cached_title or cached_title in normalized_title:
+            cached_words = set(cached_title.split())
+            if title_words and cached_words:
+                overlap = len(title_words & cached_words) / len(title_words | cached_words)
+                if overlap > best_score:
+                    best_score = overlap
+                    best_match = filename
+    return best_match
+
+
+class PDFCatalog:
+    """SQLite catalog of ``<cache_dir>/<stock_code>/<date>-<title>.pdf`` files.
+
+    Lookups by (stock_code, date, title) or news_id are index queries plus
+    one stat of the stock directory instead of a directory glob. A stock
+    directory is (re)scanned only when its mtime differs from the one seen
+    at the last scan, which also picks up files written by other processes
+    or older versions. Storage errors are swallowed; callers then treat the
+    lookup as a miss.
+    """
+
+    def __init__(self, cache_dir: str | Path):
+        """Initialize PDF catalog.
+
+        Args:
+            cache_dir: PDF cache directory; must already exist. The catalog
+                lives in ``<cache_dir>/.catalog.sqlite``.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.path = self.cache_dir / CATALOG_FILENAME
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection, creating the schema on first use."""
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    with closing(sqlite3.connect(self.path, timeout=5)) as conn:
+                        conn.execute("PRAGMA journal_mode=WAL")
+                        conn.executescript(_SCHEMA)
+                    self._initialized = True
+        return sqlite3.connect(self.path, timeout=5)
+
+    def _sync_stock_dir(self, conn: sqlite3.Connection, stock_code: str) -> None:
+        """Rescan a stock directory if it changed since the last scan."""
+        stock_dir = self.cache_dir / stock_code
+        try:
+            mtime_ns = stock_dir.stat().st_mtime_ns
+        except OSError:
+            mtime_ns = None
+
+        row = conn.execute("SELECT mtime_ns FROM stock_dirs WHERE stock_code = ?", (stock_code,)).fetchone()
+        if row is not None and row[0] == mtime_ns:
+            return
+
+        with conn:
+            if mtime_ns is None:
+                conn.execute("DELETE FROM pdfs WHERE stock_code = ?", (stock_code,))
+                conn.execute("DELETE FROM stock_dirs WHERE stock_code = ?", (stock_code,))
+                return
+
+            on_disk = {p.name for p in stock_dir.glob("*.pdf")}
+            known = {r[0] for r in conn.execute("SELECT filename FROM pdfs WHERE stock_code = ?", (stock_code,))}
+            conn.executemany(
+                "DELETE FROM pdfs WHERE stock_code = ? AND filename = ?",
+                [(stock_code, name) for name in known - on_disk],
+            )
+            now = time.time()
+            conn.executemany(
+                "INSERT OR IGNORE INTO pdfs (stock_code, filename, date, title_key, added_at) VALUES (?, ?, ?, ?, ?)",
+                [(stock_code, name, *_split_filename(name), now) for name in on_disk - known],
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO stock_dirs (stock_code, mtime_ns) VALUES (?, ?)",
+                (stock_code, mtime_ns),
+            )
+
+    def _find(
+        self,
+        conn: sqlite3.Connection,
+        stock_code: str,
+        date: str,
+        filename: str | None,
+        title: str,
+        news_id: str | None,
+    ) -> str | None:
+        """Resolve a lookup to a catalogued filename (without checking the disk)."""
+        if news_id:
+            row = conn.execute(
+                "SELECT filename FROM pdfs WHERE stock_code = ? AND news_id = ?",
+                (stock_code, str(news_id)),
+            ).fetchone()
+            if row:
+                return row[0]
+
+        if filename:
+            row = conn.execute(
+                "SELECT filename FROM pdfs WHERE stock_code = ? AND filename = ?",
+                (stock_code, filename),
+            ).fetchone()
+            if row:
+                return row[0]
+
+        candidates = conn.execute(
+            "SELECT filename, title_key FROM pdfs WHERE stock_code = ? AND date = ? ORDER BY filename",
+            (stock_code, date),
+        ).fetchall()
+        if not candidates:
+            return None
+        if len(candidates) == 1:
+            return candidates[0][0]
+        if title and (match := best_title_match(title, candidates)):
+            return match
+        # Fallback: return the first file of that date (better than downloading again)
+        return candidates[0][0]
+
+    def lookup(
+        self,
+        stock_code: str,
+        date: str,
+        title: str,
+        filename: str | None = None,
+        news_id: str | None = None,
+    ) -> Path | None:
+        """Find a cached PDF.
+
+        Matching order: news_id, exact filename, the only file of that date,
+        best title overlap among files of that date, first file of that date.
+
+        Args:
+            stock_code: Stock code (e.g., "00673").
+            date: Date string in YYYY-MM-DD format.
+            title: Announcement title.
+            filename: Expected sanitized filename (optional).
+            news_id: HKEX news ID (optional).
+
+        Returns:
+            Path of the cached PDF, or None.
+        """
+        try:
+            with closing(self._connect()) as conn:
+                self._sync_stock_dir(conn, stock_code)
+                found = self._find(conn, stock_code, date, filename, title, news_id)
+                if found is None:
+                    return None
+                path = self.cache_dir / stock_code / found
+                if path.exists():
+                    return path
+                # Deleted behind our back: drop the row and try again once
+                with conn:
+                    conn.execute("DELETE FROM stock_dirs WHERE stock_code = ?", (stock_code,))
+                self._sync_stock_dir(conn, stock_code)
+                found = self._find(conn, stock_code, date, filename, title, news_id)
+        except sqlite3.Error:
+            return None
+        return self.cache_dir / stock_code / found if found else None
+
+    def add(
+        self,
+        stock_code: str,
+        filename: str,
+        news_id: str | None = None,
+        url: str | None = None,
+        size: int | None = None,
+        sha256: str | None = None,
+    ) -> None:
+        """Record a PDF that was just written into the cache.
+
+        Args:
+            stock_code: Stock code (directory name).
+            filename: PDF filename within the stock directory.
+            news_id: HKEX news ID (optional).
+            url: Source URL (optional).
+            size: File size in bytes (optional).
+            sha256: Content hash of the blob backing the file (optional).
+        """
+        date, title_key = _split_filename(filename)
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO pdfs"
+                    " (stock_code, filename, date, title_key, news_id, url, size, added_at, sha256)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        stock_code,
+                        filename,
+                        date,
+                        title_key,
+                        str(news_id) if news_id is not None else None,
+                        url,
+                        size,
+                        time.time(),
+                        sha256,
+                    ),
+                )
+        except sqlite3.Error:
+            pass
+
+    def sha256_for(self, stock_code: str, filename: str) -> str | None:
+        """Content hash recorded for a cached PDF, if any."""
+        try:
+            with closing(self._connect()) as conn:
+                row = conn.execute(
+                    "SELECT sha256 FROM pdfs WHERE stock_code = ? AND filename = ?",
+                    (stock_code, filename),
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        return row[0] if row else None
+
+    def sha256_for_news_id(self, news_id: str) -> str | None:
+        """Content hash of an announcement already cached under any stock code."""
+        try:
+            with closing(self._connect()) as conn:
+                row = conn.execute(
+                    "SELECT sha256 FROM pdfs WHERE news_id = ? AND sha256 IS NOT NULL LIMIT 1",
+                    (str(news_id),),
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        return row[0] if row else None
+
+    def remove(self, paths: list[Path]) -> None:
+        """Forget deleted PDFs.
+
+        Args:
+            paths: PDF paths inside the cache directory.
+        """
+        rows = [(p.parent.name, p.name) for p in paths]
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.executemany("DELETE FROM pdfs WHERE stock_code = ? AND filename = ?", rows)
+        except sqlite3.Error:
+            pass
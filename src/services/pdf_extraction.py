@@ -0,0 +1,545 @@
+"""Page-parallel PDF text extraction over a process pool."""
+
+import multiprocessing
+import os
+import threading
+from collections import Counter
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from operator import itemgetter
+from typing import Any
+
+import numpy as np
+import pdfplumber
+import pypdfium2
+
+# Pages whose largest font exceeds this size are reported as section starts
+HEADING_FONT_SIZE = 12
+# Heading detection: lines at least this much larger than the body text size
+# (the document's median character size)
+HEADING_SIZE_RATIO = 1.15
+MAX_HEADING_CHARS = 150
+MAX_HEADING_LEVELS = 3
+# Characters whose tops differ by less than this (in points) share a line
+LINE_TOLERANCE = 3.0
+# Stored with persisted analyses; bump ANALYSIS_FORMAT when PDFAnalysis or the
+# extraction logic changes so stale caches are re-parsed
+ANALYSIS_FORMAT = 4
+EXTRACTOR_VERSION = f"{ANALYSIS_FORMAT}/pdfplumber-{pdfplumber.__version__}/pdfium-{pypdfium2.PYPDFIUM_INFO}"
+
+# Text layer backends. pdfium (C++, via pypdfium2) reads the text layer about
+# two orders of magnitude faster than pdfplumber, which rebuilds the
+# character-level layout in pure Python. Tables and font statistics always
+# come from pdfplumber.
+TEXT_BACKENDS = ("pdfium", "pdfplumber")
+
+# PDFium is not thread-safe; calls from threads of one process are serialized
+_pdfium_lock = threading.Lock()
+
+
+@dataclass
+class ExtractionConfig:
+    """Settings for page-parallel extraction.
+
+    Environment variables:
+        HKEX_PDF_WORKERS: Worker processes, 1 disables the pool (default: CPU count, max 8)
+        HKEX_PDF_PAGES_PER_CHUNK: Pages handed to a worker at a time (default: 16)
+        HKEX_PDF_PARALLEL_MIN_PAGES: Smaller PDFs are extracted in-process (default: 48)
+        HKEX_PDF_TEXT_BACKEND: Text layer backend, "pdfium" or "pdfplumber" (default: pdfium)
+    """
+
+    workers: int = min(os.cpu_count() or 1, 8)
+    pages_per_chunk: int = 16
+    parallel_min_pages: int = 48
+    text_backend: str = "pdfium"
+
+    def __post_init__(self) -> None:
+        if self.text_backend not in TEXT_BACKENDS:
+            raise ValueError(f"Unknown PDF text backend {self.text_backend!r}; expected one of {TEXT_BACKENDS}")
+
+    @classmethod
+    def from_env(cls) -> "ExtractionConfig":
+        """Build an extraction configuration from environment variables."""
+        config = cls()
+        if value := os.getenv("HKEX_PDF_WORKERS"):
+            config.workers = max(int(value), 1)
+        if value := os.getenv("HKEX_PDF_PAGES_PER_CHUNK"):
+            config.pages_per_chunk = max(int(value), 1)
+        if value := os.getenv("HKEX_PDF_PARALLEL_MIN_PAGES"):
+            config.parallel_min_pages = int(value)
+        if value := os.getenv("HKEX_PDF_TEXT_BACKEND"):
+            config = cls(config.workers, config.pages_per_chunk, config.parallel_min_pages, value.strip().lower())
+        return config
+
+
+def _iter_pdfium_texts(pdf_path: str, start: int, end: int | None) -> Iterator[str]:
+    """Yield page texts read by PDFium, normalized to pdfplumber's line endings."""
+    with _pdfium_lock:
+        pdf = pypdfium2.PdfDocument(pdf_path)
+    try:
+        stop = len(pdf) if end is None else min(end, len(pdf))
+        for index in range(start, stop):
+            with _pdfium_lock:
+                page = pdf[index]
+                textpage = page.get_textpage()
+                text = textpage.get_text_bounded()
+                textpage.close()
+                page.close()
+            yield text.replace("\r\n", "\n").replace("\r", "\n").rstrip()
+    finally:
+        with _pdfium_lock:
+            pdf.close()
+
+
+def iter_page_texts(
+    pdf_path: str,
+    start: int = 0,
+    end: int | None = None,
+    backend: str = "pdfplumber",
+) -> Iterator[str]:
+    """Lazily extract the text of pages ``[start, end)``.
+
+    Args:
+        pdf_path: Path to PDF file.
+        start: First page index (0-based).
+        end: Page index to stop before (default: last page).
+        backend: One of TEXT_BACKENDS.
+
+    Yields:
+        One string per page ("" for pages without text).
+    """
+    if backend == "pdfium":
+        yield from _iter_pdfium_texts(pdf_path, start, end)
+        return
+
+    with pdfplumber.open(pdf_path) as pdf:
+        for page in pdf.pages[start:end]:
+            yield page.extract_text() or ""
+            # Drop the parsed layout so memory stays flat on long documents
+            page.close()
+
+
+def extract_page_texts(
+    pdf_path: str,
+    start: int = 0,
+    end: int | None = None,
+    backend: str = "pdfplumber",
+) -> list[str]:
+    """Extract the text of pages ``[start, end)`` with a private document handle.
+
+    Runs inside worker processes, so it must stay a picklable module-level
+    function.
+
+    Args:
+        pdf_path: Path to PDF file.
+        start: First page index (0-based).
+        end: Page index to stop before (default: last page).
+        backend: One of TEXT_BACKENDS.
+
+    Returns:
+        One string per page ("" for pages without text).
+    """
+    return list(iter_page_texts(pdf_path, start, end, backend))
+
+
+def is_table_candidate(page: Any) -> bool:
+    """Cheap check whether a pdfplumber page can contain a table.
+
+    pdfplumber's default table finder builds cells from ruling lines (from
+    lines, rect borders and curves), so a table needs at least two
+    horizontal and two vertical edges. Pages without them, i.e. most prose
+    pages, cannot yield a table and skip the expensive extract_tables().
+    """
+    return len(page.horizontal_edges) >= 2 and len(page.vertical_edges) >= 2
+
+
+_SIZE_FIELD = itemgetter("size")
+_X0_FIELD = itemgetter("x0")
+
+
+def _line_bounds(chars: list[dict[str, Any]], i: int) -> tuple[int, int]:
+    """[start, end) of the run of characters around chars[i] on the same line.
+
+    Characters of a line are consecutive in content order; the run ends
+    where the top jumps by more than LINE_TOLERANCE.
+    """
+    start = i
+    while start > 0 and abs(chars[start - 1]["top"] - chars[start]["top"]) <= LINE_TOLERANCE:
+        start -= 1
+    end = i + 1
+    while end < len(chars) and abs(chars[end]["top"] - chars[end - 1]["top"]) <= LINE_TOLERANCE:
+        end += 1
+    return start, end
+
+
+def _line_text(line_chars: list[dict[str, Any]]) -> str:
+    line_chars = sorted(line_chars, key=_X0_FIELD)
+    # Insert spaces where PDFs position words instead of encoding spaces
+    text = line_chars[0]["text"]
+    for prev, char in zip(line_chars, line_chars[1:]):
+        if char["x0"] - prev["x1"] > char["size"] * 0.25 and not text.endswith(" "):
+            text += " "
+        text += char["text"]
+    return " ".join(text.split())
+
+
+def font_profile(chars: list[dict[str, Any]]) -> dict[str, Any]:
+    """Font statistics and heading-candidate lines of one page.
+
+    Reading the character dicts is most of the cost, so each character is
+    read once, for its size only (fetched in C by itemgetter); counting
+    happens in NumPy. Only the few characters larger than the page's most
+    common size are looked at again, to read the lines they sit on.
+
+    Args:
+        chars: pdfplumber ``page.chars``.
+
+    Returns:
+        Dictionary with "max_font_size", "size_counts" (``[size, count]``
+        pairs, sizes rounded to 0.1pt) and "lines": lines larger than the
+        page's most common size, top to bottom, as dicts with "size" and
+        "text".
+    """
+    size = np.round(np.array(list(map(_SIZE_FIELD, chars)), dtype=float), 1)
+    sizes, counts = np.unique(size[size > 0], return_counts=True)
+    if not sizes.size:
+        return {"max_font_size": 0, "size_counts": [], "lines": []}
+    body_size = sizes[np.argmax(counts)]
+
+    lines = []
+    line_end = 0
+    for i in np.flatnonzero(size > body_size).tolist():
+        if i < line_end:
+            continue
+        start, line_end = _line_bounds(chars, i)
+        if line_end - start > MAX_HEADING_CHARS:
+            continue
+        text = _line_text(chars[start:line_end])
+        if text:
+            lines.append((chars[start]["top"], {"size": float(size[start:line_end].max()), "text": text}))
+    lines.sort(key=itemgetter(0))
+
+    return {
+        "max_font_size": float(sizes[-1]),
+        "size_counts": [[float(s), int(c)] for s, c in zip(sizes, counts, strict=True)],
+        "lines": [line for _, line in lines],
+    }
+
+
+def _analyze_page(page: Any, include_tables: bool = True, text: str | None = None) -> dict[str, Any]:
+    """Text, non-empty tables and font profile of one pdfplumber page.
+
+    ``text`` is used instead of pdfplumber's text when given (e.g. from PDFium).
+    """
+    candidate = include_tables and is_table_candidate(page)
+    profile = font_profile(page.chars)
+    return {
+        "text": (page.extract_text() or "") if text is None else text,
+        "tables": [table for table in page.extract_tables() if table] if candidate else [],
+        "table_candidate": candidate,
+        "max_font_size": profile["max_font_size"],
+        "size_counts": profile["size_counts"],
+        "heading_lines": profile["lines"],
+    }
+
+
+def iter_page_analyses(
+    pdf_path: str,
+    start: int = 0,
+    end: int | None = None,
+    include_tables: bool = True,
+    text_backend: str = "pdfplumber",
+) -> Iterator[dict[str, Any]]:
+    """Lazily analyze pages ``[start, end)``, one page per iteration.
+
+    Pages after the point where the caller stops iterating are never parsed.
+
+    Args:
+        pdf_path: Path to PDF file.
+        start: First page index (0-based).
+        end: Page index to stop before (default: last page).
+        include_tables: Extract tables too; skipping them is much cheaper.
+        text_backend: Backend for page text; tables and fonts always use pdfplumber.
+
+    Yields:
+        Dicts as returned by analyze_page_range().
+    """
+    texts = iter_page_texts(pdf_path, start, end, text_backend) if text_backend != "pdfplumber" else None
+    try:
+        with pdfplumber.open(pdf_path) as pdf:
+            for page in pdf.pages[start:end]:
+                yield _analyze_page(page, include_tables, next(texts) if texts is not None else None)
+                page.close()
+    finally:
+        if texts is not None:
+            texts.close()
+
+
+def analyze_page_range(
+    pdf_path: str,
+    start: int = 0,
+    end: int | None = None,
+    text_backend: str = "pdfplumber",
+) -> list[dict[str, Any]]:
+    """Extract text, tables and the largest font size of pages ``[start, end)``.
+
+    One pass over the pages serves every consumer of a PDF, so the layout of
+    each page is parsed once. Runs inside worker processes, so it must stay
+    a picklable module-level function.
+
+    Args:
+        pdf_path: Path to PDF file.
+        start: First page index (0-based).
+        end: Page index to stop before (default: last page).
+        text_backend: Backend for page text; tables and fonts always use pdfplumber.
+
+    Returns:
+        One dict per page with "text", "tables" (non-empty tables as lists of
+        rows), "table_candidate" (whether tables were looked for, see
+        is_table_candidate()), "max_font_size" (0 for pages without
+        characters), "size_counts" and "heading_lines" (see font_profile()).
+    """
+    return list(iter_page_analyses(pdf_path, start, end, text_backend=text_backend))
+
+
+def page_count(pdf_path: str) -> int:
+    """Number of pages in a PDF."""
+    with _pdfium_lock:
+        pdf = pypdfium2.PdfDocument(pdf_path)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+
+_executor: ProcessPoolExecutor | None = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+
+def _get_executor(workers: int) -> ProcessPoolExecutor:
+    """Process pool shared by all extractions, created on first use.
+
+    Workers are spawned rather than forked: the parent holds HTTP pools and
+    threads that must not be duplicated into children.
+    """
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _executor_workers = workers
+        return _executor
+
+
+def _discard_executor(executor: Executor) -> None:
+    """Drop a broken pool so the next call starts a fresh one."""
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _map_page_ranges(
+    func: Callable[[str, int, int | None], list],
+    pdf_path: str,
+    config: ExtractionConfig,
+    num_pages: int | None,
+) -> list:
+    """Run a per-page-range function over a whole PDF, in the pool if worthwhile.
+
+    Small documents, or a single-worker configuration, are processed
+    in-process. If the pool breaks (e.g. a worker is killed), processing
+    falls back to in-process.
+    """
+    if num_pages is None:
+        num_pages = page_count(pdf_path)
+
+    chunk = config.pages_per_chunk
+    ranges = [(start, min(start + chunk, num_pages)) for start in range(0, num_pages, chunk)]
+    if config.workers <= 1 or len(ranges) <= 1 or num_pages < config.parallel_min_pages:
+        return func(pdf_path)
+
+    executor = _get_executor(config.workers)
+    try:
+        futures = [executor.submit(func, pdf_path, start, end) for start, end in ranges]
+        results = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+    except BrokenProcessPool:
+        _discard_executor(executor)
+        return func(pdf_path)
+
+
+def extract_texts_parallel(
+    pdf_path: str,
+    config: ExtractionConfig | None = None,
+    num_pages: int | None = None,
+) -> list[str]:
+    """Extract per-page text, splitting page ranges across worker processes.
+
+    Args:
+        pdf_path: Path to PDF file.
+        config: Extraction settings (default: read from environment).
+        num_pages: Page count if already known (optional).
+
+    Returns:
+        One string per page, in page order.
+    """
+    config = config or ExtractionConfig.from_env()
+    return _map_page_ranges(partial(extract_page_texts, backend=config.text_backend), pdf_path, config, num_pages)
+
+
+@dataclass
+class PDFAnalysis:
+    """Everything the PDF tools need from one parse of a document."""
+
+    num_pages: int
+    page_texts: list[str] = field(default_factory=list)
+    tables: list[dict[str, Any]] = field(default_factory=list)
+    page_font_sizes: list[float] = field(default_factory=list)
+    table_candidate_pages: list[int] = field(default_factory=list)
+    # [size, character count] over the whole document, ascending by size
+    font_size_counts: list[list[float]] = field(default_factory=list)
+    # Lines larger than their page's body text, with "page"
+    heading_lines: list[dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        """Text of all pages, blank pages skipped."""
+        return "\n\n".join(text for text in self.page_texts if text)
+
+    @property
+    def has_tables(self) -> bool:
+        """Whether any page contains a table."""
+        return bool(self.tables)
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-serializable form, for the persistent extraction cache."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "PDFAnalysis":
+        """Rebuild an analysis from to_dict() output."""
+        return cls(**data)
+
+    def table_detection(self) -> dict[str, Any]:
+        """How well the table pre-pass picked pages.
+
+        Returns:
+            Dictionary with pages_scanned, candidate_pages (pages that ran
+            table extraction), pages_with_tables and hit_rate (share of
+            candidate pages that had a table).
+        """
+        pages_with_tables = len({t["page"] for t in self.tables})
+        candidates = len(self.table_candidate_pages)
+        return {
+            "pages_scanned": self.num_pages,
+            "candidate_pages": candidates,
+            "pages_with_tables": pages_with_tables,
+            "hit_rate": round(pages_with_tables / candidates, 3) if candidates else None,
+        }
+
+    def font_size_percentiles(self) -> dict[str, float]:
+        """Character-weighted font size percentiles (p50 is the body text size)."""
+        if not self.font_size_counts:
+            return {}
+        sizes, counts = np.array(self.font_size_counts).T
+        cumulative = np.cumsum(counts)
+        return {
+            f"p{q}": float(sizes[np.searchsorted(cumulative, cumulative[-1] * q / 100)])
+            for q in (50, 75, 90, 95, 99)
+        }
+
+    def headings(self) -> list[dict[str, Any]]:
+        """Heading candidates with text, page and level.
+
+        A line is a heading if its size is at least HEADING_SIZE_RATIO times
+        the body size (the document's median character size). Levels follow
+        distinct heading sizes, largest first (at most MAX_HEADING_LEVELS).
+        Lines repeated on more than half of the pages (running headers) are
+        dropped.
+
+        Returns:
+            Headings in document order, each with page, level, size and text.
+        """
+        percentiles = self.font_size_percentiles()
+        if not percentiles:
+            return []
+        body_size = percentiles["p50"]
+        threshold = body_size * HEADING_SIZE_RATIO
+        repeats = Counter(line["text"] for line in self.heading_lines)
+        max_repeats = max(self.num_pages // 2, 1)
+
+        candidates = [
+            line
+            for line in self.heading_lines
+            if line["size"] >= threshold
+            and repeats[line["text"]] <= max_repeats
+            and any(ch.isalpha() for ch in line["text"])
+        ]
+        heading_sizes = sorted({line["size"] for line in candidates}, reverse=True)
+        levels = {size: min(i + 1, MAX_HEADING_LEVELS) for i, size in enumerate(heading_sizes)}
+        return [
+            {
+                "page": line["page"],
+                "level": levels[line["size"]],
+                "size": line["size"],
+                "text": line["text"],
+            }
+            for line in candidates
+        ]
+
+    def estimated_sections(self) -> list[dict[str, Any]]:
+        """Pages whose largest font suggests a heading, with that font size."""
+        return [
+            {"page": page_num, "max_font_size": size}
+            for page_num, size in enumerate(self.page_font_sizes, 1)
+            if size > HEADING_FONT_SIZE
+        ]
+
+
+def analyze_pdf(
+    pdf_path: str,
+    config: ExtractionConfig | None = None,
+    num_pages: int | None = None,
+) -> PDFAnalysis:
+    """Extract text, tables and heading statistics in a single pass.
+
+    Page ranges are spread over the process pool like extract_texts_parallel().
+    Page text comes from the configured text backend, so it matches the
+    text-only paths.
+
+    Args:
+        pdf_path: Path to PDF file.
+        config: Extraction settings (default: read from environment).
+        num_pages: Page count if already known (optional).
+
+    Returns:
+        Combined analysis of the document.
+    """
+    config = config or ExtractionConfig.from_env()
+    func = partial(analyze_page_range, text_backend=config.text_backend)
+    pages = _map_page_ranges(func, pdf_path, config, num_pages)
+    analysis = PDFAnalysis(num_pages=len(pages))
+    size_counts: Counter[float] = Counter()
+    for page_num, page in enumerate(pages, 1):
+        analysis.page_texts.append(page["text"])
+        analysis.tables.extend({"page": page_num, "table": table} for table in page["tables"])
+        analysis.page_font_sizes.append(page["max_font_size"])
+        if page["table_candidate"]:
+            analysis.table_candidate_pages.append(page_num)
+        analysis.heading_lines.extend({"page": page_num, **line} for line in page["heading_lines"])
+        for size, count in page["size_counts"]:
+            size_counts[size] += count
+    analysis.font_size_counts = [[size, count] for size, count in sorted(size_counts.items())]
+    return analysis
@@ -1,20 +1,53 @@
 """PDF parsing service with caching support."""
 
+import json
 import logging
 import os
 import re
 import ssl
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any
+from urllib.parse import urlsplit
 
 import httpx
-import pdfplumber
+
+from src.services.blob_store import BLOB_DIRNAME, PDFBlobStore, file_sha256
+from src.services.http_client import HTTPPoolConfig, create_http_client
+from src.services.pdf_catalog import CATALOG_FILENAME, PDFCatalog
+from src.services.pdf_extraction import (
+    EXTRACTOR_VERSION,
+    ExtractionConfig,
+    PDFAnalysis,
+    analyze_pdf,
+    extract_texts_parallel,
+    iter_page_analyses,
+    iter_page_texts,
+    page_count,
+)
+from src.services.rate_limit import RateLimiter
+from src.services.table_store import query_tables, read_index, write_tables
 
 # Suppress pdfminer warnings about color spaces
 # These warnings are common in HKEX PDFs but don't affect text/table extraction
 logging.getLogger("pdfminer").setLevel(logging.ERROR)
 
+# Parallel downloads per batch, and simultaneous downloads per host
+DEFAULT_DOWNLOAD_WORKERS = 8
+DEFAULT_PER_HOST_LIMIT = 4
+# Times an interrupted download is resumed with a Range request in one call
+MAX_RESUME_ATTEMPTS = 3
+# Parsed documents kept in memory so text, tables and structure share one parse
+ANALYSIS_CACHE_SIZE = 8
+
+_FILE_INFO_UNITS = {"B": 1, "KB": 1024, "MB": 1024**2, "GB": 1024**3}
+_CONTENT_RANGE_PATTERN = re.compile(r"bytes (\d+)-\d+/(\d+|\*)")
+
 
 def sanitize_filename(filename: str, max_length: int = 200) -> str:
     """Sanitize filename by removing special characters.
@@ -42,6 +75,35 @@ def sanitize_filename(filename: str, max_length: int = 200) -> str:
     return filename
 
 
+def parse_file_info_size(file_info: str | int | None) -> tuple[int, int] | None:
+    """Parse an announcement FILE_INFO value into an approximate byte size.
+
+    Args:
+        file_info: FILE_INFO string (e.g., "523KB", "1.2MB") or an exact byte count.
+
+    Returns:
+        Tuple of (size in bytes, tolerance in bytes), or None if unparseable.
+        FILE_INFO is rounded, so the tolerance is one unit of its last digit.
+    """
+    if isinstance(file_info, int):
+        return file_info, 0
+    if not file_info:
+        return None
+
+    match = re.fullmatch(r"\s*([\d.]+)\s*([KMG]?B)\s*", file_info.upper())
+    if not match:
+        return None
+    number, unit = match.groups()
+    try:
+        value = float(number)
+    except ValueError:
+        return None
+
+    decimals = len(number.partition(".")[2])
+    scale = _FILE_INFO_UNITS[unit]
+    return int(value * scale), int(scale / 10**decimals)
+
+
 def format_date_for_filename(date_time_str: str) -> str:
     """Format date string for filename.
 
@@ -76,29 +138,102 @@ class PDFParserService:
         ),
     }
 
-    def __init__(self, timeout: int = 60):
+    def __init__(
+        self,
+        timeout: int = 60,
+        client: httpx.Client | None = None,
+        pool_config: HTTPPoolConfig | None = None,
+        rate_limiter: RateLimiter | None = None,
+        per_host_limit: int | None = None,
+        extraction_config: ExtractionConfig | None = None,
+    ):
         """Initialize PDF parser service.
 
         Args:
             timeout: Request timeout in seconds.
+            client: Shared HTTP client to reuse (optional), e.g.
+                ``HKEXAPIService.client`` so PDF downloads share its pool.
+            pool_config: Pool limits / HTTP/2 settings for an owned client
+                (default: read from environment).
+            rate_limiter: Rate limiter shared with the HKEX API service
+                (optional). Downloads are throttled and transient failures retried.
+            per_host_limit: Simultaneous downloads per host across all callers
+                (default: 4, or HKEX_PDF_PER_HOST_LIMIT).
+            extraction_config: Worker count / pages per chunk for parallel
+                text extraction (default: read from environment).
         """
         self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        if per_host_limit is None:
+            per_host_limit = int(os.getenv("HKEX_PDF_PER_HOST_LIMIT", str(DEFAULT_PER_HOST_LIMIT)))
+        self.per_host_limit = max(per_host_limit, 1)
+        self.extraction_config = extraction_config or ExtractionConfig.from_env()
+        self._host_slots: dict[str, threading.BoundedSemaphore] = {}
+        self._host_slots_lock = threading.Lock()
+        self._catalogs: dict[Path, PDFCatalog] = {}
+        self._catalogs_lock = threading.Lock()
+        self._analyses: OrderedDict[tuple[str, int, int], PDFAnalysis] = OrderedDict()
+        self._analyses_lock = threading.Lock()
         # Create SSL context that doesn't verify certificates
         self.ssl_context = ssl.create_default_context()
         self.ssl_context.check_hostname = False
         self.ssl_context.verify_mode = ssl.CERT_NONE
         self.ssl_context.minimum_version = ssl.TLSVersion.TLSv1_2
 
+        self._owns_client = client is None
+        self.client = client or create_http_client(self.DEFAULT_HEADERS, timeout, pool_config)
+
+    def close(self) -> None:
+        """Close the connection pool if this service owns it."""
+        if self._owns_client:
+            self.client.close()
+
+    def __enter__(self) -> "PDFParserService":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        """Semaphore bounding simultaneous downloads from the URL's host."""
+        host = urlsplit(url).netloc
+        with self._host_slots_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+        return slot
+
+    def _catalog(self, cache_dir: str) -> PDFCatalog | None:
+        """Catalog for a cache directory, or None if the directory does not exist."""
+        root = Path(cache_dir)
+        if not root.is_dir():
+            return None
+        key = root.resolve()
+        with self._catalogs_lock:
+            catalog = self._catalogs.get(key)
+            if catalog is None:
+                catalog = self._catalogs[key] = PDFCatalog(root)
+        return catalog
+
     def get_cached_pdf_path(
-        self, stock_code: str, date: str, title: str, cache_dir: str
+        self,
+        stock_code: str,
+        date: str,
+        title: str,
+        cache_dir: str,
+        news_id: str | None = None,
     ) -> str | None:
         """Get cached PDF path if it exists.
 
+        Answered from the cache directory's catalog (see PDFCatalog) rather
+        than by globbing the stock directory.
+
         Args:
             stock_code: Stock code (e.g., "00673").
             date: Date string in YYYY-MM-DD format.
             title: Announcement title.
             cache_dir: Cache directory path.
+            news_id: HKEX news ID, matched first when known (optional).
 
         Returns:
             Full path to cached PDF if exists, None otherwise.
@@ -106,57 +241,13 @@ class PDFParserService:
         if not date:
             return None
 
-        stock_dir = Path(cache_dir) / stock_code
-        if not stock_dir.exists():
+        catalog = self._catalog(cache_dir)
+        if catalog is None:
             return None
 
-        # First try exact match with generated filename
-        if title:
-            filename = sanitize_filename(f"{date}-{title}.pdf")
-            cache_path = stock_dir / filename
-            if cache_path.exists():
-                return str(cache_path)
-
-        # If exact match fails, check all PDFs in the directory
-        # Find all PDFs that start with the same date
-        date_prefix = f"{date}-"
-        matching_files = [f for f in stock_dir.glob("*.pdf") if f.name.startswith(date_prefix)]
-
-        if not matching_files:
-            return None
-
-        # If only one file matches the date, return it
-        if len(matching_files) == 1:
-            return str(matching_files[0])
-
-        # If multiple files match the date and we have a title, try to match by title
-        if title:
-            # Normalize title for comparison
-            normalized_title = re.sub(r'\s+', ' ', title.strip().lower())
-            best_match = None
-            best_score = 0
-
-            for cached_file in matching_files:
-                # Extract title from filename
-                cached_title = cached_file.stem[len(date_prefix):]
-                normalized_cached_title = re.sub(r'\s+', ' ', cached_title.strip().lower())
-
-                # Simple substring match - if normalized title is contained in cached title or vice versa
-                if normalized_title in normalized_cached_title or normalized_cached_title in normalized_title:
-                    # Calculate word overlap for better matching
-                    title_words = set(normalized_title.split())
-                    cached_words = set(normalized_cached_title.split())
-                    if title_words and cached_words:
-                        overlap = len(title_words & cached_words) / len(title_words | cached_words)
-                        if overlap > best_score:
-                            best_score = overlap
-                            best_match = cached_file
-
-            if best_match and best_score > 0:
-                return str(best_match)
-
-        # Fallback: return the first matching file (better than downloading again)
-        return str(matching_files[0])
+        filename = sanitize_filename(f"{date}-{title}.pdf") if title else None
+        path = catalog.lookup(stock_code, date, title, filename=filename, news_id=news_id)
+        return str(path) if path else None
 
     def download_pdf(
         self,
@@ -165,24 +256,30 @@ class PDFParserService:
         date: str,
         title: str,
         cache_dir: str,
+        expected_size: str | int | None = None,
+        news_id: str | None = None,
     ) -> str:
         """Download PDF and save to cache.
 
+        The body is streamed to a partial file, resumed with a Range request
+        if the connection drops, size-checked, then atomically renamed.
+
         Args:
             url: PDF URL (relative or absolute).
             stock_code: Stock code (e.g., "00673").
             date: Date string in YYYY-MM-DD format.
             title: Announcement title.
             cache_dir: Cache directory path.
+            expected_size: FILE_INFO value (e.g., "1.2MB") or exact byte count,
+                checked when the server sends no Content-Length (optional).
+            news_id: HKEX news ID, recorded in the cache catalog (optional).
 
         Returns:
             Full path to downloaded PDF.
-        """
-        # Check cache first
-        cached_path = self.get_cached_pdf_path(stock_code, date, title, cache_dir)
-        if cached_path:
-            return cached_path
 
+        Raises:
+            RuntimeError: If the download fails or does not pass verification.
+        """
         # Build full URL if relative
         if url.startswith("/"):
             full_url = self.BASE_URL + url
@@ -196,80 +293,368 @@ class PDFParserService:
         # Create directory if needed
         cache_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Double-check cache after directory creation (prevent race condition)
-        # Another process might have created the file between the first check and now
-        # Use fuzzy matching here too in case title formatting differs
-        cached_path_retry = self.get_cached_pdf_path(stock_code, date, title, cache_dir)
-        if cached_path_retry:
-            return cached_path_retry
+        # Check cache after directory creation, so a file another process
+        # finished in the meantime is found too
+        # Use fuzzy matching here in case title formatting differs
+        cached_path = self.get_cached_pdf_path(stock_code, date, title, cache_dir, news_id=news_id)
+        if cached_path:
+            return cached_path
+
+        catalog = self._catalog(cache_dir)
+        blobs = PDFBlobStore(cache_dir)
+
+        # Joint announcements share a news ID across stock codes: reuse the
+        # stored document instead of downloading another copy
+        if news_id and catalog is not None and (sha256 := catalog.sha256_for_news_id(news_id)):
+            blob = blobs.path_for(sha256)
+            if blob.exists():
+                blobs.link(blob, cache_path)
+                # Links share the inode, so this also keeps the blob from ageing out
+                os.utime(cache_path)
+                catalog.add(stock_code, filename, news_id=news_id, url=full_url, size=blob.stat().st_size, sha256=sha256)
+                return str(cache_path)
 
-        # Download PDF using temporary file, then atomically rename
+        # Stream the PDF into a partial file, then atomically rename
         # This prevents partial writes if another process reads the file during download
-        temp_file = None
+        part_file = cache_path.parent / f".{filename}.part"
         try:
-            # Create temporary file in the same directory for atomic rename
-            temp_file = cache_path.parent / f".{filename}.tmp"
-            
-            with httpx.Client(
-                headers=self.DEFAULT_HEADERS,
-                timeout=self.timeout,
-                verify=False,
-            ) as client:
-                response = client.get(full_url)
-                response.raise_for_status()
-
-                # Write to temporary file first
-                with open(temp_file, "wb") as f:
-                    f.write(response.content)
-
-            # Double-check cache one more time before atomic rename
+            total_size = None
+            for attempt in range(MAX_RESUME_ATTEMPTS + 1):
+                try:
+                    with self._host_slot(full_url):
+                        total_size = self._stream_to_file(full_url, part_file)
+                    break
+                except httpx.TransportError:
+                    # Connection dropped mid-body: resume from what is on disk
+                    if attempt == MAX_RESUME_ATTEMPTS:
+                        raise
+
+            self._verify_download(part_file, total_size, expected_size)
+
+            # Store the document once per content hash; identical PDFs filed
+            # under other stock codes end up sharing the same blob
+            sha256 = file_sha256(part_file)
+            blob = blobs.put(part_file, sha256)
+
+            # Double-check cache one more time before linking into place
             # Another process might have completed the download while we were downloading
             if cache_path.exists():
-                # Another process beat us to it, clean up temp file and return cached path
-                try:
-                    temp_file.unlink()
-                except Exception:
-                    pass  # Ignore cleanup errors
                 return str(cache_path)
 
-            # Atomically rename temp file to final location
-            temp_file.rename(cache_path)
+            # Atomically expose the blob at the per-stock location
+            blobs.link(blob, cache_path)
+
+            if catalog is not None:
+                catalog.add(
+                    stock_code,
+                    filename,
+                    news_id=news_id,
+                    url=full_url,
+                    size=blob.stat().st_size,
+                    sha256=sha256,
+                )
 
             return str(cache_path)
 
         except Exception as e:
-            # Clean up temp file on error
-            if temp_file and temp_file.exists():
+            # Keep partial data after network failures so the next call can
+            # resume it; anything else (bad status, size mismatch) starts over
+            if not isinstance(e, httpx.TransportError) and part_file.exists():
                 try:
-                    temp_file.unlink()
+                    part_file.unlink()
                 except Exception:
                     pass  # Ignore cleanup errors
-            
+
             # If file was created by another process during our download, return it
             if cache_path.exists():
                 return str(cache_path)
-            
+
             raise RuntimeError(f"Failed to download PDF from {full_url}: {e}") from e
 
+    def download_pdfs(
+        self,
+        items: list[dict[str, Any]],
+        cache_dir: str,
+        max_workers: int = DEFAULT_DOWNLOAD_WORKERS,
+    ) -> list[dict[str, Any]]:
+        """Download many PDFs concurrently over the shared connection pool.
+
+        Parallelism is bounded by ``max_workers`` and, per host, by
+        ``per_host_limit``. A failed item does not affect the others.
+
+        Args:
+            items: Dictionaries with the download_pdf() arguments ``url``,
+                ``stock_code``, ``date``, ``title`` and optionally
+                ``expected_size``; other keys (e.g. ``news_id``) are echoed back.
+            cache_dir: Cache directory path.
+            max_workers: Maximum parallel downloads (default: 8).
+
+        Returns:
+            One result per item, in input order, with success, path, cached
+            (cache hit), size (bytes), latency_ms and error on failure.
+        """
+
+        def fetch(item: dict[str, Any]) -> dict[str, Any]:
+            extra = {
+                k: v
+                for k, v in item.items()
+                if k not in ("url", "stock_code", "date", "title", "expected_size")
+            }
+            started = time.perf_counter()
+            result: dict[str, Any] = {**extra, "stock_code": item.get("stock_code")}
+            try:
+                cached_path = self.get_cached_pdf_path(
+                    item["stock_code"], item["date"], item["title"], cache_dir, news_id=item.get("news_id")
+                )
+                path = cached_path or self.download_pdf(
+                    url=item["url"],
+                    stock_code=item["stock_code"],
+                    date=item["date"],
+                    title=item["title"],
+                    cache_dir=cache_dir,
+                    expected_size=item.get("expected_size"),
+                    news_id=item.get("news_id"),
+                )
+                result.update(
+                    success=True,
+                    path=path,
+                    cached=cached_path is not None,
+                    size=Path(path).stat().st_size,
+                )
+            except Exception as e:
+                result.update(success=False, path=None, cached=False, size=None, error=str(e))
+            result["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            return result
+
+        if not items:
+            return []
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items)))) as pool:
+            return list(pool.map(fetch, items))
+
+    def _stream_to_file(self, full_url: str, part_file: Path) -> int | None:
+        """Stream a response body to disk, resuming an existing partial file.
+
+        Args:
+            full_url: Absolute PDF URL.
+            part_file: Partial download file; appended to when the server
+                honours the Range request, rewritten otherwise.
+
+        Returns:
+            Total size of the complete file as announced by the server, or
+            None if unknown (no Content-Length, or a compressed body).
+
+        Raises:
+            httpx.HTTPError: On transport errors or non-2xx status codes.
+        """
+        offset = part_file.stat().st_size if part_file.exists() else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else None
+
+        def send() -> httpx.Response:
+            request = self.client.build_request("GET", full_url, headers=headers, timeout=self.timeout)
+            return self.client.send(request, stream=True)
+
+        response = self.rate_limiter.request(send) if self.rate_limiter else send()
+        try:
+            if response.status_code == 416 and offset:
+                # Partial file no longer matches the resource: start over
+                part_file.unlink()
+                return self._stream_to_file(full_url, part_file)
+            response.raise_for_status()
+
+            total_size = None
+            match = _CONTENT_RANGE_PATTERN.match(response.headers.get("Content-Range", ""))
+            if response.status_code == 206 and match and int(match.group(1)) == offset:
+                mode = "ab"
+                if match.group(2) != "*":
+                    total_size = int(match.group(2))
+            else:
+                # Server ignored the Range header and sent the whole file
+                mode = "wb"
+                content_length = response.headers.get("Content-Length")
+                if content_length and "Content-Encoding" not in response.headers:
+                    total_size = int(content_length)
+
+            # Chunks are written as they arrive (no re-chunking buffer), so
+            # everything received before a connection drop can be resumed
+            with open(part_file, mode) as f:
+                for chunk in response.iter_bytes():
+                    f.write(chunk)
+
+            return total_size
+        finally:
+            response.close()
+
+    def _verify_download(
+        self,
+        part_file: Path,
+        total_size: int | None,
+        expected_size: str | int | None,
+    ) -> None:
+        """Check a finished download against the server size or FILE_INFO.
+
+        Raises:
+            ValueError: If the file is truncated, oversized or not a PDF.
+        """
+        actual_size = part_file.stat().st_size
+        if total_size is not None:
+            if actual_size != total_size:
+                raise ValueError(f"Incomplete download: got {actual_size} of {total_size} bytes")
+        elif (expected := parse_file_info_size(expected_size)) is not None:
+            size, tolerance = expected
+            if abs(actual_size - size) > tolerance:
+                raise ValueError(
+                    f"Downloaded size {actual_size} bytes does not match FILE_INFO {expected_size}"
+                )
+
+        # The PDF header may be preceded by junk, but must be in the first 1 KB
+        with open(part_file, "rb") as f:
+            if b"%PDF" not in f.read(1024):
+                raise ValueError("Downloaded file is not a PDF")
+
+    def analyze_pdf(self, pdf_path: str) -> PDFAnalysis:
+        """Parse a PDF once for text, tables and structure.
+
+        Results are kept in a small in-memory LRU keyed by path, mtime and
+        size, so extract_text(), extract_tables() and analyze_structure() on
+        the same file share one pass over its pages. Every analysis is also
+        persisted next to the PDF (see _get_cache_analysis_path), so a later
+        process pays a file read instead of a parse. Long documents are split
+        into page ranges processed by a process pool (see ExtractionConfig).
+
+        Args:
+            pdf_path: Path to PDF file.
+
+        Returns:
+            Combined analysis of the document.
+        """
+        analysis = self.cached_analysis(pdf_path)
+        if analysis is None:
+            source = self._content_source(pdf_path)
+            analysis = analyze_pdf(pdf_path, self.extraction_config)
+            self._store_analysis(
+                self._get_cache_analysis_path(source), self._analysis_cache_key(source), analysis
+            )
+            self._remember_analysis(pdf_path, analysis)
+        return analysis
+
+    def _memory_key(self, pdf_path: str) -> tuple[str, int, int]:
+        """In-memory cache key: resolved path, mtime and size."""
+        path = Path(pdf_path)
+        stat = path.stat()
+        return (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+    def _remember_analysis(self, pdf_path: str, analysis: PDFAnalysis) -> None:
+        """Add an analysis to the in-memory LRU."""
+        key = self._memory_key(pdf_path)
+        with self._analyses_lock:
+            self._analyses[key] = analysis
+            while len(self._analyses) > ANALYSIS_CACHE_SIZE:
+                self._analyses.popitem(last=False)
+
+    def cached_analysis(self, pdf_path: str) -> PDFAnalysis | None:
+        """Analysis from the in-memory or persistent cache, without parsing.
+
+        Args:
+            pdf_path: Path to PDF file.
+
+        Returns:
+            Cached analysis, or None if the PDF has not been analyzed yet.
+        """
+        key = self._memory_key(pdf_path)
+        with self._analyses_lock:
+            analysis = self._analyses.get(key)
+            if analysis is not None:
+                self._analyses.move_to_end(key)
+                return analysis
+
+        # Keyed by content hash when the PDF lives in the blob store
+        source = self._content_source(pdf_path)
+        analysis = self._load_analysis(self._get_cache_analysis_path(source), self._analysis_cache_key(source))
+        if analysis is not None:
+            self._remember_analysis(pdf_path, analysis)
+        return analysis
+
+    def iter_pages(
+        self,
+        pdf_path: str,
+        start: int = 1,
+        end: int | None = None,
+        include_tables: bool = True,
+    ) -> Iterator[dict[str, Any]]:
+        """Lazily yield pages of a PDF.
+
+        Served from a cached analysis when there is one. Otherwise only the
+        requested pages are parsed, one per iteration, so a caller that stops
+        early (e.g. once a preview is long enough) never parses the rest.
+        Without tables only the text backend runs, skipping pdfplumber.
+
+        Args:
+            pdf_path: Path to PDF file.
+            start: First page number (1-based).
+            end: Last page number, inclusive (default: last page).
+            include_tables: Extract tables too.
+
+        Yields:
+            Dicts with "page" (1-based number), "text" and "tables" (each a
+            list of rows; empty if include_tables is False).
+        """
+        first = max(start, 1)
+        analysis = self.cached_analysis(pdf_path)
+        backend = self.extraction_config.text_backend
+        if analysis is None and not include_tables:
+            page_texts = self._load_page_texts(pdf_path)
+            if page_texts is not None:
+                texts = iter(page_texts[first - 1 : end])
+            else:
+                texts = iter_page_texts(pdf_path, first - 1, end, backend)
+            for page_num, text in enumerate(texts, first):
+                yield {"page": page_num, "text": text, "tables": []}
+            return
+        if analysis is None:
+            pages = iter_page_analyses(pdf_path, first - 1, end, include_tables, backend)
+            for page_num, page in enumerate(pages, first):
+                yield {"page": page_num, "text": page["text"], "tables": page["tables"]}
+            return
+
+        last = analysis.num_pages if end is None else min(end, analysis.num_pages)
+        for page_num in range(first, last + 1):
+            tables = [t["table"] for t in analysis.tables if t["page"] == page_num] if include_tables else []
+            yield {"page": page_num, "text": analysis.page_texts[page_num - 1], "tables": tables}
+
+    def page_count(self, pdf_path: str) -> int:
+        """Number of pages in a PDF, from the cached analysis if available."""
+        analysis = self.cached_analysis(pdf_path)
+        return analysis.num_pages if analysis is not None else page_count(pdf_path)
+
     def extract_text(self, pdf_path: str) -> str:
         """Extract text from PDF.
 
+        Uses the cached analysis if there is one. Otherwise, with a fast
+        text backend (see ExtractionConfig.text_backend), only the text layer
+        is read and the pdfplumber pass is left to table/structure requests.
+        Text-only reads are persisted too (see _get_cache_page_texts_path).
+
         Args:
             pdf_path: Path to PDF file.
 
         Returns:
             Extracted text content.
         """
-        text_parts = []
-
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    text = page.extract_text()
-                    if text:
-                        text_parts.append(text)
-
-            return "\n\n".join(text_parts)
+            if self.extraction_config.text_backend == "pdfplumber":
+                return self.analyze_pdf(pdf_path).text
+
+            analysis = self.cached_analysis(pdf_path)
+            if analysis is not None:
+                return analysis.text
+            page_texts = self._load_page_texts(pdf_path)
+            if page_texts is None:
+                source = self._content_source(pdf_path)
+                page_texts = extract_texts_parallel(pdf_path, self.extraction_config)
+                self._store_cache_file(
+                    self._get_cache_page_texts_path(source), self._analysis_cache_key(source), "page_texts", page_texts
+                )
+            return "\n\n".join(text for text in page_texts if text)
 
         except Exception as e:
             raise RuntimeError(f"Failed to extract text from PDF: {e}") from e
@@ -277,32 +662,25 @@ class PDFParserService:
     def extract_tables(self, pdf_path: str) -> list[dict[str, Any]]:
         """Extract tables from PDF.
 
+        Only pages with ruling lines (see is_table_candidate) run pdfplumber's
+        table finder; prose pages are skipped.
+
         Args:
             pdf_path: Path to PDF file.
 
         Returns:
             List of tables, each as a list of rows.
         """
-        tables = []
-
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                for page_num, page in enumerate(pdf.pages, 1):
-                    page_tables = page.extract_tables()
-                    for table in page_tables:
-                        if table:
-                            tables.append(
-                                {
-                                    "page": page_num,
-                                    "table": table,
-                                }
-                            )
-
-            return tables
+            return self.analyze_pdf(pdf_path).tables
 
         except Exception as e:
             raise RuntimeError(f"Failed to extract tables from PDF: {e}") from e
 
+    def table_detection(self, pdf_path: str) -> dict[str, Any]:
+        """Table pre-pass statistics for a PDF (see PDFAnalysis.table_detection)."""
+        return self.analyze_pdf(pdf_path).table_detection()
+
     def analyze_structure(self, pdf_path: str) -> dict[str, Any]:
         """Analyze PDF structure (sections, headings, etc.).
 
@@ -312,49 +690,39 @@ class PDFParserService:
         Returns:
             Dictionary with structure information.
         """
-        structure = {
-            "num_pages": 0,
-            "has_tables": False,
-            "estimated_sections": [],
-        }
-
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                structure["num_pages"] = len(pdf.pages)
-
-                # Check for tables
-                for page in pdf.pages:
-                    tables = page.extract_tables()
-                    if tables:
-                        structure["has_tables"] = True
-                        break
-
-                # Try to identify sections by font size (heuristic)
-                for page_num, page in enumerate(pdf.pages, 1):
-                    chars = page.chars
-                    if chars:
-                        # Group by font size to identify potential headings
-                        font_sizes = {}
-                        for char in chars:
-                            size = char.get("size", 0)
-                            if size > 0:
-                                font_sizes[size] = font_sizes.get(size, 0) + 1
-
-                        # Large font sizes might indicate headings
-                        if font_sizes:
-                            max_size = max(font_sizes.keys())
-                            if max_size > 12:  # Threshold for headings
-                                structure["estimated_sections"].append(
-                                    {
-                                        "page": page_num,
-                                        "max_font_size": max_size,
-                                    }
-                                )
-
+            analysis = self.analyze_pdf(pdf_path)
         except Exception as e:
             raise RuntimeError(f"Failed to analyze PDF structure: {e}") from e
 
-        return structure
+        # Sections and headings are estimated from font sizes (heuristic)
+        return {
+            "num_pages": analysis.num_pages,
+            "has_tables": analysis.has_tables,
+            "estimated_sections": analysis.estimated_sections(),
+            "headings": analysis.headings(),
+            "font_size_percentiles": analysis.font_size_percentiles(),
+            "table_detection": analysis.table_detection(),
+        }
+
+    def _content_source(self, pdf_path: str) -> str:
+        """Path that extraction caches for a PDF are keyed by.
+
+        For catalogued, content-addressed PDFs this is the blob, so every
+        stock code sharing a document shares one set of extracted files.
+        Other PDFs key their caches by their own path.
+        """
+        pdf = Path(pdf_path)
+        cache_dir = pdf.parent.parent
+        if not (cache_dir / CATALOG_FILENAME).exists():
+            return pdf_path
+        catalog = self._catalog(str(cache_dir))
+        sha256 = catalog.sha256_for(pdf.parent.name, pdf.name) if catalog else None
+        if sha256:
+            blob = PDFBlobStore(cache_dir).path_for(sha256)
+            if blob.exists():
+                return str(blob)
+        return pdf_path
 
     def _get_cache_text_path(self, pdf_path: str) -> Path:
         """Get text cache path for a PDF file.
@@ -369,6 +737,8 @@ class PDFParserService:
     
     def _get_cache_tables_path(self, pdf_path: str) -> Path:
         """Get tables cache path for a PDF file.
+
+        Indented JSON written before the table store; only cleaned up now.
         
         Args:
             pdf_path: Path to PDF file.
@@ -379,6 +749,154 @@ class PDFParserService:
         pdf_stem = Path(pdf_path).stem
         return Path(pdf_path).parent / f"{pdf_stem}_tables.json"
     
+    def _get_cache_analysis_path(self, pdf_path: str) -> Path:
+        """Get persistent analysis cache path for a PDF file.
+
+        Args:
+            pdf_path: Path to PDF file.
+
+        Returns:
+            Path to analysis cache file (.analysis.json).
+        """
+        return Path(pdf_path).with_suffix(".analysis.json")
+
+    def _analysis_cache_key(self, source: str) -> dict[str, Any]:
+        """Identify the PDF content and extractor a cached analysis came from.
+
+        Blobs are named by their content hash, which stays valid when their
+        mtime is bumped; other PDFs are identified by mtime and size.
+        """
+        path = Path(source)
+        version = {"version": EXTRACTOR_VERSION, "text_backend": self.extraction_config.text_backend}
+        if path.parent.parent.name == BLOB_DIRNAME:
+            return {**version, "sha256": path.stem}
+        stat = path.stat()
+        return {**version, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+    def _get_cache_page_texts_path(self, pdf_path: str) -> Path:
+        """Get text-only extraction cache path for a PDF file.
+
+        Written by text reads that skip the full analysis; a full analysis
+        (see _get_cache_analysis_path) takes precedence.
+
+        Args:
+            pdf_path: Path to PDF file.
+
+        Returns:
+            Path to page texts cache file (.pages.json).
+        """
+        return Path(pdf_path).with_suffix(".pages.json")
+
+    def _load_cache_file(self, cache_path: Path, cache_key: dict[str, Any], field: str) -> Any:
+        """Read a persisted cache entry, or None if missing, stale or unreadable."""
+        try:
+            data = json.loads(cache_path.read_text(encoding="utf-8"))
+            if data.get("key") != cache_key:
+                return None
+            return data[field]
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+    def _store_cache_file(self, cache_path: Path, cache_key: dict[str, Any], field: str, value: Any) -> None:
+        """Persist a cache entry with an atomic rename; failures only cost a re-parse later."""
+        tmp_path = cache_path.with_name(f".{cache_path.name}.{os.getpid()}.tmp")
+        try:
+            tmp_path.write_text(json.dumps({"key": cache_key, field: value}, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+
+    def _load_analysis(self, cache_path: Path, cache_key: dict[str, Any]) -> PDFAnalysis | None:
+        """Read a persisted analysis, or None if missing, stale or unreadable."""
+        data = self._load_cache_file(cache_path, cache_key, "analysis")
+        try:
+            return PDFAnalysis.from_dict(data) if data is not None else None
+        except TypeError:
+            return None
+
+    def _store_analysis(self, cache_path: Path, cache_key: dict[str, Any], analysis: PDFAnalysis) -> None:
+        """Persist an analysis with an atomic rename; failures only cost a re-parse later."""
+        self._store_cache_file(cache_path, cache_key, "analysis", analysis.to_dict())
+
+    def _load_page_texts(self, pdf_path: str) -> list[str] | None:
+        """Page texts from the text-only extraction cache, without parsing."""
+        source = self._content_source(pdf_path)
+        page_texts = self._load_cache_file(
+            self._get_cache_page_texts_path(source), self._analysis_cache_key(source), "page_texts"
+        )
+        return page_texts if isinstance(page_texts, list) else None
+
+    def _table_store_key(self, source: str) -> dict[str, Any] | None:
+        """Source key for the table store, or None if the PDF cannot be stat'ed."""
+        try:
+            return self._analysis_cache_key(source)
+        except OSError:
+            return None
+
+    def _get_cache_table_rows_path(self, pdf_path: str) -> Path:
+        """Get table rows cache path for a PDF file.
+
+        Args:
+            pdf_path: Path to PDF file.
+
+        Returns:
+            Path to table rows file (_tables.jsonl), see table_store.
+        """
+        return Path(pdf_path).parent / f"{Path(pdf_path).stem}_tables.jsonl"
+
+    def _get_cache_table_index_path(self, pdf_path: str) -> Path:
+        """Get table index cache path for a PDF file.
+
+        Args:
+            pdf_path: Path to PDF file.
+
+        Returns:
+            Path to table index file (_tables.idx.json), see table_store.
+        """
+        return Path(pdf_path).parent / f"{Path(pdf_path).stem}_tables.idx.json"
+
+    def query_tables(
+        self,
+        pdf_path: str,
+        page: int | None = None,
+        header: str | None = None,
+        table: int | None = None,
+        start_row: int = 0,
+        max_rows: int | None = None,
+    ) -> dict[str, Any]:
+        """Select tables of a PDF and slice their rows from the table store.
+
+        The store is written on first use (from the cached analysis if there
+        is one); later queries seek straight to the selected tables.
+
+        Args:
+            pdf_path: Path to PDF file.
+            page: Only tables on this page (1-based).
+            header: Only tables whose header row contains this text.
+            table: Only this table number (0-based).
+            start_row: First row to return (row 0 is the header row).
+            max_rows: Maximum rows per table (default: all).
+
+        Returns:
+            Dictionary with tables_path, num_tables (in the document) and
+            tables (see table_store.query_tables).
+        """
+        source = self._content_source(pdf_path)
+        rows_path = self._get_cache_table_rows_path(source)
+        index_path = self._get_cache_table_index_path(source)
+        key = self._table_store_key(source)
+        entries = read_index(rows_path, index_path, key)
+        if entries is None:
+            write_tables(rows_path, index_path, self.extract_tables(pdf_path), key)
+            entries = read_index(rows_path, index_path, key) or []
+        tables_path = self._link_sidecar(rows_path, self._get_cache_table_rows_path(pdf_path))
+
+        return {
+            "tables_path": str(tables_path),
+            "num_tables": len(entries),
+            "tables": query_tables(rows_path, entries, page, header, table, start_row, max_rows),
+        }
+
     def save_extracted_content(
         self,
         pdf_path: str,
@@ -389,7 +907,10 @@ class PDFParserService:
         """Save extracted PDF content to cache files.
         
         Uses atomic write (temp file + rename) to prevent concurrent reads
-        from accessing incomplete data.
+        from accessing incomplete data. Tables go to the compact table store
+        (JSON Lines plus an offset index, see table_store). For PDFs in the
+        blob store the files are written once next to the blob and hardlinked
+        next to the per-stock PDF, where the agent (and grep) finds them.
         
         Args:
             pdf_path: Path to PDF file.
@@ -398,12 +919,12 @@ class PDFParserService:
             force: Force overwrite existing cache files.
         
         Returns:
-            Tuple of (text_cache_path, tables_cache_path).
+            Tuple of (text_cache_path, table_rows_path).
         """
-        import json
-        
-        text_path = self._get_cache_text_path(pdf_path)
-        tables_path = self._get_cache_tables_path(pdf_path)
+        # Keyed by content hash when the PDF lives in the blob store
+        source = self._content_source(pdf_path)
+        text_path = self._get_cache_text_path(source)
+        tables_path = self._get_cache_table_rows_path(source)
         
         # Write text cache with atomic rename
         if force or not text_path.exists():
@@ -411,20 +932,40 @@ class PDFParserService:
             tmp_text.write_text(text, encoding="utf-8")
             tmp_text.rename(text_path)
         
-        # Write tables cache with atomic rename
+        # Write table store with atomic renames
         if force or not tables_path.exists():
-            tmp_tables = tables_path.with_suffix(".json.tmp")
-            tmp_tables.write_text(
-                json.dumps(tables, ensure_ascii=False, indent=2),
-                encoding="utf-8"
-            )
-            tmp_tables.rename(tables_path)
-        
+            write_tables(tables_path, self._get_cache_table_index_path(source), tables, self._table_store_key(source))
+
+        text_path = self._link_sidecar(text_path, self._get_cache_text_path(pdf_path))
+        tables_path = self._link_sidecar(tables_path, self._get_cache_table_rows_path(pdf_path))
         return str(text_path), str(tables_path)
 
+    def _link_sidecar(self, sidecar: Path, dest: Path) -> Path:
+        """Expose a sidecar kept next to a blob at the per-stock location.
+
+        Args:
+            sidecar: Extracted file keyed by content (see _content_source).
+            dest: The same file's path next to the per-stock PDF.
+
+        Returns:
+            ``dest``, or ``sidecar`` if it is already there or cannot be linked.
+        """
+        if sidecar == dest:
+            return dest
+        try:
+            # Rewritten sidecars get a new inode, so stale links are replaced
+            if not (dest.exists() and os.path.samefile(sidecar, dest)):
+                PDFBlobStore(dest.parent.parent).link(sidecar, dest)
+        except OSError:
+            return sidecar
+        return dest
+
     def cleanup_old_pdfs(self, cache_dir: str, days: int = 30) -> int:
         """Clean up PDFs and related cache files older than specified days.
 
+        Blobs under ``.blobs/`` age out the same way; hardlinked per-stock
+        entries share the blob's mtime, so both go in the same run.
+
         Args:
             cache_dir: Cache directory path.
             days: Number of days to keep.
@@ -438,6 +979,7 @@ class PDFParserService:
 
         cutoff_time = datetime.now().timestamp() - (days * 24 * 60 * 60)
         deleted_count = 0
+        deleted_pdfs = []
 
         # Clean up PDFs and their cache files
         for pdf_file in cache_path.rglob("*.pdf"):
@@ -446,6 +988,7 @@ class PDFParserService:
                     # Delete PDF
                     pdf_file.unlink()
                     deleted_count += 1
+                    deleted_pdfs.append(pdf_file)
                     
                     # Delete associated cache files
                     text_cache = self._get_cache_text_path(str(pdf_file))
@@ -457,8 +1000,29 @@ class PDFParserService:
                     if tables_cache.exists():
                         tables_cache.unlink()
                         deleted_count += 1
+
+                    for table_store_file in (
+                        self._get_cache_table_rows_path(str(pdf_file)),
+                        self._get_cache_table_index_path(str(pdf_file)),
+                    ):
+                        if table_store_file.exists():
+                            table_store_file.unlink()
+                            deleted_count += 1
+
+                    for extraction_cache in (
+                        self._get_cache_analysis_path(str(pdf_file)),
+                        self._get_cache_page_texts_path(str(pdf_file)),
+                    ):
+                        if extraction_cache.exists():
+                            extraction_cache.unlink()
+                            deleted_count += 1
                 except Exception:
                     pass
 
+        # Drop deleted PDFs from the catalog in one transaction
+        catalog = self._catalog(cache_dir) if deleted_pdfs else None
+        if catalog is not None:
+            catalog.remove(deleted_pdfs)
+
         return deleted_count
 
@@ -0,0 +1,306 @@
+"""Client-side rate limiting and retry with backoff for HKEX requests."""
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying: throttling and transient server errors
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def retry_after_seconds(response: httpx.Response) -> float | None:
+    """Parse a Retry-After header (delta seconds or HTTP date).
+
+    Args:
+        response: HTTP response.
+
+    Returns:
+        Seconds to wait, or None if the header is absent or invalid.
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class RetryPolicy:
+    """Jittered exponential backoff for transient failures.
+
+    Environment variables:
+        HKEX_MAX_RETRIES: Retries after the first attempt (default: 3)
+        HKEX_RETRY_BASE_DELAY: First backoff step in seconds (default: 0.5)
+        HKEX_RETRY_MAX_DELAY: Backoff ceiling in seconds (default: 30)
+    """
+
+    max_retries: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        """Build a retry policy from environment variables."""
+        policy = cls()
+        if value := os.getenv("HKEX_MAX_RETRIES"):
+            policy.max_retries = int(value)
+        if value := os.getenv("HKEX_RETRY_BASE_DELAY"):
+            policy.base_delay = float(value)
+        if value := os.getenv("HKEX_RETRY_MAX_DELAY"):
+            policy.max_delay = float(value)
+        return policy
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """Backoff before retry number ``attempt`` (0-based), with full jitter.
+
+        A server-provided Retry-After is honoured as a lower bound.
+        """
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+        if retry_after is not None:
+            return max(min(retry_after, self.max_delay), backoff)
+        return backoff
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by sync and async callers.
+
+    Callers reserve a token and sleep until it becomes available, so waits
+    are FIFO-fair and never hold the lock. On a 429 the refill rate is
+    halved (down to ``min_rate``) and the bucket is paused for the server's
+    Retry-After; each success then restores the rate gradually.
+    """
+
+    def __init__(self, rate: float, burst: int, min_rate: float | None = None):
+        """Initialize token bucket.
+
+        Args:
+            rate: Sustained requests per second (<= 0 disables limiting).
+            burst: Maximum tokens accumulated while idle.
+            min_rate: Floor for the adaptive rate (default: rate / 8).
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate if min_rate is not None else rate / 8
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_rate > 0
+
+    def reserve(self) -> float:
+        """Take one token, returning how long the caller must wait for it."""
+        if not self.enabled:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def acquire(self) -> float:
+        """Block until a token is available; returns the time waited."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self) -> float:
+        """Wait without blocking the event loop until a token is available."""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def throttled(self, retry_after: float | None = None) -> None:
+        """Back off after the server signalled throttling."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            if retry_after:
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+    def succeeded(self) -> None:
+        """Recover the refill rate after a successful request."""
+        if self.enabled and self.rate < self.max_rate:
+            with self._lock:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+
+@dataclass
+class RateLimitMetrics:
+    """Counters describing limiter and retry activity."""
+
+    requests: int = 0
+    retries: int = 0
+    throttled: int = 0
+    failures: int = 0
+    waits: int = 0
+    wait_seconds: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, **increments: float) -> None:
+        """Add to one or more counters."""
+        with self._lock:
+            for name, value in increments.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Current counter values."""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "retries": self.retries,
+                "throttled": self.throttled,
+                "failures": self.failures,
+                "waits": self.waits,
+                "wait_seconds": round(self.wait_seconds, 3),
+            }
+
+
+class RateLimiter:
+    """Token-bucket throttling plus retries, shared across HKEX services.
+
+    Environment variables:
+        HKEX_RATE_LIMIT: Sustained requests per second, 0 to disable (default: 5)
+        HKEX_RATE_BURST: Requests allowed in a burst (default: 10)
+        plus the RetryPolicy variables.
+    """
+
+    def __init__(
+        self,
+        rate: float = 5.0,
+        burst: int = 10,
+        retry: RetryPolicy | None = None,
+    ):
+        """Initialize rate limiter.
+
+        Args:
+            rate: Sustained requests per second (<= 0 disables throttling).
+            burst: Requests allowed in a burst.
+            retry: Retry policy (default: RetryPolicy()).
+        """
+        self.bucket = TokenBucket(rate, burst)
+        self.retry = retry or RetryPolicy()
+        self.metrics = RateLimitMetrics()
+
+    @classmethod
+    def from_env(cls) -> "RateLimiter":
+        """Build a rate limiter from environment variables."""
+        return cls(
+            rate=float(os.getenv("HKEX_RATE_LIMIT", "5")),
+            burst=int(os.getenv("HKEX_RATE_BURST", "10")),
+            retry=RetryPolicy.from_env(),
+        )
+
+    def log_metrics(self) -> None:
+        """Log the counters collected so far, e.g. at shutdown.
+
+        Logged at warning level when requests were throttled or failed for
+        good, so throttling is visible without extra logging configuration;
+        otherwise at info level. Nothing is logged before the first request.
+        """
+        stats = self.metrics.snapshot()
+        if not stats["requests"]:
+            return
+        level = logging.WARNING if stats["throttled"] or stats["failures"] else logging.INFO
+        logger.log(level, "HKEX request metrics: %s", " ".join(f"{name}={value}" for name, value in stats.items()))
+
+    def _record_wait(self, waited: float) -> None:
+        if waited > 0:
+            self.metrics.record(waits=1, wait_seconds=waited)
+
+    def _retry_delay(self, attempt: int, response: httpx.Response | None) -> float | None:
+        """Backoff before the next attempt, or None if the outcome is final."""
+        if response is not None and response.status_code not in RETRYABLE_STATUS_CODES:
+            self.bucket.succeeded()
+            return None
+
+        retry_after = None
+        if response is not None:
+            retry_after = retry_after_seconds(response)
+            if response.status_code == 429:
+                self.metrics.record(throttled=1)
+                self.bucket.throttled(retry_after)
+                logger.warning("HKEX throttled request (429), rate now %.2f/s", self.bucket.rate)
+
+        if attempt >= self.retry.max_retries:
+            self.metrics.record(failures=1)
+            return None
+
+        self.metrics.record(retries=1)
+        return self.retry.delay(attempt, retry_after)
+
+    def request(self, send: Callable[[], httpx.Response]) -> httpx.Response:
+        """Send a request under the rate limit, retrying transient failures.
+
+        Args:
+            send: Callable issuing the request.
+
+        Returns:
+            Final response; retryable status codes are returned as-is once
+            retries are exhausted.
+
+        Raises:
+            httpx.TransportError: If the last attempt fails at transport level.
+        """
+        attempt = 0
+        while True:
+            self._record_wait(self.bucket.acquire())
+            self.metrics.record(requests=1)
+            try:
+                response = send()
+            except httpx.TransportError:
+                delay = self._retry_delay(attempt, None)
+                if delay is None:
+                    raise
+            else:
+                delay = self._retry_delay(attempt, response)
+                if delay is None:
+                    return response
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    async def arequest(self, send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """Async twin of request()."""
+        attempt = 0
+        while True:
+            self._record_wait(await self.bucket.aacquire())
+            self.metrics.record(requests=1)
+            try:
+                response = await send()
+            except httpx.TransportError:
+                delay = self._retry_delay(attempt, None)
+                if delay is None:
+                    raise
+            else:
+                delay = self._retry_delay(attempt, response)
+                if delay is None:
+                    return response
+                await response.aclose()
+            await asyncio.sleep(delay)
+            attempt += 1
@@ -0,0 +1,186 @@
+"""Persistent stock code → stockId cache for HKEX lookups."""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Any
+
+from src.config.agent_config import get_agent_cache_dir
+
+# Stock IDs are effectively static, so positive entries live for a month
+DEFAULT_TTL_SECONDS = 30 * 24 * 60 * 60
+# Unknown codes may be listed later (IPOs), so negative entries expire sooner
+DEFAULT_NEGATIVE_TTL_SECONDS = 24 * 60 * 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stock_ids (
+    stock_code TEXT NOT NULL,
+    market TEXT NOT NULL,
+    stock_id TEXT,
+    stock_info TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (stock_code, market)
+);
+CREATE TABLE IF NOT EXISTS warmups (
+    market TEXT PRIMARY KEY,
+    warmed_at REAL NOT NULL
+);
+"""
+
+
+class StockIdCache:
+    """SQLite-backed cache of ``prefix.do`` lookups keyed by (stock_code, market).
+
+    Entries found on HKEX expire after ``ttl_seconds``; codes HKEX does not
+    know are cached as negative entries for ``negative_ttl_seconds``. Storage
+    errors are swallowed so the cache can never break a lookup.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        ttl_seconds: float | None = None,
+        negative_ttl_seconds: float = DEFAULT_NEGATIVE_TTL_SECONDS,
+    ):
+        """Initialize stock ID cache.
+
+        Args:
+            path: SQLite file path (default: ~/.hkex-agent/cache/stock_ids.sqlite).
+            ttl_seconds: Lifetime of positive entries (default: 30 days, or
+                HKEX_STOCK_ID_CACHE_TTL_DAYS).
+            negative_ttl_seconds: Lifetime of "not found" entries (default: 1 day).
+        """
+        if ttl_seconds is None:
+            ttl_days = os.getenv("HKEX_STOCK_ID_CACHE_TTL_DAYS")
+            ttl_seconds = float(ttl_days) * 24 * 60 * 60 if ttl_days else DEFAULT_TTL_SECONDS
+        self.path = Path(path) if path else get_agent_cache_dir() / "stock_ids.sqlite"
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection, creating the schema on first use."""
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    with closing(sqlite3.connect(self.path, timeout=5)) as conn:
+                        conn.execute("PRAGMA journal_mode=WAL")
+                        conn.executescript(_SCHEMA)
+                    self._initialized = True
+        return sqlite3.connect(self.path, timeout=5)
+
+    def get(
+        self, stock_code: str, market: str = "SEHK"
+    ) -> tuple[Any, list[dict[str, Any]]] | None:
+        """Look up a cached stock ID.
+
+        Args:
+            stock_code: 5-digit stock code (e.g., "00673").
+            market: Market code (default: "SEHK").
+
+        Returns:
+            (stock_id, stock_info) on a hit, (None, []) on a negative hit,
+            or None when the code is not cached or the entry has expired.
+        """
+        try:
+            with closing(self._connect()) as conn:
+                row = conn.execute(
+                    "SELECT stock_id, stock_info, fetched_at FROM stock_ids WHERE stock_code = ? AND market = ?",
+                    (stock_code, market),
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+
+        if row is None:
+            return None
+
+        stock_id_json, stock_info_json, fetched_at = row
+        stock_id = json.loads(stock_id_json) if stock_id_json is not None else None
+        ttl = self.ttl_seconds if stock_id is not None else self.negative_ttl_seconds
+        if time.time() - fetched_at > ttl:
+            return None
+
+        return stock_id, json.loads(stock_info_json)
+
+    def set(
+        self,
+        stock_code: str,
+        market: str,
+        stock_id: Any,
+        stock_info: list[dict[str, Any]],
+    ) -> None:
+        """Store a lookup result; a ``None`` stock_id records a negative entry.
+
+        Args:
+            stock_code: 5-digit stock code.
+            market: Market code.
+            stock_id: Internal stock ID, or None if HKEX does not know the code.
+            stock_info: Stock info list returned by HKEX.
+        """
+        self.set_many(market, [(stock_code, stock_id, stock_info)])
+
+    def set_many(
+        self,
+        market: str,
+        entries: list[tuple[str, Any, list[dict[str, Any]]]],
+    ) -> None:
+        """Store many lookup results in one transaction.
+
+        Args:
+            market: Market code.
+            entries: (stock_code, stock_id, stock_info) tuples.
+        """
+        now = time.time()
+        rows = [
+            (
+                stock_code,
+                market,
+                json.dumps(stock_id) if stock_id is not None else None,
+                json.dumps(stock_info, ensure_ascii=False),
+                now,
+            )
+            for stock_code, stock_id, stock_info in entries
+        ]
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO stock_ids (stock_code, market, stock_id, stock_info, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+        except sqlite3.Error:
+            pass
+
+    def is_warm(self, market: str = "SEHK") -> bool:
+        """Check whether a bulk warm-up for the market is still within TTL."""
+        try:
+            with closing(self._connect()) as conn:
+                row = conn.execute("SELECT warmed_at FROM warmups WHERE market = ?", (market,)).fetchone()
+        except sqlite3.Error:
+            return False
+        return row is not None and time.time() - row[0] <= self.ttl_seconds
+
+    def mark_warm(self, market: str = "SEHK") -> None:
+        """Record that a bulk warm-up for the market has completed."""
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO warmups (market, warmed_at) VALUES (?, ?)",
+                    (market, time.time()),
+                )
+        except sqlite3.Error:
+            pass
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute("DELETE FROM stock_ids")
+                conn.execute("DELETE FROM warmups")
+        except sqlite3.Error:
+            pass
@@ -0,0 +1,147 @@
+"""Compact storage for tables extracted from PDFs."""
+
+import json
+import os
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+TABLE_STORE_FORMAT = 1
+
+
+def _dump_row(row: list[Any]) -> bytes:
+    return json.dumps(row, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def write_tables(
+    rows_path: Path,
+    index_path: Path,
+    tables: list[dict[str, Any]],
+    key: dict[str, Any] | None = None,
+) -> None:
+    """Write tables as JSON Lines plus an offset index.
+
+    ``rows_path`` holds one compact JSON array per table row, tables one
+    after another. ``index_path`` records each table's page, header row,
+    row count and byte offset, so a reader can seek straight to one table
+    and stream only the rows it needs. Both files are written to temp files
+    and renamed, the index last.
+
+    Args:
+        rows_path: Rows file (``*_tables.jsonl``).
+        index_path: Index file (``*_tables.idx.json``).
+        tables: Tables as returned by PDFParserService.extract_tables().
+        key: Identifies the source PDF; read_index() rejects other keys.
+    """
+    entries = []
+    chunks = []
+    offset = 0
+    for number, table in enumerate(tables):
+        rows = [_dump_row(row) for row in table["table"]]
+        length = sum(len(row) for row in rows)
+        entries.append(
+            {
+                "table": number,
+                "page": table["page"],
+                "header": table["table"][0] if table["table"] else [],
+                "num_rows": len(rows),
+                "offset": offset,
+                "length": length,
+            }
+        )
+        chunks.extend(rows)
+        offset += length
+
+    tmp_rows = rows_path.with_suffix(".jsonl.tmp")
+    tmp_rows.write_bytes(b"".join(chunks))
+    os.replace(tmp_rows, rows_path)
+
+    index = {"format": TABLE_STORE_FORMAT, "key": key, "rows_size": offset, "tables": entries}
+    tmp_index = index_path.with_suffix(".json.tmp")
+    tmp_index.write_text(json.dumps(index, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp_index, index_path)
+
+
+def read_index(
+    rows_path: Path, index_path: Path, key: dict[str, Any] | None = None
+) -> list[dict[str, Any]] | None:
+    """Table entries of a stored table set.
+
+    Args:
+        rows_path: Rows file (``*_tables.jsonl``).
+        index_path: Index file (``*_tables.idx.json``).
+        key: Expected source key, as passed to write_tables().
+
+    Returns:
+        Index entries, or None if the store is missing, from another format
+        version or source, or out of step with its rows file.
+    """
+    try:
+        index = json.loads(index_path.read_text(encoding="utf-8"))
+        if (
+            index.get("format") != TABLE_STORE_FORMAT
+            or index.get("key") != key
+            or os.path.getsize(rows_path) != index["rows_size"]
+        ):
+            return None
+        return index["tables"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _header_matches(header: list[Any], needle: str) -> bool:
+    return any(needle in str(cell).lower() for cell in header if cell)
+
+
+def query_tables(
+    rows_path: Path,
+    entries: list[dict[str, Any]],
+    page: int | None = None,
+    header: str | None = None,
+    table: int | None = None,
+    start_row: int = 0,
+    max_rows: int | None = None,
+) -> list[dict[str, Any]]:
+    """Select tables and slice their rows, reading only the selected rows.
+
+    Args:
+        rows_path: Rows file written by write_tables().
+        entries: Index entries from read_index().
+        page: Only tables on this page (1-based).
+        header: Only tables whose header row has a cell containing this
+            text (case-insensitive).
+        table: Only the table with this number (0-based, document order).
+        start_row: First row to return (row 0 is the header row).
+        max_rows: Maximum rows per table (default: all remaining).
+
+    Returns:
+        Matching tables with table, page, header, num_rows, start_row and rows.
+    """
+    needle = header.lower() if header else None
+    selected = [
+        entry
+        for entry in entries
+        if (page is None or entry["page"] == page)
+        and (table is None or entry["table"] == table)
+        and (needle is None or _header_matches(entry["header"], needle))
+    ]
+
+    results = []
+    with open(rows_path, "rb") as f:
+        for entry in selected:
+            stop = entry["num_rows"] if max_rows is None else min(start_row + max_rows, entry["num_rows"])
+            rows = []
+            if start_row < stop:
+                f.seek(entry["offset"])
+                rows = [json.loads(line) for line in islice(f, start_row, stop)]
+            results.append(
+                {
+                    "table": entry["table"],
+                    "page": entry["page"],
+                    "header": entry["header"],
+                    "num_rows": entry["num_rows"],
+                    "start_row": start_row,
+                    "rows": rows,
+                }
+            )
+    return results
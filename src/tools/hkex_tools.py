@@ -1,13 +1,60 @@
 """HKEX tools for DeepAgents."""
 
+import atexit
+import os
 from typing import Any
 
 from langchain_core.tools import tool
 
-from src.services.hkex_api import HKEXAPIService
+from src.services.category_cache import CategoryTaxonomy
+from src.services.hkex_api import (
+    DEFAULT_MAX_CONCURRENCY,
+    AsyncHKEXAPIService,
+    HKEXAPIService,
+)
+from src.services.rate_limit import RateLimiter
+from src.services.stock_cache import StockIdCache
 
-# Initialize service instance
-_hkex_service = HKEXAPIService()
+# Stock code → stockId mappings and category files rarely change, so they
+# are cached on disk and shared by the sync and async services
+_stock_cache = StockIdCache()
+_category_taxonomy = CategoryTaxonomy()
+
+# One token bucket for every hkexnews request in this process (API calls and
+# PDF downloads, sync and async), configured via HKEX_RATE_LIMIT & co.
+# Its throttling and retry counters are logged at exit.
+_rate_limiter = RateLimiter.from_env()
+atexit.register(_rate_limiter.log_metrics)
+
+# Initialize service instance (owns the shared keep-alive connection pool)
+_hkex_service = HKEXAPIService(
+    stock_cache=_stock_cache,
+    category_cache=_category_taxonomy,
+    rate_limiter=_rate_limiter,
+)
+atexit.register(_hkex_service.close)
+
+# Async twin used when tools are awaited, so parallel tool calls fan out
+# concurrently (bounded by HKEX_MAX_CONCURRENCY) instead of serialising
+_async_hkex_service = AsyncHKEXAPIService(
+    max_concurrency=int(os.getenv("HKEX_MAX_CONCURRENCY", str(DEFAULT_MAX_CONCURRENCY))),
+    stock_cache=_stock_cache,
+    category_cache=_category_taxonomy,
+    rate_limiter=_rate_limiter,
+)
+# Each coroutine below runs in ``async with _async_hkex_service``, which closes
+# the pool when the last overlapping call returns; this closes any other
+atexit.register(_async_hkex_service.close)
+
+
+def _category_filter_names(t1_code: str | None, t2_code: str | None) -> dict[str, str | None]:
+    """Resolve category filter codes to names from the local taxonomy (no network)."""
+    names = {}
+    if t1_code:
+        names["t1_name"] = _category_taxonomy.name_for(t1_code, "tierone")
+    if t2_code:
+        names["t2_name"] = _category_taxonomy.name_for(t2_code, "tiertwo")
+    return names
 
 
 @tool
@@ -18,6 +65,7 @@ def search_hkex_announcements(
     title: str | None = None,
     market: str = "SEHK",
     row_range: int = 100,
+    all_pages: bool = False,
 ) -> dict[str, Any]:
     """Search HKEX announcements for a specific stock.
 
@@ -31,6 +79,9 @@ def search_hkex_announcements(
         title: Optional search keyword to filter by title.
         market: Market code - "SEHK" (main board) or "GEM" (default: "SEHK").
         row_range: Number of results to return, 1-500 (default: 100).
+        all_pages: Fetch the complete history in the date range, ignoring
+            row_range, by splitting it into date windows (default: False).
+            Use for long ranges on large issuers that exceed 500 results.
 
     Returns:
         Dictionary containing:
@@ -60,14 +111,28 @@ def search_hkex_announcements(
         }
 
     # Search announcements
-    stock_id, announcements = _hkex_service.search_announcements(
-        stock_id=stock_id,
-        from_date=from_date,
-        to_date=to_date,
-        title=title,
-        market=market,
-        row_range=row_range,
-    )
+    if all_pages:
+        try:
+            announcements = list(
+                _hkex_service.iter_announcements(
+                    stock_id=stock_id,
+                    from_date=from_date,
+                    to_date=to_date,
+                    title=title,
+                    market=market,
+                )
+            )
+        except Exception as e:
+            announcements = [{"error": str(e)}]
+    else:
+        stock_id, announcements = _hkex_service.search_announcements(
+            stock_id=stock_id,
+            from_date=from_date,
+            to_date=to_date,
+            title=title,
+            market=market,
+            row_range=row_range,
+        )
 
     return {
         "stock_code": stock_code,
@@ -109,6 +174,8 @@ def get_latest_hkex_announcements(
           - t2Code: Tier 2 category code (may be "NaN")
           - market: Market code
           - stock: List of stock dictionaries with "sc" (stock code) and "sn" (stock name)
+        - count: Number of announcements
+        - t1_name / t2_name: Names of the category filters (only when filtering by category)
     """
     announcements = _hkex_service.get_latest_announcements(
         market=market,
@@ -120,6 +187,7 @@ def get_latest_hkex_announcements(
     return {
         "announcements": announcements,
         "count": len(announcements),
+        **_category_filter_names(t1_code, t2_code),
     }
 
 
@@ -160,6 +228,7 @@ def get_announcement_categories(
 
     This tool retrieves category codes used for filtering announcements.
     Categories help classify announcements by type (e.g., financial statements, notices).
+    Category files are static reference data and are served from a local cache.
 
     Args:
         category_type: Type of category to retrieve:
@@ -183,3 +252,79 @@ def get_announcement_categories(
         "categories": categories,
     }
 
+
+# ========== Async coroutines ==========
+# Registered on the tools above so ``ainvoke`` uses AsyncHKEXAPIService
+# instead of running the sync implementation in a worker thread.
+
+
+async def _asearch_hkex_announcements(
+    stock_code: str,
+    from_date: str,
+    to_date: str,
+    title: str | None = None,
+    market: str = "SEHK",
+    row_range: int = 100,
+    all_pages: bool = False,
+) -> dict[str, Any]:
+    async with _async_hkex_service:
+        return await _async_hkex_service.search_stock_announcements(
+            stock_code=stock_code,
+            from_date=from_date,
+            to_date=to_date,
+            title=title,
+            market=market,
+            row_range=row_range,
+            all_pages=all_pages,
+        )
+
+
+async def _aget_latest_hkex_announcements(
+    market: str | None = None,
+    stock_code: str | None = None,
+    t1_code: str | None = None,
+    t2_code: str | None = None,
+) -> dict[str, Any]:
+    async with _async_hkex_service:
+        announcements = await _async_hkex_service.get_latest_announcements(
+            market=market,
+            stock_code=stock_code,
+            t1_code=t1_code,
+            t2_code=t2_code,
+        )
+
+    return {
+        "announcements": announcements,
+        "count": len(announcements),
+        **_category_filter_names(t1_code, t2_code),
+    }
+
+
+async def _aget_stock_info(stock_code: str) -> dict[str, Any]:
+    async with _async_hkex_service:
+        stock_id, stock_info = await _async_hkex_service.get_stock_id(stock_code)
+
+    return {
+        "stock_code": stock_code,
+        "stock_id": stock_id,
+        "stock_info": stock_info,
+        "found": stock_id is not None,
+    }
+
+
+async def _aget_announcement_categories(
+    category_type: str = "tierone",
+) -> dict[str, Any]:
+    async with _async_hkex_service:
+        categories = await _async_hkex_service.get_categories(category_type)
+
+    return {
+        "category_type": category_type,
+        "categories": categories,
+    }
+
+
+search_hkex_announcements.coroutine = _asearch_hkex_announcements
+get_latest_hkex_announcements.coroutine = _aget_latest_hkex_announcements
+get_stock_info.coroutine = _aget_stock_info
+get_announcement_categories.coroutine = _aget_announcement_categories
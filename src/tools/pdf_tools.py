@@ -1,19 +1,21 @@
 """PDF processing tools for DeepAgents."""
 
+import re
+import time
 from pathlib import Path
 from typing import Any
 
 from langchain_core.tools import tool
 
-from src.services.hkex_api import HKEXAPIService
 from src.services.pdf_parser import (
     PDFParserService,
     format_date_for_filename,
 )
+from src.tools.hkex_tools import _hkex_service
 
-# Initialize service instances
-_hkex_service = HKEXAPIService()
-_pdf_service = PDFParserService()
+# Initialize service instance (PDF downloads share the HKEX connection pool
+# and rate limiter)
+_pdf_service = PDFParserService(client=_hkex_service.client, rate_limiter=_hkex_service.rate_limiter)
 
 # Truncation thresholds for large PDFs
 MAX_INLINE_TEXT_CHARS = 50_000  # 50k chars ≈ 12.5k tokens (4:1 ratio)
@@ -95,6 +97,7 @@ def download_announcement_pdf(
     title: str,
     cache_dir: str = "/pdf_cache/",
     force_download: bool = False,
+    file_info: str | None = None,
 ) -> dict[str, Any]:
     """Download an announcement PDF with intelligent caching.
 
@@ -110,6 +113,8 @@ def download_announcement_pdf(
         title: Announcement title.
         cache_dir: Cache directory path (default: "/pdf_cache/").
         force_download: If True, download even if cached (default: False).
+        file_info: FILE_INFO from announcement data (e.g., "1.2MB"), used to
+            verify the download size when the server omits it (optional).
 
     Returns:
         Dictionary containing:
@@ -131,6 +136,7 @@ def download_announcement_pdf(
             date=date,
             title=title,
             cache_dir=actual_cache_dir,
+            news_id=news_id,
         )
         if cached_path:
             return {
@@ -149,6 +155,8 @@ def download_announcement_pdf(
             date=date,
             title=title,
             cache_dir=actual_cache_dir,
+            expected_size=file_info,
+            news_id=news_id,
         )
 
         return {
@@ -170,12 +178,145 @@ def download_announcement_pdf(
         }
 
 
+def _announcement_download_item(announcement: dict[str, Any]) -> dict[str, Any]:
+    """Map a search result (or download_announcement_pdf-style args) to a download item."""
+
+    def pick(*keys: str) -> Any:
+        for key in keys:
+            if announcement.get(key):
+                return announcement[key]
+        return None
+
+    # Multi-stock announcements list several codes in STOCK_CODE; file under the first
+    stock_code = str(pick("stock_code", "STOCK_CODE") or "")
+    match = re.search(r"\d{5}", stock_code)
+    return {
+        "news_id": pick("news_id", "NEWS_ID"),
+        "url": pick("pdf_url", "FILE_LINK") or "",
+        "stock_code": match.group() if match else stock_code,
+        "date": format_date_for_filename(str(pick("date_time", "DATE_TIME") or "")),
+        "title": pick("title", "TITLE") or "",
+        "expected_size": pick("file_info", "FILE_INFO"),
+    }
+
+
+@tool
+def download_announcement_pdfs(
+    announcements: list[dict[str, Any]],
+    cache_dir: str = "/pdf_cache/",
+    max_concurrency: int = 8,
+) -> dict[str, Any]:
+    """Download several announcement PDFs concurrently in a single call.
+
+    Use this instead of repeated download_announcement_pdf calls when a
+    multi-document analysis needs several PDFs. Cached PDFs are returned
+    immediately; the rest are downloaded in parallel over a shared connection
+    pool, with a per-host limit so HKEX is not flooded.
+
+    Args:
+        announcements: Announcements as returned by search_hkex_announcements
+            (NEWS_ID, FILE_LINK, STOCK_CODE, DATE_TIME, TITLE, FILE_INFO), or
+            dicts with news_id, pdf_url, stock_code, date_time, title, file_info.
+        cache_dir: Cache directory path (default: "/pdf_cache/").
+        max_concurrency: Maximum parallel downloads (default: 8).
+
+    Returns:
+        Dictionary containing:
+        - success: True if every PDF is available
+        - results: One entry per announcement, in input order, with news_id,
+          stock_code, success, path, cached (cache hit), size (bytes),
+          latency_ms and error (on failure)
+        - downloaded / cached / failed: Item counts
+        - elapsed_ms: Wall-clock time for the whole batch
+    """
+    started = time.perf_counter()
+    items = [_announcement_download_item(a) for a in announcements]
+    results = _pdf_service.download_pdfs(
+        items,
+        cache_dir=_resolve_cache_dir(cache_dir),
+        max_workers=max_concurrency,
+    )
+
+    failed = sum(1 for r in results if not r["success"])
+    cached = sum(1 for r in results if r["cached"])
+    return {
+        "success": failed == 0,
+        "results": results,
+        "downloaded": len(results) - failed - cached,
+        "cached": cached,
+        "failed": failed,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+def _extract_pdf_pages(
+    pdf_path: str,
+    include_tables: bool,
+    start_page: int,
+    end_page: int | None,
+    max_chars: int,
+    max_table_rows: int,
+) -> dict[str, Any]:
+    """Read pages in order until the range ends or the inline budget is spent.
+
+    Pages are returned whole: a page whose text would overrun max_chars is
+    left for the next call, unless it is the first page read. Pages after
+    the stopping point are never parsed (unless the PDF has already been
+    analyzed, in which case they are read from the cache).
+    """
+    texts = []
+    tables = []
+    text_length = 0
+    table_rows = 0
+    last_page = None
+    for page in _pdf_service.iter_pages(pdf_path, start_page, end_page, include_tables):
+        page_length = len(page["text"]) + (2 if texts and page["text"] else 0)
+        if last_page is not None and text_length + page_length > max_chars:
+            break
+        last_page = page["page"]
+        if page["text"]:
+            texts.append(page["text"])
+            text_length += page_length
+        for table in page["tables"]:
+            tables.append({"page": last_page, "table": table})
+            table_rows += len(table)
+        if text_length >= max_chars or table_rows >= max_table_rows:
+            break
+
+    num_pages = _pdf_service.page_count(pdf_path)
+    range_end = num_pages if end_page is None else min(end_page, num_pages)
+    text = "\n\n".join(texts)
+    truncated = last_page is not None and last_page < range_end
+    result = {
+        "success": True,
+        "text": text,
+        "tables": tables,
+        "text_length": len(text),
+        "num_tables": len(tables),
+        "truncated": truncated,
+        "num_pages": num_pages,
+        "start_page": start_page,
+        "end_page": last_page,
+    }
+    if truncated:
+        result["next_page"] = last_page + 1
+        result["preview_info"] = {
+            "text": f"已读取第 {start_page}-{last_page} 页（共 {num_pages} 页），"
+            f"使用 start_page={last_page + 1} 继续读取",
+            "tables": None,
+        }
+    return result
+
+
 @tool
 def extract_pdf_content(
     pdf_path: str,
     include_tables: bool = True,
     max_inline_chars: int = MAX_INLINE_TEXT_CHARS,
     max_table_rows: int = MAX_INLINE_TABLE_ROWS,
+    start_page: int | None = None,
+    end_page: int | None = None,
+    preview_only: bool = False,
 ) -> dict[str, Any]:
     """Extract text and tables from a PDF file with intelligent truncation.
 
@@ -185,12 +326,22 @@ def extract_pdf_content(
 
     This tool extracts all text content and optionally tables from a PDF announcement.
     The PDF should already be downloaded (use download_announcement_pdf first).
+    Extractions are cached, so calling this again on the same PDF is cheap.
+
+    To look at a large PDF quickly, pass preview_only=True: pages are read in
+    order only until about 5k characters are collected. To read specific
+    pages, pass start_page / end_page: only those pages are parsed. Both modes
+    return num_pages, start_page, end_page (last page read) and, when they
+    stop before the end of the range, next_page to continue from.
 
     Args:
         pdf_path: Full path to PDF file.
         include_tables: Whether to extract tables (default: True).
         max_inline_chars: Maximum inline text characters (default: 50k).
         max_table_rows: Maximum inline table rows (default: 200).
+        start_page: First page to read, 1-based (optional).
+        end_page: Last page to read, inclusive (optional).
+        preview_only: Read only enough pages for a short preview (default: False).
 
     Returns:
         Dictionary containing:
@@ -198,18 +349,37 @@ def extract_pdf_content(
         - text: Text content (full for small PDFs, preview for large PDFs)
         - text_path: Full text cache path (only if truncated)
         - tables: List of tables (full for small PDFs, preview for large PDFs)
-        - tables_path: Full tables cache path (only if truncated)
+        - tables_path: Full tables cache path, JSON Lines with one row per
+          line (only if truncated); query it with query_pdf_tables
         - truncated: Boolean indicating if content was truncated
         - text_length: Total text length (characters)
         - num_tables: Total number of tables
         - preview_info: Preview information (only if truncated)
+        - table_detection: Table pre-pass statistics (pages_scanned,
+          candidate_pages, pages_with_tables, hit_rate; full-document
+          mode with include_tables only)
     """
     try:
-        # 1. Extract full content
-        full_text = _pdf_service.extract_text(pdf_path)
+        if preview_only or start_page is not None or end_page is not None:
+            return _extract_pdf_pages(
+                pdf_path,
+                include_tables,
+                start_page or 1,
+                end_page,
+                TEXT_PREVIEW_CHARS if preview_only else max_inline_chars,
+                max_table_rows,
+            )
+
+        # 1. Extract full content; with tables, one analysis serves text and tables
         full_tables = []
+        table_detection = None
         if include_tables:
-            full_tables = _pdf_service.extract_tables(pdf_path)
+            analysis = _pdf_service.analyze_pdf(pdf_path)
+            full_text = analysis.text
+            full_tables = analysis.tables
+            table_detection = analysis.table_detection()
+        else:
+            full_text = _pdf_service.extract_text(pdf_path)
 
         # 2. Determine if truncation is needed
         text_truncated = len(full_text) > max_inline_chars
@@ -247,7 +417,7 @@ def extract_pdf_content(
             preview_info_tables = (
                 f"⚠️  仅显示前 {TABLE_PREVIEW_COUNT} 个表格（共 {len(full_tables)} 个）\n"
                 f"💾 完整表格已保存至: {tables_path}\n"
-                f"📖 使用 read_file('{tables_path}') 获取完整表格数据"
+                f"📖 使用 query_pdf_tables('{pdf_path}', page=..., header=...) 按页码/表头查询表格，可用 start_row/max_rows 分段读取"
             )
         else:
             preview_tables = full_tables
@@ -262,6 +432,8 @@ def extract_pdf_content(
             "num_tables": len(full_tables),
             "truncated": truncated,
         }
+        if table_detection is not None:
+            result["table_detection"] = table_detection
 
         # Add cache paths (only when truncated)
         if truncated:
@@ -291,7 +463,8 @@ def analyze_pdf_structure(pdf_path: str) -> dict[str, Any]:
     """Analyze the structure of a PDF file.
 
     This tool analyzes a PDF to identify its structure, including number of pages,
-    presence of tables, and estimated sections/headings.
+    presence of tables, and estimated sections/headings. Use the headings as a
+    table of contents to pick page ranges for extract_pdf_content.
 
     Args:
         pdf_path: Full path to PDF file.
@@ -302,6 +475,12 @@ def analyze_pdf_structure(pdf_path: str) -> dict[str, Any]:
         - num_pages: Number of pages in PDF
         - has_tables: Boolean indicating if PDF contains tables
         - estimated_sections: List of potential section markers with page numbers
+        - headings: Heading candidates in document order, each with page,
+          level (1 = largest), size and text
+        - font_size_percentiles: Character-weighted font size percentiles
+          (p50 is the body text size)
+        - table_detection: Pages scanned, pages with ruling lines that were
+          searched for tables, pages that had tables, and the hit rate
     """
     try:
         structure = _pdf_service.analyze_structure(pdf_path)
@@ -320,3 +499,63 @@ def analyze_pdf_structure(pdf_path: str) -> dict[str, Any]:
             "error": str(e),
         }
 
+
+@tool
+def query_pdf_tables(
+    pdf_path: str,
+    page: int | None = None,
+    header: str | None = None,
+    table_index: int | None = None,
+    start_row: int = 0,
+    max_rows: int = 50,
+) -> dict[str, Any]:
+    """Select tables from a PDF by page or header text and read a slice of their rows.
+
+    Use this to work through the tables of a large PDF (e.g. financial
+    statements in an annual report) instead of reading the whole tables file.
+    Tables are stored compactly on first use; later queries read only the
+    selected rows.
+
+    Args:
+        pdf_path: Full path to PDF file.
+        page: Only tables on this page, 1-based (optional).
+        header: Only tables whose header row contains this text, case-insensitive
+            (optional, e.g. "Revenue" or "收入").
+        table_index: Only this table, 0-based in document order (optional).
+        start_row: First row to return; row 0 is the header row (default: 0).
+        max_rows: Maximum rows returned per table (default: 50).
+
+    Returns:
+        Dictionary containing:
+        - success: Boolean indicating success
+        - num_tables: Number of tables in the whole PDF
+        - num_matched: Number of tables matching the filters
+        - tables: Matching tables, each with table (index), page, header,
+          num_rows (total rows), start_row and rows (the requested slice)
+        - tables_path: Path of the stored tables (JSON Lines, one row per line)
+    """
+    try:
+        result = _pdf_service.query_tables(
+            pdf_path,
+            page=page,
+            header=header,
+            table=table_index,
+            start_row=max(start_row, 0),
+            max_rows=max(max_rows, 0),
+        )
+        return {
+            "success": True,
+            "num_tables": result["num_tables"],
+            "num_matched": len(result["tables"]),
+            "tables": result["tables"],
+            "tables_path": result["tables_path"],
+        }
+
+    except Exception as e:
+        return {
+            "success": False,
+            "num_tables": 0,
+            "num_matched": 0,
+            "tables": [],
+            "error": str(e),
+        }
@@ -256,7 +256,7 @@ def generate_summary_markdown(
                     # Add note about full tables
                     md_lines.append(
                         f"📊 **完整表格数据**: 共 {pdf_content.get('num_tables', 0)} 个表格，"
-                        f"完整数据已保存至 `{pdf_content.get('tables_path')}`\n\n"
+                        f"完整数据已保存至 `{pdf_content.get('tables_path')}`（可用 query_pdf_tables 按页码或表头查询）\n\n"
                     )
                 else:
                     # Show all tables (limit to first 5 for backward compatibility)